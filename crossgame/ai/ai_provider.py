@@ -0,0 +1,27 @@
+"""Contains functions that choose the AI implementation for the game."""
+from crossgame.ai.base_ai import BaseAI
+from crossgame.ai.good_ai import GoodAI
+from crossgame.ai.mcts_ai import MctsAI
+
+GOOD_AI_MAX_CELLS: int = 16
+
+_SHARED_GOOD_AI: GoodAI = GoodAI()
+
+
+def get_good_ai(rows: int, columns: int) -> BaseAI:
+    """
+    Return the strong AI player for the board.
+
+    Small boards are solved by GoodAI (the instance and its transposition table are shared),
+    bigger boards get a new MctsAI, so its tree is reused only between the moves of one game.
+
+    Args:
+        rows (int): number of rows
+        columns (int): number of columns
+
+    Returns:
+        BaseAI: AI player
+    """
+    if rows * columns <= GOOD_AI_MAX_CELLS:
+        return _SHARED_GOOD_AI
+    return MctsAI()
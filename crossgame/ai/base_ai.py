@@ -1,6 +1,46 @@
-class BaseAI:
-    """_summary_
-    """
+"""Contains base class of the AI players."""
+from abc import ABC, abstractmethod
+from typing import Protocol
 
-    def __init__(self) -> None:
-        pass
+from crossgame.logic.empty_cells import EmptyCellIndex
+from crossgame.logic.game_enums import Sign
+from crossgame.logic.state import State
+
+
+class DenseGameState(Protocol):
+    """Game state API used by AI players (GameState, BitboardGameState, KInARowGameState)."""
+
+    win_length: int
+    free_cells: EmptyCellIndex
+
+    def get_game_state(self) -> list[list[Sign]]:
+        """Return the game field (matrix)."""
+
+    def is_cell_empty(self, x: int, y: int) -> bool:
+        """Check if the cell is empty."""
+
+    def is_winning_move(self, x: int, y: int, sign: Sign) -> bool:
+        """Check if the sign put to the empty cell wins the game."""
+
+    def game_is_finished(self) -> State:
+        """Return status of the game."""
+
+
+class BaseAI(ABC):
+    """Base class of the AI players, chooses a move for the passed game state."""
+
+    @abstractmethod
+    def choose_move(self, game_state: DenseGameState, sign: Sign) -> tuple[int, int]:
+        """
+        Choose the cell where the AI puts its sign.
+
+        Args:
+            game_state (DenseGameState): current state of the game
+            sign (Sign): sign of the AI player
+
+        Raises:
+            NoAvailableMovesException: raised if there is no empty cell or the game is finished
+
+        Returns:
+            tuple[int, int]: row and column of the chosen cell
+        """
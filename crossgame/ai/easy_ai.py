@@ -0,0 +1,52 @@
+"""Contains AI player that makes random moves."""
+import random
+
+from crossgame.ai.base_ai import BaseAI, DenseGameState
+from crossgame.exceptions.game_exceptions import NoAvailableMovesException
+from crossgame.logic.game_enums import GameStatus, Sign
+
+
+class EasyAI(BaseAI):
+    """
+    AI player that puts its sign to a random empty cell.
+
+    Empty cells are taken from the free_cells index maintained by the game state,
+    so the move costs O(1). With check_lines=True the AI first takes an immediate win
+    and blocks an immediate win of the opponent, it costs O(number of empty cells).
+    """
+
+    def __init__(self, check_lines: bool = False, seed: int = None) -> None:
+        """
+        Initialize AI player.
+
+        Args:
+            check_lines (bool, optional): take or block immediate wins. Defaults to False.
+            seed (int, optional): seed of the random generator. Defaults to None.
+        """
+        self.check_lines = check_lines
+        self.random = random.Random(seed)
+
+    def choose_move(self, game_state: DenseGameState, sign: Sign) -> tuple[int, int]:
+        """
+        Choose the cell for the sign.
+
+        Args:
+            game_state (DenseGameState): current state of the game, should provide free_cells and is_winning_move
+            sign (Sign): sign of the AI player
+
+        Raises:
+            NoAvailableMovesException: raised if there is no empty cell or the game is finished
+
+        Returns:
+            tuple[int, int]: row and column of the chosen cell
+        """
+        free_cells = game_state.free_cells
+        if len(free_cells) == 0 or game_state.game_is_finished().status != GameStatus.IN_PROGRESS:
+            raise NoAvailableMovesException('Game is finished, there is no move to make')
+        if self.check_lines:
+            other_sign = Sign.O if sign == Sign.X else Sign.X
+            for checked_sign in (sign, other_sign):
+                for x, y in free_cells:
+                    if game_state.is_winning_move(x, y, checked_sign):
+                        return x, y
+        return free_cells.random_cell(self.random)
@@ -0,0 +1,233 @@
+"""
+Contains AI player that searches the best move with negamax and alpha-beta pruning.
+
+Searched positions are kept in the Zobrist-hashed transposition table with
+bounded size and LRU eviction, so the table is reused between moves and games.
+Symmetric positions (rotations and reflections) share one table entry.
+Moves of the classic 3x3 game are taken from the precomputed tablebase.
+"""
+import random
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from crossgame.ai.base_ai import BaseAI, DenseGameState
+from crossgame.ai.search_board import EMPTY, SearchBoard, other_value
+from crossgame.ai.tablebase import SIZE, lookup, side_to_move
+from crossgame.exceptions.game_exceptions import NoAvailableMovesException
+from crossgame.logic.game_enums import Sign
+from crossgame.logic.symmetry import get_cell_permutations
+
+WIN_SCORE: int = 1_000_000
+INFINITY: int = WIN_SCORE * 2
+EXACT: int = 0
+LOWER_BOUND: int = 1
+UPPER_BOUND: int = 2
+NEIGHBOURHOOD_THRESHOLD: int = 25
+
+
+@dataclass
+class TableEntry:
+    """Result of the search of the position."""
+
+    depth: int
+    score: int
+    flag: int
+    best_move: int
+
+
+class TranspositionTable:
+    """
+    Bounded table of searched positions with LRU eviction.
+
+    The table can be shared by searches running in several threads without a lock,
+    an entry evicted by the other search is just a cache miss.
+    """
+
+    def __init__(self, max_size: int = 1_000_000) -> None:
+        """
+        Initialize transposition table.
+
+        Args:
+            max_size (int, optional): max number of positions. Defaults to 1_000_000.
+        """
+        self.max_size = max_size
+        self.entries: OrderedDict[int, TableEntry] = OrderedDict()
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        """Return number of stored positions."""
+        return len(self.entries)
+
+    def get(self, key: int) -> TableEntry | None:
+        """Return stored entry and mark it as recently used."""
+        entry = self.entries.get(key)
+        if entry is not None:
+            try:
+                self.entries.move_to_end(key)
+            except KeyError:
+                pass  # evicted by the search in other thread
+        return entry
+
+    def put(self, key: int, entry: TableEntry) -> None:
+        """Store entry, the least recently used entry is evicted if the table is full."""
+        self.entries.pop(key, None)
+        self.entries[key] = entry
+        while len(self.entries) > self.max_size:
+            try:
+                self.entries.popitem(last=False)
+            except KeyError:
+                break
+            self.evictions += 1
+
+
+class ZobristKeys:
+    """Random keys of the cells for the concrete board configuration."""
+
+    def __init__(self, board: SearchBoard, rnd: random.Random) -> None:
+        """
+        Generate keys for each cell and value and the key of the side to move.
+
+        Args:
+            board (SearchBoard): board of the configuration
+            rnd (random.Random): source of random keys
+        """
+        cells_number = board.width * board.height
+        self.base_key = rnd.getrandbits(64)
+        self.side_key = rnd.getrandbits(64)
+        self.cell_keys = [[0] * cells_number] + [[rnd.getrandbits(64) for _ in range(cells_number)]
+                                                 for _ in Sign]
+        self.permutations = list(get_cell_permutations(board.width, board.height).values())
+        self.inverse_permutations = []
+        for permutation in self.permutations:
+            inverse = [0] * cells_number
+            for index, transformed_index in enumerate(permutation):
+                inverse[transformed_index] = index
+            self.inverse_permutations.append(inverse)
+        center_x, center_y = (board.width - 1) / 2, (board.height - 1) / 2
+        self.ordered_cells = sorted(range(cells_number),
+                                    key=lambda i: abs(i // board.height - center_x) + abs(i % board.height - center_y))
+
+    def hash(self, board: SearchBoard, value: int) -> list[int]:
+        """Calculate hashes of the position (with the side to move) for each symmetry transform."""
+        hashes = []
+        for permutation in self.permutations:
+            key = self.base_key ^ (self.side_key if value == Sign.O.value else 0)
+            for index, cell in enumerate(board.cells):
+                key ^= self.cell_keys[cell][permutation[index]]
+            hashes.append(key)
+        return hashes
+
+    def hash_after_move(self, hashes: list[int], index: int, value: int) -> list[int]:
+        """Update hashes of the position with the move."""
+        keys = self.cell_keys[value]
+        return [key ^ keys[permutation[index]] ^ self.side_key for key, permutation in zip(hashes, self.permutations)]
+
+
+class GoodAI(BaseAI):
+    """AI player that searches the best move with negamax and alpha-beta pruning."""
+
+    def __init__(self, max_depth: int = None, table_size: int = 1_000_000, seed: int = 0) -> None:
+        """
+        Initialize AI player.
+
+        Args:
+            max_depth (int, optional): max number of moves to look ahead.
+                                       Defaults to None - search till the end of the game.
+            table_size (int, optional): max number of positions in the transposition table. Defaults to 1_000_000.
+            seed (int, optional): seed of the Zobrist keys. Defaults to 0.
+        """
+        self.max_depth = max_depth
+        self.table = TranspositionTable(table_size)
+        self.random = random.Random(seed)
+        self.keys: dict[tuple[int, int, int], ZobristKeys] = {}
+
+    def choose_move(self, game_state: DenseGameState, sign: Sign) -> tuple[int, int]:
+        """
+        Choose the best cell for the sign.
+
+        Args:
+            game_state (DenseGameState): current state of the game
+            sign (Sign): sign of the AI player
+
+        Raises:
+            NoAvailableMovesException: raised if there is no empty cell or the game is finished
+
+        Returns:
+            tuple[int, int]: row and column of the chosen cell
+        """
+        board = SearchBoard.from_game_state(game_state)
+        if board.empty_count == 0 or board.has_winner():
+            raise NoAvailableMovesException('Game is finished, there is no move to make')
+        if board.width == board.height == board.win_length == SIZE and side_to_move(board.cells) == sign.value:
+            entry = lookup(board.cells)
+            if entry is not None:
+                return entry.best_moves[0]
+        keys = self.__get_keys(board)
+        depth = board.empty_count if self.max_depth is None else min(self.max_depth, board.empty_count)
+        _, best_move = self.__negamax(board, keys, keys.hash(board, sign.value), sign.value,
+                                      depth, -INFINITY, INFINITY)
+        return board.to_coordinates(best_move)
+
+    def __get_keys(self, board: SearchBoard) -> ZobristKeys:
+        config = (board.width, board.height, board.win_length)
+        if config not in self.keys:
+            self.keys[config] = ZobristKeys(board, self.random)
+        return self.keys[config]
+
+    def __negamax(self, board: SearchBoard, keys: ZobristKeys, hashes: list[int], value: int,
+                  depth: int, alpha: int, beta: int) -> tuple[int, int]:
+        alpha_original = alpha
+        key = min(hashes)
+        transform = hashes.index(key)
+        best_move_hint = -1
+        entry = self.table.get(key)
+        if entry is not None:
+            best_move_hint = keys.inverse_permutations[transform][entry.best_move]
+            if entry.depth >= depth:
+                if entry.flag == EXACT:
+                    return entry.score, best_move_hint
+                if entry.flag == LOWER_BOUND:
+                    alpha = max(alpha, entry.score)
+                else:
+                    beta = min(beta, entry.score)
+                if alpha >= beta:
+                    return entry.score, best_move_hint
+
+        cells_number = len(board.cells)
+        best_score, best_move = -INFINITY, -1
+        for index in self.__generate_moves(board, keys, best_move_hint):
+            board.place(index, value)
+            if board.is_winning(index, value):
+                score = WIN_SCORE - (cells_number - board.empty_count)
+            elif board.empty_count == 0 or depth == 1:
+                score = 0
+            else:
+                score, _ = self.__negamax(board, keys, keys.hash_after_move(hashes, index, value),
+                                          other_value(value), depth - 1, -beta, -alpha)
+                score = -score
+            board.clear(index)
+            if score > best_score:
+                best_score, best_move = score, index
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+
+        if best_score <= alpha_original:
+            flag = UPPER_BOUND
+        elif best_score >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self.table.put(key, TableEntry(depth, best_score, flag, keys.permutations[transform][best_move]))
+        return best_score, best_move
+
+    @staticmethod
+    def __generate_moves(board: SearchBoard, keys: ZobristKeys, best_move_hint: int) -> list[int]:
+        cells = board.cells
+        moves = [index for index in keys.ordered_cells if cells[index] == EMPTY]
+        if len(cells) > NEIGHBOURHOOD_THRESHOLD and board.empty_count < len(cells):
+            moves = [index for index in moves if board.has_neighbour(index)]
+        if best_move_hint in moves:
+            moves.remove(best_move_hint)
+            moves.insert(0, best_move_hint)
+        return moves
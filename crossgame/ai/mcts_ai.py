@@ -0,0 +1,193 @@
+"""
+Contains AI player that uses Monte Carlo Tree Search (UCT) for big boards.
+
+The search runs until the time or playout budget is spent, so the move latency
+doesn't depend on the board size. The tree is kept between the moves of the
+same game: the subtree of the opponent's answer becomes the new root.
+"""
+import math
+import random
+import time
+
+from crossgame.ai.base_ai import BaseAI, DenseGameState
+from crossgame.ai.search_board import SearchBoard, other_value
+from crossgame.exceptions.game_exceptions import NoAvailableMovesException
+from crossgame.logic.game_enums import Sign
+
+NEIGHBOURHOOD_THRESHOLD: int = 25
+DRAW_RESULT: int = 0
+
+
+class MctsNode:
+    """Node of the search tree, keeps statistics of the move that leads to it."""
+
+    __slots__ = ('move', 'value', 'parent', 'children', 'untried_moves', 'visits', 'wins', 'winner')
+
+    def __init__(self, move: int, value: int, parent: 'MctsNode | None', untried_moves: list[int],
+                 winner: int | None = None) -> None:
+        """
+        Initialize node.
+
+        Args:
+            move (int): flat index of the move that leads to the node (-1 for the root)
+            value (int): cell value of the player that made the move
+            parent (MctsNode | None): parent node
+            untried_moves (list[int]): moves that are not expanded yet
+            winner (int | None, optional): result if the node is terminal
+                                           (cell value of the winner or DRAW_RESULT). Defaults to None.
+        """
+        self.move = move
+        self.value = value
+        self.parent = parent
+        self.children: list[MctsNode] = []
+        self.untried_moves = untried_moves
+        self.visits = 0
+        self.wins = 0.0
+        self.winner = winner
+
+    def select_child(self, exploration: float) -> 'MctsNode':
+        """Return child with the highest UCT score."""
+        log_visits = math.log(self.visits)
+        return max(self.children,
+                   key=lambda child: child.wins / child.visits + exploration * math.sqrt(log_visits / child.visits))
+
+
+class MctsAI(BaseAI):
+    """AI player that chooses the move with Monte Carlo Tree Search."""
+
+    def __init__(self, exploration: float = math.sqrt(2), time_budget: float = 0.2,
+                 playout_budget: int = None, seed: int = None) -> None:
+        """
+        Initialize AI player.
+
+        Args:
+            exploration (float, optional): UCT exploration constant. Defaults to sqrt(2).
+            time_budget (float, optional): max seconds per move. Defaults to 0.2.
+            playout_budget (int, optional): max playouts per move. Defaults to None - only time is limited.
+            seed (int, optional): seed of the random generator. Defaults to None.
+        """
+        self.exploration = exploration
+        self.time_budget = time_budget
+        self.playout_budget = playout_budget
+        self.random = random.Random(seed)
+        self.root: MctsNode | None = None
+        self.root_cells: list[int] | None = None
+
+    def choose_move(self, game_state: DenseGameState, sign: Sign) -> tuple[int, int]:
+        """
+        Choose the cell for the sign.
+
+        Args:
+            game_state (DenseGameState): current state of the game
+            sign (Sign): sign of the AI player
+
+        Raises:
+            NoAvailableMovesException: raised if there is no empty cell or the game is finished
+
+        Returns:
+            tuple[int, int]: row and column of the chosen cell
+        """
+        board = SearchBoard.from_game_state(game_state)
+        if board.empty_count == 0 or board.has_winner():
+            raise NoAvailableMovesException('Game is finished, there is no move to make')
+        root = self.__find_root(board, sign.value)
+        self.search(board, root)
+        best = max(root.children, key=lambda child: child.visits)
+        best.parent = None
+        board.place(best.move, sign.value)
+        self.root, self.root_cells = best, board.cells
+        return board.to_coordinates(best.move)
+
+    def search(self, board: SearchBoard, root: MctsNode) -> int:
+        """
+        Run playouts from the root until the budget is spent.
+
+        Args:
+            board (SearchBoard): position of the root (is not changed)
+            root (MctsNode): root of the tree
+
+        Returns:
+            int: number of playouts
+        """
+        deadline = time.perf_counter() + self.time_budget
+        scratch = SearchBoard(board.width, board.height, board.win_length, board.cells)
+        empty_cells: list[int] = []
+        playouts = 0
+        while not root.children or (time.perf_counter() < deadline
+                                    and (self.playout_budget is None or playouts < self.playout_budget)):
+            scratch.cells[:] = board.cells
+            scratch.empty_count = board.empty_count
+            node = root
+            while not node.untried_moves and node.children and node.winner is None:
+                node = node.select_child(self.exploration)
+                scratch.place(node.move, node.value)
+            if node.untried_moves and node.winner is None:
+                node = self.__expand(scratch, node)
+            result = node.winner if node.winner is not None else self.__playout(scratch, node.value, empty_cells)
+            while node is not None:
+                node.visits += 1
+                if result == node.value:
+                    node.wins += 1
+                elif result == DRAW_RESULT:
+                    node.wins += 0.5
+                node = node.parent
+            playouts += 1
+        return playouts
+
+    def __find_root(self, board: SearchBoard, value: int) -> MctsNode:
+        if self.root is not None and self.root_cells is not None and len(self.root_cells) == len(board.cells):
+            changed = [index for index, (old, new) in enumerate(zip(self.root_cells, board.cells)) if old != new]
+            if len(changed) == 1 and self.root_cells[changed[0]] == 0 and board.cells[changed[0]] == other_value(value):
+                for child in self.root.children:
+                    if child.move == changed[0]:
+                        child.parent = None
+                        return child
+        return self.new_root(board, value)
+
+    @staticmethod
+    def new_root(board: SearchBoard, value: int) -> MctsNode:
+        """
+        Create root of the new tree.
+
+        Args:
+            board (SearchBoard): position of the root
+            value (int): cell value of the player to move
+
+        Returns:
+            MctsNode: root node
+        """
+        return MctsNode(-1, other_value(value), None, MctsAI.__candidate_moves(board))
+
+    def __expand(self, scratch: SearchBoard, node: MctsNode) -> MctsNode:
+        moves = node.untried_moves
+        position = self.random.randrange(len(moves))
+        moves[position], moves[-1] = moves[-1], moves[position]
+        move = moves.pop()
+        value = other_value(node.value)
+        scratch.place(move, value)
+        winner = None
+        if scratch.is_winning(move, value):
+            winner = value
+        elif scratch.empty_count == 0:
+            winner = DRAW_RESULT
+        child = MctsNode(move, value, node, self.__candidate_moves(scratch) if winner is None else [], winner)
+        node.children.append(child)
+        return child
+
+    def __playout(self, scratch: SearchBoard, last_value: int, empty_cells: list[int]) -> int:
+        empty_cells.clear()
+        empty_cells.extend(index for index, cell in enumerate(scratch.cells) if cell == 0)
+        self.random.shuffle(empty_cells)
+        value = last_value
+        for move in empty_cells:
+            value = other_value(value)
+            scratch.place(move, value)
+            if scratch.is_winning(move, value):
+                return value
+        return DRAW_RESULT
+
+    @staticmethod
+    def __candidate_moves(board: SearchBoard) -> list[int]:
+        if len(board.cells) > NEIGHBOURHOOD_THRESHOLD and board.empty_count == len(board.cells):
+            return [board.width // 2 * board.height + board.height // 2]
+        return board.candidate_moves(NEIGHBOURHOOD_THRESHOLD)
@@ -0,0 +1,149 @@
+"""
+Contains AI player that runs independent MCTS trees in several processes (root parallelization).
+
+The worker pool is created once and shared by all the games, so each move costs only
+sending a few bytes to the workers. The position is sent as compact bytes
+(header + one byte per cell) instead of pickled game state objects, and the visit
+counts of the root moves from all the trees are summed to choose the move.
+"""
+import atexit
+import os
+import random
+import struct
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from crossgame.ai.base_ai import BaseAI, DenseGameState
+from crossgame.ai.mcts_ai import MctsAI
+from crossgame.ai.search_board import SearchBoard
+from crossgame.exceptions.game_exceptions import NoAvailableMovesException
+from crossgame.logic.game_enums import Sign
+
+POSITION_HEADER: struct.Struct = struct.Struct('<BBBB')
+
+_POOL: ProcessPoolExecutor | None = None
+_POOL_LOCK: threading.Lock = threading.Lock()
+
+
+def encode_position(board: SearchBoard, value: int) -> bytes:
+    """
+    Encode the position into bytes.
+
+    Args:
+        board (SearchBoard): position
+        value (int): cell value of the player to move
+
+    Returns:
+        bytes: width, height, win length, side to move and one byte per cell
+    """
+    return POSITION_HEADER.pack(board.width, board.height, board.win_length, value) + bytes(board.cells)
+
+
+def decode_position(data: bytes) -> tuple[SearchBoard, int]:
+    """
+    Decode the position from bytes.
+
+    Args:
+        data (bytes): encoded position
+
+    Returns:
+        tuple[SearchBoard, int]: position and cell value of the player to move
+    """
+    width, height, win_length, value = POSITION_HEADER.unpack_from(data)
+    return SearchBoard(width, height, win_length, list(data[POSITION_HEADER.size:])), value
+
+
+def search_root_moves(data: bytes, time_budget: float, playout_budget: int | None, seed: int) -> dict[int, int]:
+    """
+    Build one MCTS tree for the position (runs in the worker process).
+
+    Args:
+        data (bytes): encoded position
+        time_budget (float): max seconds of the search
+        playout_budget (int | None): max number of playouts
+        seed (int): seed of the random generator
+
+    Returns:
+        dict[int, int]: number of visits of each root move
+    """
+    board, value = decode_position(data)
+    ai = MctsAI(time_budget=time_budget, playout_budget=playout_budget, seed=seed)
+    root = ai.new_root(board, value)
+    ai.search(board, root)
+    return {child.move: child.visits for child in root.children}
+
+
+def get_search_pool(max_workers: int = None) -> ProcessPoolExecutor:
+    """
+    Return the shared worker pool, it is created at the first call.
+
+    Args:
+        max_workers (int, optional): number of processes. Defaults to None - number of CPUs.
+
+    Returns:
+        ProcessPoolExecutor: worker pool
+    """
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ProcessPoolExecutor(max_workers=max_workers)
+        return _POOL
+
+
+@atexit.register
+def shutdown_search_pool() -> None:
+    """Stop the shared worker pool."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.shutdown(cancel_futures=True)
+            _POOL = None
+
+
+class ParallelMctsAI(BaseAI):
+    """AI player that merges root statistics of MCTS trees built in parallel processes."""
+
+    def __init__(self, trees: int = None, time_budget: float = 0.2, playout_budget: int = None,
+                 seed: int = None) -> None:
+        """
+        Initialize AI player.
+
+        Args:
+            trees (int, optional): number of independent trees. Defaults to None - number of CPUs.
+            time_budget (float, optional): max seconds per move. Defaults to 0.2.
+            playout_budget (int, optional): max playouts per tree. Defaults to None - only time is limited.
+            seed (int, optional): seed of the random generator. Defaults to None.
+        """
+        self.trees = trees if trees is not None else os.cpu_count() or 1
+        self.time_budget = time_budget
+        self.playout_budget = playout_budget
+        self.random = random.Random(seed)
+
+    def choose_move(self, game_state: DenseGameState, sign: Sign) -> tuple[int, int]:
+        """
+        Choose the cell for the sign.
+
+        Args:
+            game_state (DenseGameState): current state of the game
+            sign (Sign): sign of the AI player
+
+        Raises:
+            NoAvailableMovesException: raised if there is no empty cell or the game is finished
+
+        Returns:
+            tuple[int, int]: row and column of the chosen cell
+        """
+        board = SearchBoard.from_game_state(game_state)
+        if board.empty_count == 0 or board.has_winner():
+            raise NoAvailableMovesException('Game is finished, there is no move to make')
+        data = encode_position(board, sign.value)
+        pool = get_search_pool()
+        futures = [pool.submit(search_root_moves, data, self.time_budget, self.playout_budget,
+                               self.random.getrandbits(32))
+                   for _ in range(self.trees)]
+        visits: Counter[int] = Counter()
+        for future in futures:
+            visits.update(future.result())
+        best_move, _ = visits.most_common(1)[0]
+        return board.to_coordinates(best_move)
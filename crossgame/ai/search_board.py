@@ -0,0 +1,122 @@
+"""
+Compact board used by AI players for the search.
+
+Cells are kept in the flat list (index = row * height + column) with values
+0 (empty), 1 (Sign.X) and 2 (Sign.O), so moves can be made and taken back
+without creating new objects.
+"""
+from crossgame.ai.base_ai import DenseGameState
+from crossgame.logic.k_in_a_row_state import DIRECTIONS
+
+EMPTY: int = 0
+
+
+def other_value(value: int) -> int:
+    """Return the cell value of the opponent (1 <-> 2)."""
+    return 3 - value
+
+
+class SearchBoard:
+    """Flat mutable board with k-in-a-row win detection through the last move."""
+
+    def __init__(self, width: int, height: int, win_length: int, cells: list[int] = None) -> None:
+        """
+        Initialize search board.
+
+        Args:
+            width (int): number of rows
+            height (int): number of columns
+            win_length (int): number of signs in a row to win
+            cells (list[int], optional): flat list of cell values. Defaults to None - empty board.
+        """
+        self.width = width
+        self.height = height
+        self.win_length = win_length
+        self.cells = list(cells) if cells is not None else [EMPTY] * (width * height)
+        self.empty_count = self.cells.count(EMPTY)
+
+    @staticmethod
+    def from_game_state(game_state: DenseGameState) -> 'SearchBoard':
+        """
+        Create search board from the game state.
+
+        Args:
+            game_state (DenseGameState): game state with dense field
+
+        Returns:
+            SearchBoard: copy of the field
+        """
+        field = game_state.get_game_state()
+        cells = [sign.value if sign is not None else EMPTY for row in field for sign in row]
+        return SearchBoard(len(field), len(field[0]), game_state.win_length, cells)
+
+    def to_coordinates(self, index: int) -> tuple[int, int]:
+        """Convert flat index to row and column."""
+        return divmod(index, self.height)
+
+    def empty_indexes(self) -> list[int]:
+        """Return flat indexes of all empty cells."""
+        return [index for index, value in enumerate(self.cells) if value == EMPTY]
+
+    def place(self, index: int, value: int) -> None:
+        """Put value to the empty cell."""
+        self.cells[index] = value
+        self.empty_count -= 1
+
+    def clear(self, index: int) -> None:
+        """Take back the value from the cell."""
+        self.cells[index] = EMPTY
+        self.empty_count += 1
+
+    def is_winning(self, index: int, value: int) -> bool:
+        """
+        Check if the value in the cell is a part of win_length values in a row.
+
+        Args:
+            index (int): flat index of the cell
+            value (int): value that is (or would be) placed in the cell
+
+        Returns:
+            bool: True if the line is completed
+        """
+        cells = self.cells
+        x, y = divmod(index, self.height)
+        for dx, dy in DIRECTIONS:
+            count = 1
+            for direction in (1, -1):
+                nx, ny = x + dx * direction, y + dy * direction
+                while 0 <= nx < self.width and 0 <= ny < self.height and cells[nx * self.height + ny] == value:
+                    count += 1
+                    nx += dx * direction
+                    ny += dy * direction
+            if count >= self.win_length:
+                return True
+        return False
+
+    def has_winner(self) -> bool:
+        """Check all the occupied cells for the completed line."""
+        return any(value != EMPTY and self.is_winning(index, value) for index, value in enumerate(self.cells))
+
+    def has_neighbour(self, index: int) -> bool:
+        """Check if any of 8 cells around the cell is occupied."""
+        x, y = divmod(index, self.height)
+        for nx in range(max(0, x - 1), min(self.width, x + 2)):
+            for ny in range(max(0, y - 1), min(self.height, y + 2)):
+                if self.cells[nx * self.height + ny] != EMPTY:
+                    return True
+        return False
+
+    def candidate_moves(self, neighbourhood_threshold: int) -> list[int]:
+        """
+        Return empty cells worth to be considered by the search.
+
+        Args:
+            neighbourhood_threshold (int): on boards with more cells only the cells next to occupied ones are returned
+
+        Returns:
+            list[int]: flat indexes of the cells
+        """
+        moves = self.empty_indexes()
+        if len(self.cells) > neighbourhood_threshold and self.empty_count < len(self.cells):
+            moves = [index for index in moves if self.has_neighbour(index)]
+        return moves
@@ -0,0 +1,209 @@
+"""
+Contains perfect-play tablebase of the classic 3x3 game.
+
+Every position is indexed by its base-3 code (cell value * 3 ** cell index, where
+0 - empty, 1 - X, 2 - O). X always makes the first move, so the side to move is
+defined by the number of signs. Each position is kept in 16 bits:
+bits 0..8 - mask of the best moves, bits 9..10 - value for the side to move
+(0 - not a reachable in-progress position, 1 - loss, 2 - draw, 3 - win).
+
+The table is generated by this module and stored in game_resources/tablebase.
+Usage:
+    python -m crossgame.ai.tablebase generate [path]
+    python -m crossgame.ai.tablebase verify [path]
+"""
+import argparse
+import importlib.resources as res
+import sys
+from array import array
+from dataclasses import dataclass
+
+from crossgame.ai.search_board import EMPTY, SearchBoard
+from crossgame.logic.game_enums import Sign
+
+SIZE: int = 3
+CELLS_NUMBER: int = SIZE * SIZE
+POSITIONS_NUMBER: int = 3 ** CELLS_NUMBER
+TABLEBASE_FILE: str = 'classic_3x3.bin'
+UNKNOWN: int = 0
+LOSS: int = 1
+DRAW: int = 2
+WIN: int = 3
+VALUE_SHIFT: int = 9
+MOVES_MASK: int = (1 << VALUE_SHIFT) - 1
+POWERS: tuple[int, ...] = tuple(3 ** i for i in range(CELLS_NUMBER))
+
+_TABLEBASE: array | None = None
+
+
+@dataclass
+class TablebaseEntry:
+    """Game-theoretic value of the position for the side to move and all its best moves."""
+
+    value: int
+    best_moves: list[tuple[int, int]]
+
+
+def position_code(cells: list[int]) -> int:
+    """Return base-3 code of the flat list of cell values."""
+    return sum(value * power for value, power in zip(cells, POWERS))
+
+
+def side_to_move(cells: list[int]) -> int:
+    """Return the cell value of the player that makes the next move (X moves first)."""
+    return Sign.X.value if cells.count(Sign.X.value) == cells.count(Sign.O.value) else Sign.O.value
+
+
+def generate_tablebase() -> array:
+    """
+    Solve all the positions reachable from the empty board.
+
+    Returns:
+        array: 16-bit entries indexed by position code
+    """
+    table = array('H', [0]) * POSITIONS_NUMBER
+    board = SearchBoard(SIZE, SIZE, SIZE)
+    solved: set[int] = set()
+
+    def solve(code: int, value: int) -> int:
+        if code in solved:
+            return table[code] >> VALUE_SHIFT
+        results = []
+        for index in range(CELLS_NUMBER):
+            if board.cells[index] != EMPTY:
+                continue
+            board.place(index, value)
+            if board.is_winning(index, value):
+                result = WIN
+            elif board.empty_count == 0:
+                result = DRAW
+            else:
+                result = WIN + LOSS - solve(code + value * POWERS[index], 3 - value)
+            board.clear(index)
+            results.append((result, index))
+        best = max(result for result, _ in results)
+        mask = sum(1 << index for result, index in results if result == best)
+        table[code] = (best << VALUE_SHIFT) | mask
+        solved.add(code)
+        return best
+
+    solve(0, Sign.X.value)
+    return table
+
+
+def write_tablebase(path: str) -> None:
+    """Generate the tablebase and write it to the file (little-endian 16-bit entries)."""
+    table = generate_tablebase()
+    if sys.byteorder != 'little':
+        table.byteswap()
+    with open(path, 'wb') as file:
+        table.tofile(file)
+
+
+def read_tablebase(path: str = None) -> array:
+    """
+    Read the tablebase from the file.
+
+    Args:
+        path (str, optional): path to the file. Defaults to None - the file from game_resources.
+
+    Returns:
+        array: 16-bit entries indexed by position code
+    """
+    if path is None:
+        data = (res.files('game_resources.tablebase') / TABLEBASE_FILE).read_bytes()
+    else:
+        with open(path, 'rb') as file:
+            data = file.read()
+    table = array('H')
+    table.frombytes(data)
+    if sys.byteorder != 'little':
+        table.byteswap()
+    if len(table) != POSITIONS_NUMBER:
+        raise ValueError(f'Tablebase should have {POSITIONS_NUMBER} entries, but has {len(table)}')
+    return table
+
+
+def get_tablebase() -> array:
+    """Return the tablebase, it is loaded at the first call."""
+    global _TABLEBASE
+    if _TABLEBASE is None:
+        try:
+            _TABLEBASE = read_tablebase()
+        except (OSError, ValueError):
+            _TABLEBASE = generate_tablebase()
+    return _TABLEBASE
+
+
+def lookup(cells: list[int]) -> TablebaseEntry | None:
+    """
+    Find the position in the tablebase.
+
+    Args:
+        cells (list[int]): flat list of 9 cell values
+
+    Returns:
+        TablebaseEntry | None: None if the position is finished or can't be reached in the game
+    """
+    entry = get_tablebase()[position_code(cells)]
+    value = entry >> VALUE_SHIFT
+    if value == UNKNOWN:
+        return None
+    moves = [divmod(index, SIZE) for index in range(CELLS_NUMBER) if entry & (1 << index)]
+    return TablebaseEntry(value, moves)
+
+
+def verify_tablebase(table: array) -> list[int]:
+    """
+    Compare the tablebase with brute-force minimax over the whole game tree.
+
+    Args:
+        table (array): tablebase entries
+
+    Returns:
+        list[int]: codes of the positions with wrong entries
+    """
+    board = SearchBoard(SIZE, SIZE, SIZE)
+    errors: set[int] = set()
+
+    def minimax(code: int, value: int) -> int:
+        results = {}
+        for index in range(CELLS_NUMBER):
+            if board.cells[index] != EMPTY:
+                continue
+            board.place(index, value)
+            if board.is_winning(index, value):
+                results[index] = WIN
+            elif board.empty_count == 0:
+                results[index] = DRAW
+            else:
+                results[index] = WIN + LOSS - minimax(code + value * POWERS[index], 3 - value)
+            board.clear(index)
+        best = max(results.values())
+        mask = sum(1 << index for index, result in results.items() if result == best)
+        if table[code] != (best << VALUE_SHIFT) | mask:
+            errors.add(code)
+        return best
+
+    minimax(0, Sign.X.value)
+    return sorted(errors)
+
+
+def main() -> None:
+    """Generate or verify the tablebase file."""
+    parser = argparse.ArgumentParser(description='Classic 3x3 Tic-Tac-Toe tablebase')
+    parser.add_argument('command', choices=['generate', 'verify'])
+    parser.add_argument('path', nargs='?', default=None)
+    args = parser.parse_args()
+    if args.command == 'generate':
+        path = args.path if args.path else str(res.files('game_resources.tablebase') / TABLEBASE_FILE)
+        write_tablebase(path)
+        print(f'Tablebase is written to {path}')
+    else:
+        errors = verify_tablebase(read_tablebase(args.path))
+        print(f'Found {len(errors)} wrong positions')
+        sys.exit(1 if errors else 0)
+
+
+if __name__ == '__main__':
+    main()
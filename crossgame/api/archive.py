@@ -0,0 +1,264 @@
+"""
+Module contains archive of the finished games in columnar compressed files.
+
+The archiver moves finished games (the game has the winner or is finished with a draw)
+out of the live persistence in batches. Each batch is appended to the archive file
+as one block. The block keeps every field of the games as a separate column
+compressed by zlib, so similar values (timestamps, sizes, coordinates) are compressed well
+and the reader can skip the columns it doesn't need without unpacking them.
+
+Block format (all numbers are little-endian):
+    header: magic b'CGAB', format version (1 byte), number of games (4 bytes), number of columns (1 byte)
+    column: column id (1 byte), compressed length (4 bytes), zlib-compressed data
+Moves are stored as row and column pairs, the first move is made by the first player.
+"""
+import glob
+import logging as log
+import os
+import struct
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator
+
+from crossgame.api.codec import get_game_type
+from crossgame.api.persistance import SavedGameInfo
+from crossgame.exceptions.game_exceptions import GameNotFoundException
+from crossgame.logic.game_enums import Sign
+
+MAGIC: bytes = b'CGAB'
+FORMAT_VERSION: int = 1
+BLOCK_HEADER: struct.Struct = struct.Struct('<4sBIB')
+COLUMN_HEADER: struct.Struct = struct.Struct('<BI')
+LENGTH: struct.Struct = struct.Struct('<H')
+FILE_PATTERN: str = 'games-{:06d}.cga'
+
+COLUMN_GAME_ID: int = 1
+COLUMN_CREATED_AT: int = 2
+COLUMN_ARCHIVED_AT: int = 3
+COLUMN_ROWS: int = 4
+COLUMN_COLUMNS: int = 5
+COLUMN_WIN_LENGTH: int = 6
+COLUMN_OUTCOME: int = 7
+COLUMN_FIRST_PLAYER_ID: int = 8
+COLUMN_SECOND_PLAYER_ID: int = 9
+COLUMN_MOVE_COUNT: int = 10
+COLUMN_MOVES: int = 11
+
+OUTCOME_DRAW: int = 0
+
+
+@dataclass
+class ArchivedGame:
+    """Finished game read from the archive."""
+
+    game_id: str
+    created_at: float
+    archived_at: float
+    rows: int
+    columns: int
+    win_length: int | None
+    winner: Sign | None
+    player_ids: tuple[str, str]
+    moves: list[tuple[int, int]]
+
+
+def pack_strings(values: Iterable[str]) -> bytes:
+    """Pack strings: 2-byte length and UTF-8 bytes of each."""
+    parts = []
+    for value in values:
+        data = value.encode('utf-8')
+        parts.append(LENGTH.pack(len(data)))
+        parts.append(data)
+    return b''.join(parts)
+
+
+def unpack_strings(data: bytes, count: int) -> list[str]:
+    """Unpack count strings packed by pack_strings."""
+    values = []
+    offset = 0
+    for _ in range(count):
+        (length,) = LENGTH.unpack_from(data, offset)
+        offset += LENGTH.size
+        values.append(data[offset:offset + length].decode('utf-8'))
+        offset += length
+    return values
+
+
+def encode_block(game_infos: list[SavedGameInfo], archived_at: float) -> bytes:
+    """
+    Pack finished games to the block of columns.
+
+    Args:
+        game_infos (list[SavedGameInfo]): finished games
+        archived_at (float): time of the archivation (seconds since the epoch)
+
+    Returns:
+        bytes: packed block
+    """
+    count = len(game_infos)
+    games = [game_info.game for game_info in game_infos]
+    win_lengths = [get_game_type(game)[1] or 0 for game in games]
+    moves = [value for game in games for move in game.moves for value in (move.row, move.column)]
+    columns = {
+        COLUMN_GAME_ID: pack_strings(game_info.game_id for game_info in game_infos),
+        COLUMN_CREATED_AT: struct.pack(f'<{count}d', *(game_info.created_at for game_info in game_infos)),
+        COLUMN_ARCHIVED_AT: struct.pack(f'<{count}d', *([archived_at] * count)),
+        COLUMN_ROWS: struct.pack(f'<{count}H', *(game.rows for game in games)),
+        COLUMN_COLUMNS: struct.pack(f'<{count}H', *(game.columns for game in games)),
+        COLUMN_WIN_LENGTH: struct.pack(f'<{count}B', *win_lengths),
+        COLUMN_OUTCOME: bytes(game.winner.sign.value if not game.winner.is_draw else OUTCOME_DRAW
+                              for game in games),
+        COLUMN_FIRST_PLAYER_ID: pack_strings(game.players[0].player_id for game in games),
+        COLUMN_SECOND_PLAYER_ID: pack_strings(game.players[1].player_id for game in games),
+        COLUMN_MOVE_COUNT: struct.pack(f'<{count}I', *(len(game.moves) for game in games)),
+        COLUMN_MOVES: struct.pack(f'<{len(moves)}i', *moves),
+    }
+    parts = [BLOCK_HEADER.pack(MAGIC, FORMAT_VERSION, count, len(columns))]
+    for column_id, data in columns.items():
+        compressed = zlib.compress(data)
+        parts.append(COLUMN_HEADER.pack(column_id, len(compressed)))
+        parts.append(compressed)
+    return b''.join(parts)
+
+
+def decode_block(columns: dict[int, bytes], count: int) -> Iterator[ArchivedGame]:
+    """Create games from the unpacked columns of the block."""
+    game_ids = unpack_strings(columns[COLUMN_GAME_ID], count)
+    created_at = struct.unpack(f'<{count}d', columns[COLUMN_CREATED_AT])
+    archived_at = struct.unpack(f'<{count}d', columns[COLUMN_ARCHIVED_AT])
+    rows = struct.unpack(f'<{count}H', columns[COLUMN_ROWS])
+    field_columns = struct.unpack(f'<{count}H', columns[COLUMN_COLUMNS])
+    win_lengths = columns[COLUMN_WIN_LENGTH]
+    outcomes = columns[COLUMN_OUTCOME]
+    first_player_ids = unpack_strings(columns[COLUMN_FIRST_PLAYER_ID], count)
+    second_player_ids = unpack_strings(columns[COLUMN_SECOND_PLAYER_ID], count)
+    move_counts = struct.unpack(f'<{count}I', columns[COLUMN_MOVE_COUNT])
+    moves = columns[COLUMN_MOVES]
+    offset = 0
+    for index in range(count):
+        coordinates = struct.unpack_from(f'<{2 * move_counts[index]}i', moves, offset)
+        offset += 8 * move_counts[index]
+        yield ArchivedGame(game_ids[index], created_at[index], archived_at[index], rows[index],
+                           field_columns[index], win_lengths[index] or None,
+                           Sign(outcomes[index]) if outcomes[index] != OUTCOME_DRAW else None,
+                           (first_player_ids[index], second_player_ids[index]),
+                           list(zip(coordinates[::2], coordinates[1::2])))
+
+
+def read_archive(path: str) -> Iterator[ArchivedGame]:
+    """
+    Stream games from the archive file or from all files of the archive directory.
+
+    Args:
+        path (str): archive file or directory
+
+    Raises:
+        ValueError: raised if the file is not an archive or has unsupported version
+
+    Yields:
+        ArchivedGame: archived game
+    """
+    for count, columns in read_blocks(path):
+        yield from decode_block(columns, count)
+
+
+def read_blocks(path: str, column_ids: set[int] = None) -> Iterator[tuple[int, dict[int, bytes]]]:
+    """
+    Stream blocks of the archive file or of all files of the archive directory.
+
+    Args:
+        path (str): archive file or directory
+        column_ids (set[int], optional): ids of the columns to unpack (COLUMN_*), other columns are skipped.
+                                         Defaults to None - all columns.
+
+    Raises:
+        ValueError: raised if the file is not an archive or has unsupported version
+
+    Yields:
+        tuple[int, dict[int, bytes]]: number of games in the block and unpacked columns
+    """
+    paths = sorted(glob.glob(os.path.join(path, 'games-*.cga'))) if os.path.isdir(path) else [path]
+    for file_path in paths:
+        with open(file_path, 'rb') as file:
+            while header := file.read(BLOCK_HEADER.size):
+                try:
+                    magic, version, count, column_count = BLOCK_HEADER.unpack(header)
+                    if magic != MAGIC or version != FORMAT_VERSION:
+                        raise ValueError(f'{file_path} is not the archive of version {FORMAT_VERSION}')
+                    columns = {}
+                    for _ in range(column_count):
+                        column_id, length = COLUMN_HEADER.unpack(file.read(COLUMN_HEADER.size))
+                        if column_ids is None or column_id in column_ids:
+                            columns[column_id] = zlib.decompress(file.read(length))
+                        else:
+                            file.seek(length, os.SEEK_CUR)
+                except (struct.error, zlib.error):
+                    log.warning('Archive %s has incomplete block, the rest is skipped', file_path)
+                    break
+                yield count, columns
+
+
+class GameArchiver:
+    """Moves finished games from the live persistence to the archive files."""
+
+    def __init__(self, persistance: Any, directory: str, batch_size: int = 1000,
+                 max_file_size: int = 64 * 1024 * 1024) -> None:
+        """
+        Initialize archiver.
+
+        Args:
+            persistance (Any): live persistence that has get_finished_game_ids (in-memory, sharded)
+            directory (str): archive directory
+            batch_size (int, optional): max number of games in the block. Defaults to 1000.
+            max_file_size (int, optional): size of the file in bytes to start the next one. Defaults to 64 MB.
+        """
+        self.persistance = persistance
+        self.directory = directory
+        self.batch_size = batch_size
+        self.max_file_size = max_file_size
+        os.makedirs(directory, exist_ok=True)
+
+    def archive_finished_games(self) -> int:
+        """
+        Append finished games to the archive and remove them from the live persistence.
+
+        Games are removed only after the block is written to the disk.
+
+        Returns:
+            int: number of archived games
+        """
+        archived = 0
+        while game_ids := self.persistance.get_finished_game_ids(self.batch_size):
+            game_infos = {}
+            for game_id in game_ids:
+                try:
+                    game_infos[game_id] = self.persistance.get_game_info(game_id)
+                except GameNotFoundException:
+                    log.debug('Game %s is removed before the archivation', game_id)
+            self.write(list(game_infos.values()))
+            for game_id in game_infos:
+                self.persistance.remove_game_info(game_id)
+            archived += len(game_infos)
+        return archived
+
+    def write(self, game_infos: list[SavedGameInfo]) -> None:
+        """
+        Append finished games to the current archive file as one block.
+
+        Args:
+            game_infos (list[SavedGameInfo]): finished games
+        """
+        if not game_infos:
+            return
+        with open(self.__get_current_path(), 'ab') as file:
+            file.write(encode_block(game_infos, time.time()))
+            file.flush()
+            os.fsync(file.fileno())
+
+    def __get_current_path(self) -> str:
+        paths = sorted(glob.glob(os.path.join(self.directory, 'games-*.cga')))
+        number = int(os.path.basename(paths[-1])[6:12]) if paths else 0
+        if paths and os.path.getsize(paths[-1]) >= self.max_file_size:
+            number += 1
+        return os.path.join(self.directory, FILE_PATTERN.format(number))
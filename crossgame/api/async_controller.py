@@ -0,0 +1,301 @@
+"""Module contains asyncio API of the Game for async web servers."""
+import asyncio
+import logging as log
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Executor
+from typing import Any
+from uuid import uuid4
+
+from crossgame.ai.base_ai import BaseAI
+from crossgame.ai.good_ai import GoodAI
+from crossgame.api.api_dto import GameStateDto
+from crossgame.api.async_persistance import to_async_persistence
+from crossgame.api.controller import (check_game_size, get_active_ai_player, get_move_deltas, get_player_ai,
+                                     notify_move_listeners)
+from crossgame.api.game_updates import AsyncGameUpdateNotifier, MoveListener
+from crossgame.api.persistance import SavedGameInfo
+from crossgame.api.player import Player, PlayerType
+from crossgame.logic.game import TicTacToeGame, TicTacToeGameKInARow
+from crossgame.logic.game_enums import GameStatus, Sign
+
+
+class AsyncController:
+    """
+    Represent the asyncio API to control the game flow, the same as Controller.
+
+    Operations on one game session are serialized by the asyncio lock of the game.
+    Start and moves are shielded from the cancellation of the caller: the in-memory game is changed
+    before the AI move is awaited, so the change is always finished by the AI move, the new version and the save.
+    Choice of the AI moves and hints is made in the executor, so the event loop
+    keeps serving other games while the AI thinks. Synchronous persistence services
+    are wrapped by AsyncPersistenceAdapter.
+    """
+
+    def __init__(self, persistance: Any, executor: Executor = None, update_poll_interval: float = 1.0) -> None:
+        """
+        Initialize AsyncController.
+
+        Args:
+            persistance (Any): async or synchronous persistence service
+            executor (Executor, optional): executor of the AI and the blocking persistence calls.
+                                           Defaults to None - default executor of the loop.
+            update_poll_interval (float, optional): seconds between checks of the version by the waiting clients,
+                                                    catches changes made by other processes. Defaults to 1.0.
+        """
+        self.persistance = to_async_persistence(persistance, executor)
+        self.executor = executor
+        self.game_locks: weakref.WeakValueDictionary[str, asyncio.Lock] = weakref.WeakValueDictionary()
+        self.updates = AsyncGameUpdateNotifier()
+        self.update_poll_interval = update_poll_interval
+        self.move_listeners: list[MoveListener] = []
+        self.hint_ai = GoodAI(max_depth=4)
+        self.ai_players: OrderedDict[str, BaseAI] = OrderedDict()
+
+    async def start_game_session(self, player_name: str) -> GameStateDto:
+        """
+        Create a game session objects and saves to persistance service.
+
+        Args:
+            player_name (str): name of the first player
+
+        Returns:
+            GameStateDto: current game status
+        """
+        game_id: str = str(uuid4())
+        player: Player = Player(player_name, str(uuid4()), Sign.X, True)
+        await self.persistance.save_game_info(game_id, SavedGameInfo(game_id, [player]))
+        log.debug('Created game session, game_id %s, player_id %s', game_id, player)
+        return GameStateDto(game_id=game_id, player_names=[player.player_name], active_player=player)
+
+    async def join_to_game_game_session(self, player_name: str, game_id: str,
+                                        player_type: PlayerType = PlayerType.PLAYER) -> GameStateDto:
+        """
+        Join a player to the game session by it ID, create second player with sign O.
+
+        Args:
+            player_name (str): second player name that joins
+            game_id (str): unique id of the game session
+            player_type (PlayerType, optional): type of the second player. Defaults to PlayerType.PLAYER.
+
+        Raises:
+            GameNotFoundException: raised if the game is not found
+
+        Returns:
+            GameStateDto: current game status
+        """
+        async with self.__get_lock(game_id):
+            game_info = await self.persistance.get_game_info(game_id)
+            player: Player = Player(player_name, str(uuid4()), Sign.O, False, player_type)
+            game_info.players.append(player)
+            game_info.version += 1
+            await self.persistance.save_game_info(game_id, game_info)
+            player_names = [game_player.player_name for game_player in game_info.players]
+        self.updates.notify(game_id)
+        log.debug('Joined to game session, game_id %s, player_id %s', game_id, player)
+        return GameStateDto(game_id=game_id, player_names=player_names, active_player=player)
+
+    async def start_game(self, game_id: str, row: int = 3, column: int = 3, win_length: int = None) -> GameStateDto:
+        """
+        Initialize game, creates game field, prepare everything to make a first move.
+
+        Args:
+            game_id (str): unique id of the game session
+            row (int, optional): number of rows. Defaults to 3.
+            column (int, optional): number of columns. Defaults to 3.
+            win_length (int, optional): number of signs in a row to win.
+                                        Defaults to None - whole row, column or diagonal should be filled.
+
+        Raises:
+            IncorrectFieldSizeException: raised if the field is incorrect or the finished game doesn't fit the storage
+
+        Returns:
+            GameStateDto: current game status
+        """
+        return await asyncio.shield(self.__start_game(game_id, row, column, win_length))
+
+    async def make_move(self, game_id: str, player_id: str, row: int, column: int) -> GameStateDto:
+        """
+        Player that is active makes a move passing coordinates where he wants to put its sign.
+
+        Args:
+            game_id (str): unique id of the game session
+            player_id (str): player ID that was assigned during creation of player
+            row (int): int value of row
+            column (int): int value of column
+
+        Returns:
+            GameStateDto: current game status
+        """
+        return await asyncio.shield(self.__make_move(game_id, player_id, row, column))
+
+    async def get_status(self, game_id: str) -> GameStateDto:
+        """
+        Get current game state.
+
+        Args:
+            game_id (str): unique id of the game session
+
+        Returns:
+            GameStateDto: current game status, None if the game is not started
+        """
+        async with self.__get_lock(game_id):
+            game_info = await self.persistance.get_game_info(game_id)
+            if not game_info.is_started:
+                return None
+            return game_info.game.get_game_state()
+
+    async def get_hint(self, game_id: str) -> tuple[int, int]:
+        """
+        Suggest the best move for the active player, the move is chosen in the executor.
+
+        Args:
+            game_id (str): unique id of the game session
+
+        Raises:
+            NoAvailableMovesException: raised if the game is finished
+
+        Returns:
+            tuple[int, int]: row and column of the suggested cell, None if the game is not started
+        """
+        async with self.__get_lock(game_id):
+            game_info = await self.persistance.get_game_info(game_id)
+            if not game_info.is_started:
+                return None
+            active_player = next(player for player in game_info.players if player.is_active)
+            return await asyncio.get_running_loop().run_in_executor(
+                self.executor, self.hint_ai.choose_move, game_info.game.game_state, active_player.sign)
+
+    def add_move_listener(self, listener: MoveListener) -> None:
+        """
+        Register the function called with the id of the game and the new moves after each start and move.
+
+        Args:
+            listener (MoveListener): function (game_id, moves) -> None, called in the event loop
+        """
+        self.move_listeners.append(listener)
+
+    def remove_move_listener(self, listener: MoveListener) -> None:
+        """
+        Unregister the move listener.
+
+        Args:
+            listener (MoveListener): registered function
+        """
+        self.move_listeners.remove(listener)
+
+    async def get_version(self, game_id: str) -> int:
+        """
+        Get the version of the game session, it is increased by each join, start and move.
+
+        Args:
+            game_id (str): unique id of the game session
+
+        Returns:
+            int: version of the game session
+        """
+        get_game_version = getattr(self.persistance, 'get_game_version', None)
+        if get_game_version is not None:
+            return await get_game_version(game_id)
+        async with self.__get_lock(game_id):
+            return (await self.persistance.get_game_info(game_id)).version
+
+    async def wait_for_update(self, game_id: str, version: int, timeout: float) -> int:
+        """
+        Wait until the version of the game session differs from the passed one.
+
+        The version is checked every update_poll_interval seconds only if the persistence is shared
+        by several processes (is_shared), changes made by this AsyncController wake up the waiting clients.
+
+        Args:
+            game_id (str): unique id of the game session
+            version (int): version known to the client
+            timeout (float): max seconds to wait
+
+        Raises:
+            GameNotFoundException: raised if the game is not found
+
+        Returns:
+            int: current version, equal to the passed one if the time is out
+        """
+        deadline = time.monotonic() + timeout
+        is_shared = getattr(self.persistance, 'is_shared', True)
+        async with self.updates.watch(game_id) as watch:
+            while True:
+                current_version = await self.get_version(game_id)
+                remaining = deadline - time.monotonic()
+                if current_version != version or remaining <= 0:
+                    return current_version
+                await watch.wait(min(remaining, self.update_poll_interval) if is_shared else remaining)
+
+    async def wait_for_next_move(self, game_id: str, version: int, timeout: float) -> GameStateDto | None:
+        """
+        Wait until the game session is changed and return its state.
+
+        Args:
+            game_id (str): unique id of the game session
+            version (int): version known to the client
+            timeout (float): max seconds to wait
+
+        Returns:
+            GameStateDto | None: current game status, None if the time is out or the game is not started
+        """
+        if await self.wait_for_update(game_id, version, timeout) == version:
+            return None
+        return await self.get_status(game_id)
+
+    async def __start_game(self, game_id: str, row: int, column: int, win_length: int | None) -> GameStateDto:
+        async with self.__get_lock(game_id):
+            game_info = await self.persistance.get_game_info(game_id)
+            if win_length is None:
+                game_info.game = TicTacToeGame(game_id, game_info.players, row, column)
+            else:
+                game_info.game = TicTacToeGameKInARow(game_id, game_info.players, row, column, win_length)
+            game_info.is_started = True
+            check_game_size(self.persistance, game_info)
+            await self.__make_ai_moves(game_info)
+            game_info.version += 1
+            await self.persistance.save_game_info(game_id, game_info)
+            game_state = game_info.game.get_game_state()
+            deltas = get_move_deltas(game_info, 0)
+        self.updates.notify(game_id)
+        notify_move_listeners(self.move_listeners, game_id, deltas)
+        log.debug('start_game, game_id %s', game_id)
+        return game_state
+
+    async def __make_move(self, game_id: str, player_id: str, row: int, column: int) -> GameStateDto:
+        async with self.__get_lock(game_id):
+            game_info: SavedGameInfo = await self.persistance.get_game_info(game_id)
+            move_count = len(game_info.game.moves)
+            game_info.game.make_move(player_id, row, column)
+            await self.__make_ai_moves(game_info)
+            game_info.version += 1
+            await self.persistance.save_game_info(game_id, game_info)
+            game_state = game_info.game.get_game_state()
+            deltas = get_move_deltas(game_info, move_count)
+        self.updates.notify(game_id)
+        notify_move_listeners(self.move_listeners, game_id, deltas)
+        log.debug('make_move, game_id %s', game_id)
+        return game_state
+
+    def __get_lock(self, game_id: str) -> asyncio.Lock:
+        lock = self.game_locks.get(game_id)
+        if lock is None:
+            lock = self.game_locks[game_id] = asyncio.Lock()
+        return lock
+
+    async def __make_ai_moves(self, game_info: SavedGameInfo) -> None:
+        """Make moves of the AI players while one of them is active, the moves are chosen in the executor."""
+        game = game_info.game
+        loop = asyncio.get_running_loop()
+        while (active_player := get_active_ai_player(game)) is not None:
+            ai = get_player_ai(self.ai_players, game, active_player)
+            row, column = await loop.run_in_executor(self.executor, ai.choose_move, game.game_state,
+                                                     active_player.sign)
+            game.make_move(active_player.player_id, row, column)
+            log.debug('AI move, game_id %s, player_id %s, cell %s:%s',
+                      game.game_id, active_player.player_id, row, column)
+        if game.game_state.game_is_finished().status != GameStatus.IN_PROGRESS:
+            for player in game.players:
+                self.ai_players.pop(player.player_id, None)
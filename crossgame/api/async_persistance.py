@@ -0,0 +1,122 @@
+"""
+Module contains adapter of the synchronous persistence services for the coroutines.
+
+Async persistence services have the same methods as the synchronous ones, but they are coroutines:
+    async save_game_info(game_id, game_info), async get_game_info(game_id), async remove_game_info(game_id)
+In-memory services are called directly (they never wait), the others are called
+in the executor, so waiting for the disk or the network doesn't block the event loop.
+
+    Raises:
+        GameNotFoundException: raised if the game_id is not found
+"""
+import asyncio
+import inspect
+from concurrent.futures import Executor
+from typing import Any
+
+from crossgame.api.persistance import GameStateInMemoryPersistence, SavedGameInfo
+from crossgame.api.sharded_persistance import GameStateShardedPersistence
+
+IN_MEMORY_PERSISTENCES: tuple[type, ...] = (GameStateInMemoryPersistence, GameStateShardedPersistence)
+
+
+class AsyncPersistenceAdapter:
+    """Async persistence service that calls the synchronous one."""
+
+    def __init__(self, persistance: Any, executor: Executor = None, is_blocking: bool = True) -> None:
+        """
+        Initialize adapter.
+
+        Args:
+            persistance (Any): synchronous persistence service
+            executor (Executor, optional): executor of the blocking calls. Defaults to None - default of the loop.
+            is_blocking (bool, optional): False - the service is called in the event loop. Defaults to True.
+        """
+        self.persistance = persistance
+        self.executor = executor
+        self.is_blocking = is_blocking
+        self.is_shared = getattr(persistance, 'is_shared', True)
+
+    async def save_game_info(self, game_id: str, game_info: SavedGameInfo) -> None:
+        """
+        Save game info.
+
+        Args:
+            game_id (str): unique id of the game session
+            game_info (SavedGameInfo): object that contains current state of the game and players
+        """
+        await self.__call(self.persistance.save_game_info, game_id, game_info)
+
+    async def get_game_info(self, game_id: str) -> SavedGameInfo:
+        """
+        Retrieve game info.
+
+        Args:
+            game_id (str): unique id of the game session
+
+        Raises:
+            GameNotFoundException: raised if the passed id doesn't exist
+
+        Returns:
+            SavedGameInfo: information about saved game session
+        """
+        return await self.__call(self.persistance.get_game_info, game_id)
+
+    async def get_game_version(self, game_id: str) -> int:
+        """
+        Retrieve version of the game session, by get_game_version of the service if it has one.
+
+        Args:
+            game_id (str): unique id of the game session
+
+        Raises:
+            GameNotFoundException: raised if the passed id doesn't exist
+
+        Returns:
+            int: version of the game session
+        """
+        get_game_version = getattr(self.persistance, 'get_game_version', None)
+        if get_game_version is not None:
+            return await self.__call(get_game_version, game_id)
+        return (await self.__call(self.persistance.get_game_info, game_id)).version
+
+    async def remove_game_info(self, game_id: str) -> None:
+        """
+        Remove game info.
+
+        Args:
+            game_id (str): unique id of the game session
+        """
+        await self.__call(self.persistance.remove_game_info, game_id)
+
+    def check_game_size(self, game_info: SavedGameInfo) -> None:
+        """
+        Check that the game fits the wrapped persistence, if its size of the game is limited.
+
+        Args:
+            game_info (SavedGameInfo): object that contains current state of the game and players
+        """
+        check = getattr(self.persistance, 'check_game_size', None)
+        if check is not None:
+            check(game_info)
+
+    async def __call(self, function: Any, *args: Any) -> Any:
+        if not self.is_blocking:
+            return function(*args)
+        return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+
+
+def to_async_persistence(persistance: Any, executor: Executor = None) -> Any:
+    """
+    Return the async persistence service, synchronous services are wrapped by AsyncPersistenceAdapter.
+
+    Args:
+        persistance (Any): synchronous or async persistence service
+        executor (Executor, optional): executor of the blocking calls. Defaults to None - default of the loop.
+
+    Returns:
+        Any: async persistence service
+    """
+    if inspect.iscoroutinefunction(persistance.get_game_info):
+        return persistance
+    return AsyncPersistenceAdapter(persistance, executor, not isinstance(persistance, IN_MEMORY_PERSISTENCES))
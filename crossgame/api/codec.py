@@ -0,0 +1,448 @@
+"""
+Module contains compact versioned binary codec for SavedGameInfo and GameStateDto.
+
+Every message starts with the header (codec version, kind of the object).
+The board is packed with 2 bits per cell (0 - empty, 1 - X, 2 - O), four cells in a byte,
+and can be read without copying through BoardView. Strings are UTF-8 with 2-byte length.
+Moves of the dense game are stored as flat cell indexes (the player is taken from the board),
+moves of the unbounded game as player index and coordinates.
+
+Run `python -m crossgame.api.codec` to compare the codec with pickle and JSON.
+
+    Raises:
+        ValueError: raised if the data is created by other codec version or the game type is not supported
+"""
+import json
+import pickle
+import struct
+import timeit
+
+from crossgame.api.persistance import SavedGameInfo
+from crossgame.api.player import Player, PlayerType
+from crossgame.logic.bit_state import BitboardGameState
+from crossgame.logic.game import (GameStateDto, Move, TicTacToeGame, TicTacToeGameInfinite,
+                                  TicTacToeGameKInARow, WinnerInfo)
+from crossgame.logic.game_enums import Sign
+from crossgame.logic.k_in_a_row_state import KInARowGameState
+from crossgame.logic.sparse_state import SparseGameState
+from crossgame.logic.state import GameState
+
+CODEC_VERSION: int = 1
+
+KIND_SAVED_GAME_INFO: int = 1
+KIND_GAME_STATE: int = 2
+
+GAME_TYPE_CLASSIC: int = 0
+GAME_TYPE_BITBOARD: int = 1
+GAME_TYPE_K_IN_A_ROW: int = 2
+GAME_TYPE_INFINITE: int = 3
+
+FLAG_STARTED: int = 1
+FLAG_GAME: int = 2
+FLAG_ACTIVE_PLAYER: int = 4
+FLAG_FIELD: int = 8
+FLAG_WINNER: int = 16
+FLAG_DRAW: int = 32
+FLAG_WINNER_PLAYER: int = 64
+
+HEADER: struct.Struct = struct.Struct('<BB')
+LENGTH: struct.Struct = struct.Struct('<H')
+FLAGS: struct.Struct = struct.Struct('<B')
+COUNT: struct.Struct = struct.Struct('<I')
+PLAYER_HEADER: struct.Struct = struct.Struct('<BBBHH')
+GAME_HEADER: struct.Struct = struct.Struct('<BHHB')
+BOARD_SIZE: struct.Struct = struct.Struct('<HH')
+TIMESTAMP: struct.Struct = struct.Struct('<d')
+
+SIGNS: tuple[Sign | None, ...] = (None, Sign.X, Sign.O, None)
+UNPACK_TABLE: tuple[tuple[Sign | None, ...], ...] = tuple(
+    tuple(SIGNS[byte >> shift & 3] for shift in (0, 2, 4, 6)) for byte in range(256))
+
+
+class BoardView:
+    """Read-only view of the packed board, cells are read from the buffer without copying."""
+
+    def __init__(self, data: memoryview, rows: int, columns: int) -> None:
+        """
+        Initialize view.
+
+        Args:
+            data (memoryview): packed board, 2 bits per cell
+            rows (int): number of rows
+            columns (int): number of columns
+        """
+        self.data = data
+        self.rows = rows
+        self.columns = columns
+
+    def get(self, row: int, column: int) -> Sign | None:
+        """Return the sign in the cell or None if the cell is empty."""
+        index = row * self.columns + column
+        return SIGNS[self.data[index >> 2] >> ((index & 3) << 1) & 3]
+
+    def to_field(self) -> list[list[Sign]]:
+        """Unpack the board to the field (matrix)."""
+        cells: list[Sign | None] = []
+        for byte in self.data:
+            cells.extend(UNPACK_TABLE[byte])
+        return [cells[row * self.columns:(row + 1) * self.columns] for row in range(self.rows)]
+
+
+def get_board_size(rows: int, columns: int) -> int:
+    """Return number of bytes of the packed board."""
+    return (rows * columns + 3) // 4
+
+
+def pack_board(field: list[list[Sign]]) -> bytes:
+    """Pack the field, 2 bits per cell (0 - empty, 1 - X, 2 - O)."""
+    cells = [sign.value if sign is not None else 0 for row in field for sign in row]
+    cells.extend([0] * (-len(cells) % 4))
+    return bytes(cells[index] | cells[index + 1] << 2 | cells[index + 2] << 4 | cells[index + 3] << 6
+                 for index in range(0, len(cells), 4))
+
+
+def unpack_board(data: bytes | memoryview, rows: int, columns: int) -> list[list[Sign]]:
+    """Unpack the field packed by pack_board."""
+    return BoardView(memoryview(data)[:get_board_size(rows, columns)], rows, columns).to_field()
+
+
+def get_game_type(game: TicTacToeGame) -> tuple[int, int | None]:
+    """
+    Return type of the game and its win length.
+
+    Raises:
+        ValueError: raised if the game can't be stored
+    """
+    state = game.game_state
+    if isinstance(state, SparseGameState):
+        return GAME_TYPE_INFINITE, state.win_length
+    if isinstance(state, KInARowGameState):
+        return GAME_TYPE_K_IN_A_ROW, state.win_length
+    if isinstance(state, BitboardGameState):
+        return GAME_TYPE_BITBOARD, None
+    if isinstance(state, GameState):
+        return GAME_TYPE_CLASSIC, None
+    raise ValueError(f'Game state {type(state).__name__} is not supported')
+
+
+def encode_players(players: list[Player]) -> bytes:
+    """Pack players: header (sign, is_active, type, name length, id length), name and id in UTF-8."""
+    parts = []
+    for player in players:
+        name = player.player_name.encode('utf-8')
+        player_id = player.player_id.encode('utf-8')
+        parts.append(PLAYER_HEADER.pack(player.sign.value, player.is_active, player.player_type.value,
+                                        len(name), len(player_id)))
+        parts.append(name)
+        parts.append(player_id)
+    return b''.join(parts)
+
+
+def decode_players(data: bytes | memoryview, offset: int = 0, count: int = None) -> list[Player]:
+    """Unpack count players (all the rest if count is None) packed by encode_players."""
+    players, _ = read_players(memoryview(data), offset, count)
+    return players
+
+
+def read_players(data: memoryview, offset: int, count: int = None) -> tuple[list[Player], int]:
+    """Unpack players and return them with the offset after the last one."""
+    players = []
+    while (offset < len(data)) if count is None else (len(players) < count):
+        sign, is_active, player_type, name_length, id_length = PLAYER_HEADER.unpack_from(data, offset)
+        offset += PLAYER_HEADER.size
+        name = str(data[offset:offset + name_length], 'utf-8')
+        offset += name_length
+        player_id = str(data[offset:offset + id_length], 'utf-8')
+        offset += id_length
+        players.append(Player(name, player_id, Sign(sign), bool(is_active), PlayerType(player_type)))
+    return players, offset
+
+
+def encode_game_info(game_info: SavedGameInfo) -> bytes:
+    """
+    Pack the game session.
+
+    Args:
+        game_info (SavedGameInfo): game session
+
+    Raises:
+        ValueError: raised if the game type is not supported
+
+    Returns:
+        bytes: packed game session
+    """
+    game = game_info.game
+    flags = (FLAG_STARTED if game_info.is_started else 0) | (FLAG_GAME if game is not None else 0)
+    parts = [HEADER.pack(CODEC_VERSION, KIND_SAVED_GAME_INFO), FLAGS.pack(flags), TIMESTAMP.pack(game_info.created_at),
+             COUNT.pack(game_info.version), pack_string(game_info.game_id), FLAGS.pack(len(game_info.players)),
+             encode_players(game_info.players)]
+    if game is not None:
+        parts.append(encode_game(game))
+    return b''.join(parts)
+
+
+def get_max_encoded_size(game_info: SavedGameInfo) -> int | None:
+    """
+    Return the size of the packed game session when all the cells of the field are taken.
+
+    Args:
+        game_info (SavedGameInfo): object that contains current state of the game and players
+
+    Returns:
+        int | None: max number of bytes, None if the field is unbounded
+    """
+    size = len(encode_game_info(game_info))
+    game = game_info.game
+    if game is None:
+        return size
+    if get_game_type(game)[0] == GAME_TYPE_INFINITE:
+        return None
+    # each move adds the index of its cell, the board itself has fixed size
+    return size + COUNT.size * (game.rows * game.columns - len(game.moves))
+
+
+def decode_game_info(data: bytes | memoryview) -> SavedGameInfo:
+    """
+    Unpack the game session packed by encode_game_info.
+
+    Args:
+        data (bytes | memoryview): packed game session
+
+    Raises:
+        ValueError: raised if the data is not a game session of the current codec version
+
+    Returns:
+        SavedGameInfo: game session
+    """
+    view = memoryview(data)
+    offset = read_header(view, KIND_SAVED_GAME_INFO)
+    (flags,) = FLAGS.unpack_from(view, offset)
+    offset += FLAGS.size
+    (created_at,) = TIMESTAMP.unpack_from(view, offset)
+    offset += TIMESTAMP.size
+    (session_version,) = COUNT.unpack_from(view, offset)
+    offset += COUNT.size
+    game_id, offset = read_string(view, offset)
+    (count,) = FLAGS.unpack_from(view, offset)
+    players, offset = read_players(view, offset + FLAGS.size, count)
+    game = None
+    if flags & FLAG_GAME:
+        game = decode_game(view, offset, game_id, players)
+    return SavedGameInfo(game_id, players, game, bool(flags & FLAG_STARTED), created_at, session_version)
+
+
+def decode_session_version(data: bytes | memoryview) -> int:
+    """
+    Read the version of the game session packed by encode_game_info, players and the game are not unpacked.
+
+    Args:
+        data (bytes | memoryview): packed game session, at least its fixed-size beginning
+
+    Raises:
+        ValueError: raised if the data is not a game session of the current codec version
+
+    Returns:
+        int: version of the game session
+    """
+    view = memoryview(data)
+    offset = read_header(view, KIND_SAVED_GAME_INFO)
+    (session_version,) = COUNT.unpack_from(view, offset + FLAGS.size + TIMESTAMP.size)
+    return session_version
+
+
+def encode_game(game: TicTacToeGame) -> bytes:
+    """Pack type, size, board and moves of the game."""
+    game_type, win_length = get_game_type(game)
+    parts = [GAME_HEADER.pack(game_type, game.rows, game.columns, win_length or 0), COUNT.pack(len(game.moves))]
+    if game_type == GAME_TYPE_INFINITE:
+        parts.append(bytes(move.player_index for move in game.moves))
+        parts.append(struct.pack(f'<{2 * len(game.moves)}i',
+                                 *(value for move in game.moves for value in (move.row, move.column))))
+    else:
+        parts.append(pack_board(game.get_field()))
+        parts.append(struct.pack(f'<{len(game.moves)}I', *(move.row * game.columns + move.column
+                                                            for move in game.moves)))
+    return b''.join(parts)
+
+
+def decode_game(view: memoryview, offset: int, game_id: str, players: list[Player]) -> TicTacToeGame:
+    """Create the game packed by encode_game and put the signs and moves."""
+    game_type, rows, columns, win_length = GAME_HEADER.unpack_from(view, offset)
+    (count,) = COUNT.unpack_from(view, offset + GAME_HEADER.size)
+    offset += GAME_HEADER.size + COUNT.size
+    if game_type == GAME_TYPE_INFINITE:
+        game: TicTacToeGame = TicTacToeGameInfinite(game_id, players, win_length)
+        coordinates = struct.unpack_from(f'<{2 * count}i', view, offset + count)
+        for index in range(count):
+            move = Move(view[offset + index], coordinates[2 * index], coordinates[2 * index + 1])
+            game.game_state.make_move(move.row, move.column, players[move.player_index].sign)
+            game.moves.append(move)
+    else:
+        if game_type == GAME_TYPE_K_IN_A_ROW:
+            game = TicTacToeGameKInARow(game_id, players, rows, columns, win_length)
+        elif game_type == GAME_TYPE_BITBOARD:
+            game = TicTacToeGame(game_id, players, rows, columns, BitboardGameState)
+        elif game_type == GAME_TYPE_CLASSIC:
+            game = TicTacToeGame(game_id, players, rows, columns)
+        else:
+            raise ValueError(f'Game type {game_type} is not supported')
+        board = BoardView(view[offset:offset + get_board_size(rows, columns)], rows, columns)
+        game.game_state.field = board.to_field()
+        player_indexes = {player.sign: index for index, player in enumerate(players)}
+        for index in struct.unpack_from(f'<{count}I', view, offset + get_board_size(rows, columns)):
+            row, column = divmod(index, columns)
+            game.moves.append(Move(player_indexes[board.get(row, column)], row, column))
+    if count:
+        game.get_game_state()
+    return game
+
+
+def encode_game_state(game_state: GameStateDto) -> bytes:
+    """
+    Pack the game state returned to the clients.
+
+    Args:
+        game_state (GameStateDto): game state
+
+    Returns:
+        bytes: packed game state
+    """
+    winner = game_state.winner
+    flags = ((FLAG_STARTED if game_state.is_started else 0)
+             | (FLAG_ACTIVE_PLAYER if game_state.active_player is not None else 0)
+             | (FLAG_FIELD if game_state.field is not None else 0)
+             | (FLAG_WINNER if winner is not None else 0)
+             | (FLAG_DRAW if winner is not None and winner.is_draw else 0)
+             | (FLAG_WINNER_PLAYER if winner is not None and winner.player is not None else 0))
+    parts = [HEADER.pack(CODEC_VERSION, KIND_GAME_STATE), FLAGS.pack(flags), pack_string(game_state.game_id),
+             FLAGS.pack(len(game_state.player_names))]
+    parts.extend(pack_string(name) for name in game_state.player_names)
+    if game_state.active_player is not None:
+        parts.append(encode_players([game_state.active_player]))
+    if game_state.field is not None:
+        field = game_state.field
+        parts.append(BOARD_SIZE.pack(len(field), len(field[0]) if field else 0))
+        parts.append(pack_board(field))
+    if winner is not None:
+        parts.append(FLAGS.pack(winner.sign.value if winner.sign is not None else 0))
+        if winner.player is not None:
+            parts.append(encode_players([winner.player]))
+    return b''.join(parts)
+
+
+def decode_game_state(data: bytes | memoryview) -> GameStateDto:
+    """
+    Unpack the game state packed by encode_game_state.
+
+    Args:
+        data (bytes | memoryview): packed game state
+
+    Raises:
+        ValueError: raised if the data is not a game state of the current codec version
+
+    Returns:
+        GameStateDto: game state
+    """
+    view = memoryview(data)
+    offset = read_header(view, KIND_GAME_STATE)
+    (flags,) = FLAGS.unpack_from(view, offset)
+    game_id, offset = read_string(view, offset + FLAGS.size)
+    (count,) = FLAGS.unpack_from(view, offset)
+    offset += FLAGS.size
+    player_names = []
+    for _ in range(count):
+        name, offset = read_string(view, offset)
+        player_names.append(name)
+    game_state = GameStateDto(game_id, player_names, is_started=bool(flags & FLAG_STARTED))
+    if flags & FLAG_ACTIVE_PLAYER:
+        (game_state.active_player,), offset = read_players(view, offset, 1)
+    if flags & FLAG_FIELD:
+        rows, columns = BOARD_SIZE.unpack_from(view, offset)
+        offset += BOARD_SIZE.size
+        game_state.field = unpack_board(view[offset:], rows, columns)
+        offset += get_board_size(rows, columns)
+    if flags & FLAG_WINNER:
+        sign = SIGNS[view[offset]]
+        offset += FLAGS.size
+        player = None
+        if flags & FLAG_WINNER_PLAYER:
+            (player,), offset = read_players(view, offset, 1)
+        game_state.winner = WinnerInfo(player, sign, bool(flags & FLAG_DRAW))  # type: ignore
+    return game_state
+
+
+def pack_string(value: str) -> bytes:
+    """Pack the string: 2-byte length and UTF-8 bytes."""
+    data = value.encode('utf-8')
+    return LENGTH.pack(len(data)) + data
+
+
+def read_string(view: memoryview, offset: int) -> tuple[str, int]:
+    """Unpack the string packed by pack_string and return it with the offset after it."""
+    (length,) = LENGTH.unpack_from(view, offset)
+    offset += LENGTH.size
+    return str(view[offset:offset + length], 'utf-8'), offset + length
+
+
+def read_header(view: memoryview, kind: int) -> int:
+    """
+    Check the header and return the offset after the header.
+
+    Raises:
+        ValueError: raised if the version is different or the kind of the object is different
+    """
+    version, data_kind = HEADER.unpack_from(view, 0)
+    if version != CODEC_VERSION or data_kind != kind:
+        raise ValueError(f'Unsupported data: version {version}, kind {data_kind}')
+    return HEADER.size
+
+
+def benchmark(rows: int = 15, columns: int = 15, moves: int = 40, number: int = 2000) -> dict[str, tuple]:
+    """
+    Compare size and speed of the codec with pickle and JSON on the k-in-a-row game.
+
+    Args:
+        rows (int, optional): number of rows. Defaults to 15.
+        columns (int, optional): number of columns. Defaults to 15.
+        moves (int, optional): number of moves made in the game. Defaults to 40.
+        number (int, optional): number of repetitions. Defaults to 2000.
+
+    Returns:
+        dict: format name -> (size in bytes, microseconds to encode, microseconds to decode)
+    """
+    players = [Player('player-1', 'id-1', Sign.X, True), Player('player-2', 'id-2', Sign.O)]
+    game = TicTacToeGameKInARow('game-1', players, rows, columns, max(rows, columns))
+    for index in range(moves):
+        game.make_move(players[index % 2].player_id, index // columns, (index * 7) % columns)
+    game_info = SavedGameInfo('game-1', players, game, True)
+
+    def to_json(info: SavedGameInfo) -> bytes:
+        return json.dumps({'game_id': info.game_id, 'is_started': info.is_started,
+                           'players': [{**vars(player), 'sign': player.sign.value,
+                                        'player_type': player.player_type.value} for player in info.players],
+                           'rows': rows, 'columns': columns, 'moves': [move._asdict() for move in game.moves],
+                           'field': [[sign.value if sign else 0 for sign in row] for row in game.get_field()]}
+                          ).encode('utf-8')
+
+    formats = {
+        'codec': (encode_game_info, decode_game_info),
+        'pickle': (pickle.dumps, pickle.loads),  # nosec B301 - the data is created here
+        'json': (to_json, json.loads),
+    }
+    results = {}
+    for name, (encode, decode) in formats.items():
+        data = encode(game_info)
+        encode_time = timeit.timeit(lambda: encode(game_info), number=number) / number * 1e6
+        decode_time = timeit.timeit(lambda: decode(data), number=number) / number * 1e6
+        results[name] = (len(data), encode_time, decode_time)
+    return results
+
+
+def main() -> None:
+    """Print the benchmark results."""
+    for name, (size, encode_time, decode_time) in benchmark().items():
+        print(f'{name:8} {size:6} bytes  encode {encode_time:8.1f} us  decode {decode_time:8.1f} us')
+
+
+if __name__ == '__main__':
+    main()
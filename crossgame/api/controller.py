@@ -1,29 +1,53 @@
 """Module contains main API interface of the Game."""
 import logging as log
-from enum import Enum
+import time
+from collections import OrderedDict
+from typing import Any
 from uuid import uuid4
 
+from crossgame.ai.ai_provider import get_good_ai
+from crossgame.ai.base_ai import BaseAI
+from crossgame.ai.easy_ai import EasyAI
+from crossgame.ai.good_ai import GoodAI
 from crossgame.api.api_dto import GameStateDto
+from crossgame.api.game_locks import GameLockRegistry
+from crossgame.api.game_updates import GameUpdateNotifier, MoveDelta, MoveListener
 from crossgame.api.persistance import GameStateInMemoryPersistence, SavedGameInfo
-from crossgame.api.player import Player
-from crossgame.logic.game import TicTacToeGameClassic
-from crossgame.logic.game_enums import Sign
+from crossgame.api.player import Player, PlayerType
+from crossgame.logic.game import TicTacToeGame, TicTacToeGameKInARow
+from crossgame.logic.game_enums import GameStatus, Sign
 
+# AI players of the abandoned games are evicted from the cache of the Controller
+MAX_AI_PLAYERS: int = 1024
 
-class PlayerType(Enum):
-    """Type of the player that will be used for creating of the game."""
 
-    PLAYER = 1
-    AI_EASY = 2
-    AI_GOOD = 3
+class Controller:
+    """
+    Represent the main API to control the game flow.
 
+    Operations on one game session are serialized by the lock of the game,
+    operations on different games run in parallel. Each change of the session
+    increases its version and wakes up the clients that wait for the update,
+    new moves are passed to the move listeners.
+    """
 
-class Controller:
-    """Represent the main API to control the game flow."""
+    def __init__(self, persistance: GameStateInMemoryPersistence, update_poll_interval: float = 1.0) -> None:
+        """
+        Initialize Controller.
 
-    def __init__(self, persistance: GameStateInMemoryPersistence) -> None:
-        """Initialize Controller."""
+        Args:
+            persistance (GameStateInMemoryPersistence): persistence service
+            update_poll_interval (float, optional): seconds between checks of the version by the waiting clients,
+                                                    catches changes made by other processes. Defaults to 1.0.
+        """
         self.persistance = persistance
+        # persistence shared by several processes provides its own (inter-process) game locks
+        self.game_locks = getattr(persistance, 'game_locks', None) or GameLockRegistry()
+        self.updates = GameUpdateNotifier()
+        self.update_poll_interval = update_poll_interval
+        self.move_listeners: list[MoveListener] = []
+        self.hint_ai = GoodAI(max_depth=4)
+        self.ai_players: OrderedDict[str, BaseAI] = OrderedDict()
 
     def start_game_session(self, player_name: str) -> GameStateDto:
         """
@@ -48,46 +72,70 @@ class Controller:
                   game_id, player)
         return game_state
 
-    def join_to_game_game_session(self, player_name: str, game_id: str) -> GameStateDto:
+    def join_to_game_game_session(self, player_name: str, game_id: str,
+                                  player_type: PlayerType = PlayerType.PLAYER) -> GameStateDto:
         """
         Join a player to the game session by it ID, create second player with sign O.
 
+        AI players (AI_EASY, AI_GOOD) make their moves right after the moves of the other player.
+
         Args:
             player_name (str): second player name that joins
             game_id (str): unique id of the game session
+            player_type (PlayerType, optional): type of the second player. Defaults to PlayerType.PLAYER.
 
         Returns:
             GameStateDto: current game status
         """
-        saved_game_info: SavedGameInfo = self.persistance.get_game_info(game_id)
-        player_id: str = str(uuid4())
-        player: Player = Player(player_name, player_id, Sign.O, False)
+        with self.game_locks.get(game_id):
+            saved_game_info: SavedGameInfo = self.persistance.get_game_info(game_id)
+            player_id: str = str(uuid4())
+            player: Player = Player(player_name, player_id, Sign.O, False, player_type)
 
-        game_info = self.persistance.get_game_info(game_id)
-        game_info.players.append(player)
+            game_info = self.persistance.get_game_info(game_id)
+            game_info.players.append(player)
+            game_info.version += 1
 
-        self.persistance.save_game_info(saved_game_info.game_id, game_info)
+            self.persistance.save_game_info(saved_game_info.game_id, game_info)
+        self.updates.notify(game_id)
         game_state = GameStateDto(
             game_id=game_id, player_names=[player.player_name for player in game_info.players], active_player=player)
         log.debug('Joined to game session, game_id %s, player_id %s',
                   game_id, player)
         return game_state
 
-    def start_game(self, game_id: str) -> GameStateDto:
+    def start_game(self, game_id: str, row: int = 3, column: int = 3, win_length: int = None) -> GameStateDto:
         """
         Initialize game, creates game field, prepare everything to make a first move.
 
         Args:
             game_id (str): unique id of the game session
+            row (int, optional): number of rows. Defaults to 3.
+            column (int, optional): number of columns. Defaults to 3.
+            win_length (int, optional): number of signs in a row to win.
+                                        Defaults to None - whole row, column or diagonal should be filled.
+
+        Raises:
+            IncorrectFieldSizeException: raised if the field is incorrect or the finished game doesn't fit the storage
 
         Returns:
             GameStateDto: current game status
         """
-        game_info = self.persistance.get_game_info(game_id)
-        game_info.game = TicTacToeGameClassic(game_id, game_info.players)
-        game_info.is_started = True
-        self.persistance.save_game_info(game_id, game_info)
-        game_state = game_info.game.get_game_state()
+        with self.game_locks.get(game_id):
+            game_info = self.persistance.get_game_info(game_id)
+            if win_length is None:
+                game_info.game = TicTacToeGame(game_id, game_info.players, row, column)
+            else:
+                game_info.game = TicTacToeGameKInARow(game_id, game_info.players, row, column, win_length)
+            game_info.is_started = True
+            check_game_size(self.persistance, game_info)
+            self.__make_ai_moves(game_info)
+            game_info.version += 1
+            self.persistance.save_game_info(game_id, game_info)
+            game_state = game_info.game.get_game_state()
+            deltas = get_move_deltas(game_info, 0)
+        self.updates.notify(game_id)
+        self.__notify_move_listeners(game_id, deltas)
         log.debug('start_game, game_id %s', game_id)
         return game_state
 
@@ -104,10 +152,17 @@ class Controller:
         Returns:
             GameStateDto: current game status
         """
-        current_game: SavedGameInfo = self.persistance.get_game_info(game_id)
-        current_game.game.make_move(player_id, row, column)
-        self.persistance.save_game_info(game_id, current_game)
-        game_state = current_game.game.get_game_state()
+        with self.game_locks.get(game_id):
+            current_game: SavedGameInfo = self.persistance.get_game_info(game_id)
+            move_count = len(current_game.game.moves)
+            current_game.game.make_move(player_id, row, column)
+            self.__make_ai_moves(current_game)
+            current_game.version += 1
+            self.persistance.save_game_info(game_id, current_game)
+            game_state = current_game.game.get_game_state()
+            deltas = get_move_deltas(current_game, move_count)
+        self.updates.notify(game_id)
+        self.__notify_move_listeners(game_id, deltas)
         log.debug('make_move, game_id %s', game_id)
         return game_state
 
@@ -121,10 +176,185 @@ class Controller:
         Returns:
             GameStateDto: current game status
         """
-        current_game = self.persistance.get_game_info(game_id)
-        if current_game.is_started:
-            game_state = current_game.game.get_game_state()
-            log.debug('get_status, game_id %s', game_id)
-            return game_state
-        else:
-            return None
+        with self.game_locks.get(game_id):
+            current_game = self.persistance.get_game_info(game_id)
+            if current_game.is_started:
+                game_state = current_game.game.get_game_state()
+                log.debug('get_status, game_id %s', game_id)
+                return game_state
+            else:
+                return None
+
+    def get_game_info(self, game_id: str) -> SavedGameInfo:
+        """
+        Get the saved game session (players, game, version) by one read of the persistence.
+
+        Args:
+            game_id (str): unique id of the game session
+
+        Raises:
+            GameNotFoundException: raised if the game is not found
+
+        Returns:
+            SavedGameInfo: game session, it can be the object kept by the in-memory persistence and must not be changed
+        """
+        with self.game_locks.get(game_id):
+            return self.persistance.get_game_info(game_id)
+
+    def add_move_listener(self, listener: MoveListener) -> None:
+        """
+        Register the function called with the id of the game and the new moves after each start and move.
+
+        Listeners are called by the thread that made the move, after the lock of the game is released.
+
+        Args:
+            listener (MoveListener): function (game_id, moves) -> None
+        """
+        self.move_listeners.append(listener)
+
+    def remove_move_listener(self, listener: MoveListener) -> None:
+        """
+        Unregister the move listener.
+
+        Args:
+            listener (MoveListener): registered function
+        """
+        self.move_listeners.remove(listener)
+
+    def get_version(self, game_id: str) -> int:
+        """
+        Get the version of the game session, it is increased by each join, start and move.
+
+        Args:
+            game_id (str): unique id of the game session
+
+        Returns:
+            int: version of the game session
+        """
+        # persistence that can read the version without unpacking the game provides get_game_version
+        get_game_version = getattr(self.persistance, 'get_game_version', None)
+        if get_game_version is not None:
+            return get_game_version(game_id)
+        with self.game_locks.get(game_id):
+            return self.persistance.get_game_info(game_id).version
+
+    def wait_for_update(self, game_id: str, version: int, timeout: float) -> int:
+        """
+        Wait until the version of the game session differs from the passed one.
+
+        Changes made by this Controller wake up the waiting clients at once. If the persistence
+        is shared by several processes (is_shared, True if the persistence doesn't tell),
+        changes made by other processes are noticed by the check of the version
+        every update_poll_interval seconds, otherwise the version is checked only after the wake-up.
+
+        Args:
+            game_id (str): unique id of the game session
+            version (int): version known to the client
+            timeout (float): max seconds to wait
+
+        Raises:
+            GameNotFoundException: raised if the game is not found
+
+        Returns:
+            int: current version, equal to the passed one if the time is out
+        """
+        deadline = time.monotonic() + timeout
+        is_shared = getattr(self.persistance, 'is_shared', True)
+        with self.updates.watch(game_id) as watch:
+            while True:
+                current_version = self.get_version(game_id)
+                remaining = deadline - time.monotonic()
+                if current_version != version or remaining <= 0:
+                    return current_version
+                watch.wait(min(remaining, self.update_poll_interval) if is_shared else remaining)
+
+    def get_hint(self, game_id: str) -> tuple[int, int]:
+        """
+        Suggest the best move for the active player.
+
+        Args:
+            game_id (str): unique id of the game session
+
+        Raises:
+            NoAvailableMovesException: raised if the game is finished
+
+        Returns:
+            tuple[int, int]: row and column of the suggested cell, None if the game is not started
+        """
+        with self.game_locks.get(game_id):
+            current_game = self.persistance.get_game_info(game_id)
+            if not current_game.is_started:
+                return None
+            active_player = next(player for player in current_game.players if player.is_active)
+            return self.hint_ai.choose_move(current_game.game.game_state, active_player.sign)
+
+    def __notify_move_listeners(self, game_id: str, deltas: list[MoveDelta]) -> None:
+        notify_move_listeners(self.move_listeners, game_id, deltas)
+
+    def __make_ai_moves(self, game_info: SavedGameInfo) -> None:
+        """Make moves of the AI players while one of them is active and the game is in progress."""
+        game = game_info.game
+        while (active_player := get_active_ai_player(game)) is not None:
+            ai = get_player_ai(self.ai_players, game, active_player)
+            row, column = ai.choose_move(game.game_state, active_player.sign)
+            game.make_move(active_player.player_id, row, column)
+            log.debug('AI move, game_id %s, player_id %s, cell %s:%s',
+                      game.game_id, active_player.player_id, row, column)
+        if game.game_state.game_is_finished().status != GameStatus.IN_PROGRESS:
+            for player in game.players:
+                self.ai_players.pop(player.player_id, None)
+
+
+def get_active_ai_player(game: TicTacToeGame) -> Player | None:
+    """Return the active AI player if the game is in progress, otherwise None."""
+    if game.game_state.game_is_finished().status != GameStatus.IN_PROGRESS:
+        return None
+    active_player = next((player for player in game.players if player.is_active), None)
+    if active_player is None or active_player.player_type == PlayerType.PLAYER:
+        return None
+    return active_player
+
+
+def create_ai(game: TicTacToeGame, player: Player) -> BaseAI:
+    """Create the AI of the player by its type (AI_EASY, AI_GOOD) and the size of the board."""
+    if player.player_type == PlayerType.AI_EASY:
+        # random pick from the index of the empty cells, O(1) on any board
+        return EasyAI()
+    return get_good_ai(game.rows, game.columns)
+
+
+def get_player_ai(ai_players: OrderedDict[str, BaseAI], game: TicTacToeGame, player: Player) -> BaseAI:
+    """Return the cached AI of the player, create it if needed, keep at most MAX_AI_PLAYERS recently used AIs."""
+    ai = ai_players.get(player.player_id)
+    if ai is None:
+        ai = ai_players[player.player_id] = create_ai(game, player)
+        while len(ai_players) > MAX_AI_PLAYERS:
+            ai_players.popitem(last=False)
+    else:
+        ai_players.move_to_end(player.player_id)
+    return ai
+
+
+def check_game_size(persistance: Any, game_info: SavedGameInfo) -> None:
+    """Check that the game fits the persistence with limited size of the game (check_game_size), if any."""
+    check = getattr(persistance, 'check_game_size', None)
+    if check is not None:
+        check(game_info)
+
+
+def get_move_deltas(game_info: SavedGameInfo, start: int) -> list[MoveDelta]:
+    """Return moves of the game starting from the index start with the current version of the session."""
+    players = game_info.game.players
+    return [MoveDelta(move.row, move.column, players[move.player_index].sign, game_info.version)
+            for move in game_info.game.moves[start:]]
+
+
+def notify_move_listeners(listeners: list[MoveListener], game_id: str, deltas: list[MoveDelta]) -> None:
+    """Pass new moves to the listeners, errors of the listeners are logged."""
+    if not deltas:
+        return
+    for listener in list(listeners):
+        try:
+            listener(game_id, deltas)
+        except Exception:  # pylint: disable=broad-except
+            log.exception('Move listener failed, game_id %s', game_id)
@@ -0,0 +1,41 @@
+"""
+Module contains per-game locks used to serialize changes of one game session.
+
+Locks are created on demand and kept in weak dictionaries, so a lock lives only while
+somebody holds it. The registry is striped: looking up locks of different games
+uses different registry locks, so unrelated games don't contend.
+"""
+import threading
+import weakref
+from zlib import crc32
+
+
+class GameLockRegistry:
+    """Registry of re-entrant locks, one lock per game id."""
+
+    def __init__(self, stripes: int = 64) -> None:
+        """
+        Initialize registry.
+
+        Args:
+            stripes (int, optional): number of independent parts of the registry. Defaults to 64.
+        """
+        self.stripes = [(threading.Lock(), weakref.WeakValueDictionary()) for _ in range(stripes)]
+
+    def get(self, game_id: str) -> threading.RLock:
+        """
+        Return the lock of the game, the same object is returned while it is referenced.
+
+        Args:
+            game_id (str): unique id of the game session
+
+        Returns:
+            threading.RLock: lock of the game
+        """
+        registry_lock, locks = self.stripes[crc32(game_id.encode('utf-8')) % len(self.stripes)]
+        with registry_lock:
+            lock = locks.get(game_id)
+            if lock is None:
+                lock = threading.RLock()
+                locks[game_id] = lock
+            return lock
@@ -0,0 +1,196 @@
+"""
+Module contains notifications about the changes of the game sessions.
+
+Clients that wait for the next move (long polling, server-sent events) watch the game
+and sleep on its condition until the Controller notifies about the change. The notifier
+sees only the changes made by the Controller of this process: with a persistence shared
+by several processes the Controller also checks the version of the game periodically
+(get_game_version reads it without unpacking the game). Conditions exist only while somebody watches the game.
+Push channels (WebSocket) receive the moves as MoveDelta from the move listeners of the Controller.
+AsyncGameUpdateNotifier is the same for the coroutines of one event loop (AsyncController).
+"""
+import asyncio
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Callable, Iterator, NamedTuple
+
+from crossgame.logic.game_enums import Sign
+
+
+class MoveDelta(NamedTuple):
+    """Move made in the game and the version of the session after it."""
+
+    row: int
+    column: int
+    sign: Sign
+    version: int
+
+
+MoveListener = Callable[[str, list[MoveDelta]], None]
+
+
+class WatchedGame:
+    """Condition of the watched game and the counter of its notifications."""
+
+    def __init__(self, lock: threading.Lock) -> None:
+        """Initialize game without watchers."""
+        self.condition = threading.Condition(lock)
+        self.watchers = 0
+        self.generation = 0
+
+
+class GameWatch:
+    """Registration of the watcher, notifications after the registration are not lost."""
+
+    def __init__(self, game: WatchedGame) -> None:
+        """Initialize watch from the current generation of the game."""
+        self.game = game
+        self.generation = game.generation
+
+    def wait(self, timeout: float = None) -> bool:
+        """
+        Wait until the game is changed after the registration or the last wait.
+
+        Args:
+            timeout (float, optional): max seconds to wait. Defaults to None - forever.
+
+        Returns:
+            bool: True if the game is changed, False if the time is out
+        """
+        with self.game.condition:
+            is_changed = self.game.condition.wait_for(lambda: self.game.generation != self.generation, timeout)
+            self.generation = self.game.generation
+        return is_changed
+
+
+class GameUpdateNotifier:
+    """Per-game conditions to wait for the changes of the games."""
+
+    def __init__(self) -> None:
+        """Initialize notifier without watched games."""
+        self.lock = threading.Lock()
+        self.games: dict[str, WatchedGame] = {}
+
+    @contextmanager
+    def watch(self, game_id: str) -> Iterator[GameWatch]:
+        """
+        Register the watcher of the game for the duration of the block.
+
+        Args:
+            game_id (str): unique id of the game session
+
+        Yields:
+            GameWatch: watch to wait for the changes
+        """
+        with self.lock:
+            game = self.games.get(game_id)
+            if game is None:
+                game = self.games[game_id] = WatchedGame(self.lock)
+            game.watchers += 1
+            watch = GameWatch(game)
+        try:
+            yield watch
+        finally:
+            with self.lock:
+                game.watchers -= 1
+                if not game.watchers:
+                    del self.games[game_id]
+
+    def notify(self, game_id: str) -> None:
+        """
+        Wake up the watchers of the game.
+
+        Args:
+            game_id (str): unique id of the game session
+        """
+        with self.lock:
+            game = self.games.get(game_id)
+            if game is not None:
+                game.generation += 1
+                game.condition.notify_all()
+
+    def __len__(self) -> int:
+        """Return number of watched games."""
+        return len(self.games)
+
+
+class AsyncWatchedGame:
+    """Event of the watched game, the event is replaced after each notification."""
+
+    def __init__(self) -> None:
+        """Initialize game without watchers."""
+        self.event = asyncio.Event()
+        self.watchers = 0
+
+
+class AsyncGameWatch:
+    """Registration of the coroutine that watches the game, notifications after the registration are not lost."""
+
+    def __init__(self, game: AsyncWatchedGame) -> None:
+        """Initialize watch from the current event of the game."""
+        self.game = game
+        self.event = game.event
+
+    async def wait(self, timeout: float = None) -> bool:
+        """
+        Wait until the game is changed after the registration or the last wait.
+
+        Args:
+            timeout (float, optional): max seconds to wait. Defaults to None - forever.
+
+        Returns:
+            bool: True if the game is changed, False if the time is out
+        """
+        if not self.event.is_set():
+            try:
+                await asyncio.wait_for(self.event.wait(), timeout)
+            except asyncio.TimeoutError:
+                return False
+        self.event = self.game.event
+        return True
+
+
+class AsyncGameUpdateNotifier:
+    """Per-game events to wait for the changes of the games in the coroutines of one event loop."""
+
+    def __init__(self) -> None:
+        """Initialize notifier without watched games."""
+        self.games: dict[str, AsyncWatchedGame] = {}
+
+    @asynccontextmanager
+    async def watch(self, game_id: str) -> AsyncIterator[AsyncGameWatch]:
+        """
+        Register the watcher of the game for the duration of the block.
+
+        Args:
+            game_id (str): unique id of the game session
+
+        Yields:
+            AsyncGameWatch: watch to wait for the changes
+        """
+        game = self.games.get(game_id)
+        if game is None:
+            game = self.games[game_id] = AsyncWatchedGame()
+        game.watchers += 1
+        try:
+            yield AsyncGameWatch(game)
+        finally:
+            game.watchers -= 1
+            if not game.watchers:
+                del self.games[game_id]
+
+    def notify(self, game_id: str) -> None:
+        """
+        Wake up the watchers of the game.
+
+        Args:
+            game_id (str): unique id of the game session
+        """
+        game = self.games.get(game_id)
+        if game is not None:
+            game.event.set()
+            game.event = asyncio.Event()
+
+    def __len__(self) -> int:
+        """Return number of watched games."""
+        return len(self.games)
@@ -0,0 +1,276 @@
+"""
+Module contains event-sourced persistence service (append-only journal with snapshots).
+
+Games are kept in memory. Every move is appended to the journal as a fixed-size
+binary record (game id, player, row, column, sequence number, version of the session),
+other changes of the game session (creation, join, start) are appended as records with
+the whole game packed by the codec.
+The journal is split into segments. Every snapshot_every records all games are written
+to the snapshot, a new segment is started and older segments are deleted,
+so the recovery (load the latest snapshot and replay the journal tail) takes bounded time.
+Records are flushed to the OS after each write and fsync is batched by count and time.
+The journal and the games are guarded by one lock, so the store can be shared by threads.
+
+    Raises:
+        GameNotFoundException: raised if the game_id is not found
+"""
+import glob
+import logging as log
+import os
+import struct
+import threading
+import time
+import uuid
+
+from crossgame.api.codec import decode_game_info, encode_game_info
+from crossgame.api.persistance import SavedGameInfo
+from crossgame.exceptions.game_exceptions import GameNotFoundException
+
+RECORD_MOVE: int = 1
+RECORD_PUT: int = 2
+RECORD_REMOVE: int = 3
+
+MOVE_RECORD: struct.Struct = struct.Struct('<B16sBiiII')
+PUT_HEADER: struct.Struct = struct.Struct('<B16sI')
+REMOVE_RECORD: struct.Struct = struct.Struct('<B16s')
+SNAPSHOT_HEADER: struct.Struct = struct.Struct('<I')
+SNAPSHOT_RECORD: struct.Struct = struct.Struct('<16sII')
+
+SEGMENT_PATTERN: str = 'journal-{:08d}.log'
+SNAPSHOT_PATTERN: str = 'snapshot-{:08d}.bin'
+
+
+def get_game_fingerprint(game_info: SavedGameInfo) -> tuple:
+    """Return values that are changed by any operation except the move."""
+    return (game_info.is_started, tuple(player.player_id for player in game_info.players),
+            id(game_info.game))
+
+
+class GameStateJournalPersistence:
+    """Persistence service that keeps games in memory and writes changes to the append-only journal."""
+
+    is_shared: bool = False
+
+    def __init__(self, directory: str, snapshot_every: int = 10_000, segment_size: int = 4 * 1024 * 1024,
+                 fsync_every: int = 64, fsync_interval: float = 0.05) -> None:
+        """
+        Initialize persistence and recover games from the directory.
+
+        Args:
+            directory (str): directory with journal segments and snapshots
+            snapshot_every (int, optional): number of records between snapshots. Defaults to 10_000.
+            segment_size (int, optional): size of the segment in bytes to start the next one.
+                                          Defaults to 4 MB.
+            fsync_every (int, optional): max number of records written without fsync. Defaults to 64.
+            fsync_interval (float, optional): max seconds between fsync calls. Defaults to 0.05.
+        """
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.segment_size = segment_size
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.game_info_dict: dict[str, SavedGameInfo] = {}
+        self.sequences: dict[str, int] = {}
+        self.fingerprints: dict[str, tuple] = {}
+        self.records_since_snapshot = 0
+        self.unsynced_records = 0
+        self.last_sync = time.monotonic()
+        self.lock = threading.RLock()
+        os.makedirs(directory, exist_ok=True)
+        self.segment_number = self.__recover()
+        self.segment = open(self.__segment_path(self.segment_number), 'ab')
+
+    def save_game_info(self, game_id: str, game_info: SavedGameInfo) -> None:
+        """
+        Save game info, new moves are written as move records, other changes as the whole game.
+
+        Args:
+            game_id (str): unique id of the game session (UUID)
+            game_info (SavedGameInfo): object that contains current state of the game and players
+        """
+        key = uuid.UUID(game_id).bytes
+        game = game_info.game
+        fingerprint = get_game_fingerprint(game_info)
+        with self.lock:
+            sequence = self.sequences.get(game_id)
+            if (game is not None and sequence is not None and self.fingerprints.get(game_id) == fingerprint
+                    and len(game.moves) > sequence):
+                for move in game.moves[sequence:]:
+                    sequence += 1
+                    self.__write(MOVE_RECORD.pack(RECORD_MOVE, key, move.player_index, move.row, move.column,
+                                                  sequence, game_info.version))
+            else:
+                payload = encode_game_info(game_info)
+                self.__write(PUT_HEADER.pack(RECORD_PUT, key, len(payload)) + payload)
+                sequence = len(game.moves) if game is not None else 0
+            self.game_info_dict[game_id] = game_info
+            self.sequences[game_id] = sequence
+            self.fingerprints[game_id] = fingerprint
+            self.__after_write()
+
+    def get_game_info(self, game_id: str) -> SavedGameInfo:
+        """
+        Retrieve game info.
+
+        Args:
+            game_id (str): unique id of the game session
+
+        Raises:
+            GameNotFoundException: raised if the passed id doesn't exist
+
+        Returns:
+            SavedGameInfo: information about saved game session
+        """
+        with self.lock:
+            game_info = self.game_info_dict.get(game_id)
+        if game_info is None:
+            raise GameNotFoundException(f'Game with id {game_id} is not found')
+        return game_info
+
+    def remove_game_info(self, game_id: str) -> None:
+        """
+        Remove game info.
+
+        Args:
+            game_id (str): unique id of the game session
+        """
+        with self.lock:
+            if game_id not in self.game_info_dict:
+                log.warning('Game with %s id is not found, will be skipped', game_id)
+                return
+            self.__write(REMOVE_RECORD.pack(RECORD_REMOVE, uuid.UUID(game_id).bytes))
+            self.__forget(game_id)
+            self.__after_write()
+
+    def sync(self) -> None:
+        """Flush written records to the disk."""
+        with self.lock:
+            self.segment.flush()
+            os.fsync(self.segment.fileno())
+            self.unsynced_records = 0
+            self.last_sync = time.monotonic()
+
+    def snapshot(self) -> None:
+        """Write all games to the snapshot, start the next segment and delete older files."""
+        with self.lock:
+            self.sync()
+            self.segment.close()
+            self.segment_number += 1
+            path = os.path.join(self.directory, SNAPSHOT_PATTERN.format(self.segment_number))
+            with open(path + '.tmp', 'wb') as file:
+                file.write(SNAPSHOT_HEADER.pack(len(self.game_info_dict)))
+                for game_id, game_info in self.game_info_dict.items():
+                    payload = encode_game_info(game_info)
+                    file.write(SNAPSHOT_RECORD.pack(uuid.UUID(game_id).bytes, self.sequences[game_id], len(payload)))
+                    file.write(payload)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(path + '.tmp', path)
+            self.segment = open(self.__segment_path(self.segment_number), 'ab')
+            self.records_since_snapshot = 0
+            for old_path in self.__list_files('journal-*.log') + self.__list_files('snapshot-*.bin'):
+                if self.__get_file_number(old_path) < self.segment_number:
+                    os.remove(old_path)
+
+    def close(self) -> None:
+        """Flush the journal and close the segment."""
+        with self.lock:
+            if not self.segment.closed:
+                self.sync()
+                self.segment.close()
+
+    def __write(self, record: bytes) -> None:
+        self.segment.write(record)
+        self.unsynced_records += 1
+        self.records_since_snapshot += 1
+
+    def __after_write(self) -> None:
+        self.segment.flush()
+        if (self.unsynced_records >= self.fsync_every
+                or time.monotonic() - self.last_sync >= self.fsync_interval):
+            self.sync()
+        if self.records_since_snapshot >= self.snapshot_every:
+            self.snapshot()
+        elif self.segment.tell() >= self.segment_size:
+            self.sync()
+            self.segment.close()
+            self.segment_number += 1
+            self.segment = open(self.__segment_path(self.segment_number), 'ab')
+
+    def __forget(self, game_id: str) -> None:
+        self.game_info_dict.pop(game_id, None)
+        self.sequences.pop(game_id, None)
+        self.fingerprints.pop(game_id, None)
+
+    def __recover(self) -> int:
+        """Load the latest snapshot, replay the journal and return the number of the next segment."""
+        snapshots = self.__list_files('snapshot-*.bin')
+        snapshot_number = 0
+        if snapshots:
+            snapshot_number = self.__get_file_number(snapshots[-1])
+            self.__load_snapshot(snapshots[-1])
+        segments = [path for path in self.__list_files('journal-*.log')
+                    if self.__get_file_number(path) >= snapshot_number]
+        for path in segments:
+            self.__replay(path)
+        for game_id, game_info in self.game_info_dict.items():
+            self.fingerprints[game_id] = get_game_fingerprint(game_info)
+        last_number = self.__get_file_number(segments[-1]) if segments else snapshot_number
+        log.info('Recovered %s games from %s', len(self.game_info_dict), self.directory)
+        return last_number + 1
+
+    def __load_snapshot(self, path: str) -> None:
+        with open(path, 'rb') as file:
+            data = memoryview(file.read())
+        (count,) = SNAPSHOT_HEADER.unpack_from(data, 0)
+        offset = SNAPSHOT_HEADER.size
+        for _ in range(count):
+            key, sequence, length = SNAPSHOT_RECORD.unpack_from(data, offset)
+            offset += SNAPSHOT_RECORD.size
+            game_id = str(uuid.UUID(bytes=key))
+            self.game_info_dict[game_id] = decode_game_info(data[offset:offset + length])
+            self.sequences[game_id] = sequence
+            offset += length
+
+    def __replay(self, path: str) -> None:
+        with open(path, 'rb') as file:
+            data = memoryview(file.read())
+        offset = 0
+        while offset < len(data):
+            record_type = data[offset]
+            if record_type == RECORD_MOVE and offset + MOVE_RECORD.size <= len(data):
+                _, key, player_index, row, column, sequence, version = MOVE_RECORD.unpack_from(data, offset)
+                offset += MOVE_RECORD.size
+                game_id = str(uuid.UUID(bytes=key))
+                game_info = self.game_info_dict.get(game_id)
+                if game_info is not None and sequence > self.sequences[game_id]:
+                    game_info.game.make_move(game_info.players[player_index].player_id, row, column)
+                    game_info.version = version
+                    self.sequences[game_id] = sequence
+            elif record_type == RECORD_PUT and offset + PUT_HEADER.size <= len(data):
+                _, key, length = PUT_HEADER.unpack_from(data, offset)
+                start = offset + PUT_HEADER.size
+                if start + length > len(data):
+                    break
+                game_info = decode_game_info(data[start:start + length])
+                offset = start + length
+                game_id = str(uuid.UUID(bytes=key))
+                self.game_info_dict[game_id] = game_info
+                self.sequences[game_id] = len(game_info.game.moves) if game_info.game is not None else 0
+            elif record_type == RECORD_REMOVE and offset + REMOVE_RECORD.size <= len(data):
+                _, key = REMOVE_RECORD.unpack_from(data, offset)
+                offset += REMOVE_RECORD.size
+                self.__forget(str(uuid.UUID(bytes=key)))
+            else:
+                log.warning('Journal %s has broken record at %s, the rest is skipped', path, offset)
+                break
+
+    def __segment_path(self, number: int) -> str:
+        return os.path.join(self.directory, SEGMENT_PATTERN.format(number))
+
+    def __list_files(self, pattern: str) -> list[str]:
+        return sorted(glob.glob(os.path.join(self.directory, pattern)))
+
+    @staticmethod
+    def __get_file_number(path: str) -> int:
+        return int(os.path.basename(path).split('-')[1].split('.')[0])
@@ -0,0 +1,409 @@
+"""
+Module contains persistence service that keeps games in the networked key-value storage.
+
+Games are packed by the codec and kept by the key-value server (see kv_server),
+so several nodes of the application can serve the same games. Games are saved with
+SET_IF_NEWER and the version of the session, so the change made by a node from the outdated
+game is rejected (GameVersionConflictException) instead of overwriting the change of other node.
+The client keeps a pool of connections and can pipeline requests: several requests are sent
+in one write and the responses are read after that. AsyncKeyValueClient and GameStateAsyncKeyValuePersistence
+are the same for the coroutines (AsyncController).
+
+    Raises:
+        GameNotFoundException: raised if the game_id is not found
+        GameVersionConflictException: raised if the saved game is not newer than the stored one
+"""
+import asyncio
+import logging as log
+import queue
+import socket
+from contextlib import contextmanager
+from typing import Iterator
+
+from crossgame.api.codec import decode_game_info, decode_session_version, encode_game_info
+from crossgame.api.kv_server import (OP_DELETE, OP_GET, OP_PING, OP_SET, OP_SET_IF_NEWER, REQUEST_HEADER,
+                                     RESPONSE_HEADER, STATUS_ERROR, STATUS_OK, VERSION)
+from crossgame.api.persistance import SavedGameInfo
+from crossgame.exceptions.game_exceptions import GameNotFoundException, GameVersionConflictException
+
+
+class KeyValueClient:
+    """Client of the key-value server with the pool of connections."""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 7070, pool_size: int = 8,
+                 timeout: float = 5.0) -> None:
+        """
+        Initialize client, connections are opened on demand.
+
+        Args:
+            host (str, optional): address of the server. Defaults to '127.0.0.1'.
+            port (int, optional): port of the server. Defaults to 7070.
+            pool_size (int, optional): max number of idle connections kept open. Defaults to 8.
+            timeout (float, optional): socket timeout in seconds. Defaults to 5.0.
+        """
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.pool: queue.LifoQueue[socket.socket] = queue.LifoQueue(pool_size)
+
+    def get(self, key: bytes) -> bytes | None:
+        """Return the value or None if the key is not found."""
+        status, value = self.execute([(OP_GET, key, b'')])[0]
+        return value if status == STATUS_OK else None
+
+    def set(self, key: bytes, value: bytes) -> None:
+        """Store the value."""
+        self.execute([(OP_SET, key, value)])
+
+    def set_if_newer(self, key: bytes, version: int, value: bytes) -> bool:
+        """Store the value if the version is greater than the stored one, return False if it is not."""
+        status, _ = self.execute([(OP_SET_IF_NEWER, key, VERSION.pack(version) + value)])[0]
+        return status == STATUS_OK
+
+    def delete(self, key: bytes) -> bool:
+        """Remove the key, return False if the key is not found."""
+        status, _ = self.execute([(OP_DELETE, key, b'')])[0]
+        return status == STATUS_OK
+
+    def ping(self) -> None:
+        """Make the round trip to the server."""
+        self.execute([(OP_PING, b'', b'')])
+
+    @contextmanager
+    def pipeline(self) -> Iterator['Pipeline']:
+        """Collect requests and send them together when the block is finished."""
+        pipeline = Pipeline(self)
+        yield pipeline
+        pipeline.execute()
+
+    def execute(self, requests: list[tuple[int, bytes, bytes]]) -> list[tuple[int, bytes]]:
+        """
+        Send requests in one write and read their responses.
+
+        Args:
+            requests (list[tuple[int, bytes, bytes]]): operation, key and value of each request
+
+        Raises:
+            ConnectionError: raised if the server closed the connection
+            RuntimeError: raised if the server failed to execute the request
+
+        Returns:
+            list[tuple[int, bytes]]: status and value of each response
+        """
+        data = b''.join(REQUEST_HEADER.pack(operation, len(key), len(value)) + key + value
+                        for operation, key, value in requests)
+        connection = self.__acquire()
+        try:
+            connection.sendall(data)
+            responses = []
+            for _ in requests:
+                status, length = RESPONSE_HEADER.unpack(self.__receive(connection, RESPONSE_HEADER.size))
+                responses.append((status, self.__receive(connection, length)))
+        except BaseException:
+            connection.close()
+            raise
+        self.__release(connection)
+        for status, value in responses:
+            if status == STATUS_ERROR:
+                raise RuntimeError(value.decode('utf-8'))
+        return responses
+
+    def close(self) -> None:
+        """Close idle connections."""
+        while not self.pool.empty():
+            self.pool.get_nowait().close()
+
+    def __acquire(self) -> socket.socket:
+        try:
+            return self.pool.get_nowait()
+        except queue.Empty:
+            connection = socket.create_connection((self.host, self.port), self.timeout)
+            connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            return connection
+
+    def __release(self, connection: socket.socket) -> None:
+        try:
+            self.pool.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+    @staticmethod
+    def __receive(connection: socket.socket, size: int) -> bytes:
+        data = bytearray()
+        while len(data) < size:
+            chunk = connection.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError('Key-value server closed the connection')
+            data += chunk
+        return bytes(data)
+
+
+class Pipeline:
+    """Requests collected to be sent to the server together."""
+
+    def __init__(self, client: KeyValueClient) -> None:
+        """Initialize empty pipeline."""
+        self.client = client
+        self.requests: list[tuple[int, bytes, bytes]] = []
+        self.results: list[tuple[int, bytes]] = []
+
+    def get(self, key: bytes) -> None:
+        """Add the request of the value."""
+        self.requests.append((OP_GET, key, b''))
+
+    def set(self, key: bytes, value: bytes) -> None:
+        """Add the request to store the value."""
+        self.requests.append((OP_SET, key, value))
+
+    def delete(self, key: bytes) -> None:
+        """Add the request to remove the key."""
+        self.requests.append((OP_DELETE, key, b''))
+
+    def execute(self) -> list[tuple[int, bytes]]:
+        """Send collected requests and return status and value of each response."""
+        if self.requests:
+            self.results = self.client.execute(self.requests)
+            self.requests = []
+        return self.results
+
+
+class GameStateKeyValuePersistence:
+    """Persistence service that keeps games in the key-value server."""
+
+    def __init__(self, client: KeyValueClient, prefix: str = 'game:') -> None:
+        """
+        Initialize persistence.
+
+        Args:
+            client (KeyValueClient): client of the key-value server
+            prefix (str, optional): prefix of the keys of the games. Defaults to 'game:'.
+        """
+        self.client = client
+        self.prefix = prefix
+
+    def save_game_info(self, game_id: str, game_info: SavedGameInfo) -> None:
+        """
+        Save game info if its version is newer than the version of the stored game.
+
+        Args:
+            game_id (str): unique id of the game session
+            game_info (SavedGameInfo): object that contains current state of the game and players
+
+        Raises:
+            GameVersionConflictException: raised if the game was saved with this or newer version by other node
+        """
+        if not self.client.set_if_newer(self.__get_key(game_id), game_info.version, encode_game_info(game_info)):
+            raise GameVersionConflictException(
+                f'Game with id {game_id} was changed by other node, version {game_info.version} is outdated')
+
+    def get_game_info(self, game_id: str) -> SavedGameInfo:
+        """
+        Retrieve game info.
+
+        Args:
+            game_id (str): unique id of the game session
+
+        Raises:
+            GameNotFoundException: raised if the passed id doesn't exist
+
+        Returns:
+            SavedGameInfo: information about saved game session
+        """
+        data = self.client.get(self.__get_key(game_id))
+        if data is None:
+            raise GameNotFoundException(f'Game with id {game_id} is not found')
+        return decode_game_info(data)
+
+    def get_game_version(self, game_id: str) -> int:
+        """
+        Retrieve version of the game session, the game is not unpacked.
+
+        Args:
+            game_id (str): unique id of the game session
+
+        Raises:
+            GameNotFoundException: raised if the passed id doesn't exist
+
+        Returns:
+            int: version of the game session
+        """
+        data = self.client.get(self.__get_key(game_id))
+        if data is None:
+            raise GameNotFoundException(f'Game with id {game_id} is not found')
+        return decode_session_version(data)
+
+    def remove_game_info(self, game_id: str) -> None:
+        """
+        Remove game info.
+
+        Args:
+            game_id (str): unique id of the game session
+        """
+        if not self.client.delete(self.__get_key(game_id)):
+            log.warning('Game with %s id is not found, will be skipped', game_id)
+
+    def __get_key(self, game_id: str) -> bytes:
+        return (self.prefix + game_id).encode('utf-8')
+
+
+class AsyncKeyValueClient:
+    """Client of the key-value server for the coroutines with the pool of connections."""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 7070, pool_size: int = 8) -> None:
+        """
+        Initialize client, connections are opened on demand.
+
+        Args:
+            host (str, optional): address of the server. Defaults to '127.0.0.1'.
+            port (int, optional): port of the server. Defaults to 7070.
+            pool_size (int, optional): max number of idle connections kept open. Defaults to 8.
+        """
+        self.host = host
+        self.port = port
+        self.pool_size = pool_size
+        self.pool: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+
+    async def get(self, key: bytes) -> bytes | None:
+        """Return the value or None if the key is not found."""
+        status, value = (await self.execute([(OP_GET, key, b'')]))[0]
+        return value if status == STATUS_OK else None
+
+    async def set(self, key: bytes, value: bytes) -> None:
+        """Store the value."""
+        await self.execute([(OP_SET, key, value)])
+
+    async def set_if_newer(self, key: bytes, version: int, value: bytes) -> bool:
+        """Store the value if the version is greater than the stored one, return False if it is not."""
+        status, _ = (await self.execute([(OP_SET_IF_NEWER, key, VERSION.pack(version) + value)]))[0]
+        return status == STATUS_OK
+
+    async def delete(self, key: bytes) -> bool:
+        """Remove the key, return False if the key is not found."""
+        status, _ = (await self.execute([(OP_DELETE, key, b'')]))[0]
+        return status == STATUS_OK
+
+    async def execute(self, requests: list[tuple[int, bytes, bytes]]) -> list[tuple[int, bytes]]:
+        """
+        Send requests in one write and read their responses.
+
+        Args:
+            requests (list[tuple[int, bytes, bytes]]): operation, key and value of each request
+
+        Raises:
+            ConnectionError: raised if the server closed the connection
+            RuntimeError: raised if the server failed to execute the request
+
+        Returns:
+            list[tuple[int, bytes]]: status and value of each response
+        """
+        data = b''.join(REQUEST_HEADER.pack(operation, len(key), len(value)) + key + value
+                        for operation, key, value in requests)
+        reader, writer = self.pool.pop() if self.pool else await asyncio.open_connection(self.host, self.port)
+        try:
+            writer.write(data)
+            await writer.drain()
+            responses = []
+            for _ in requests:
+                status, length = RESPONSE_HEADER.unpack(await reader.readexactly(RESPONSE_HEADER.size))
+                responses.append((status, await reader.readexactly(length)))
+        except asyncio.IncompleteReadError as error:
+            writer.close()
+            raise ConnectionError('Key-value server closed the connection') from error
+        except BaseException:
+            writer.close()
+            raise
+        if len(self.pool) < self.pool_size:
+            self.pool.append((reader, writer))
+        else:
+            writer.close()
+        for status, value in responses:
+            if status == STATUS_ERROR:
+                raise RuntimeError(value.decode('utf-8'))
+        return responses
+
+    async def close(self) -> None:
+        """Close idle connections."""
+        while self.pool:
+            _, writer = self.pool.pop()
+            writer.close()
+            await writer.wait_closed()
+
+
+class GameStateAsyncKeyValuePersistence:
+    """Async persistence service that keeps games in the key-value server."""
+
+    def __init__(self, client: AsyncKeyValueClient, prefix: str = 'game:') -> None:
+        """
+        Initialize persistence.
+
+        Args:
+            client (AsyncKeyValueClient): client of the key-value server
+            prefix (str, optional): prefix of the keys of the games. Defaults to 'game:'.
+        """
+        self.client = client
+        self.prefix = prefix
+
+    async def save_game_info(self, game_id: str, game_info: SavedGameInfo) -> None:
+        """
+        Save game info if its version is newer than the version of the stored game.
+
+        Args:
+            game_id (str): unique id of the game session
+            game_info (SavedGameInfo): object that contains current state of the game and players
+
+        Raises:
+            GameVersionConflictException: raised if the game was saved with this or newer version by other node
+        """
+        if not await self.client.set_if_newer(self.__get_key(game_id), game_info.version,
+                                              encode_game_info(game_info)):
+            raise GameVersionConflictException(
+                f'Game with id {game_id} was changed by other node, version {game_info.version} is outdated')
+
+    async def get_game_info(self, game_id: str) -> SavedGameInfo:
+        """
+        Retrieve game info.
+
+        Args:
+            game_id (str): unique id of the game session
+
+        Raises:
+            GameNotFoundException: raised if the passed id doesn't exist
+
+        Returns:
+            SavedGameInfo: information about saved game session
+        """
+        data = await self.client.get(self.__get_key(game_id))
+        if data is None:
+            raise GameNotFoundException(f'Game with id {game_id} is not found')
+        return decode_game_info(data)
+
+    async def get_game_version(self, game_id: str) -> int:
+        """
+        Retrieve version of the game session, the game is not unpacked.
+
+        Args:
+            game_id (str): unique id of the game session
+
+        Raises:
+            GameNotFoundException: raised if the passed id doesn't exist
+
+        Returns:
+            int: version of the game session
+        """
+        data = await self.client.get(self.__get_key(game_id))
+        if data is None:
+            raise GameNotFoundException(f'Game with id {game_id} is not found')
+        return decode_session_version(data)
+
+    async def remove_game_info(self, game_id: str) -> None:
+        """
+        Remove game info.
+
+        Args:
+            game_id (str): unique id of the game session
+        """
+        if not await self.client.delete(self.__get_key(game_id)):
+            log.warning('Game with %s id is not found, will be skipped', game_id)
+
+    def __get_key(self, game_id: str) -> bytes:
+        return (self.prefix + game_id).encode('utf-8')
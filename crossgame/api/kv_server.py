@@ -0,0 +1,220 @@
+"""
+Module contains tiny asyncio key-value server used as a stand-in of the networked storage.
+
+Protocol (all numbers are little-endian):
+    request:  op (1 byte), key length (2 bytes), value length (4 bytes), key, value
+    response: status (1 byte), value length (4 bytes), value
+Requests can be pipelined: the client sends several requests without waiting,
+responses come back in the same order.
+SET_IF_NEWER stores the value only if its version (4 bytes before the value) is greater
+than the version of the stored value, otherwise the status is CONFLICT and the response
+is the stored version. Nodes that save the same game at the same time can't overwrite
+each other: the second save of the same version is rejected.
+
+Run `python -m crossgame.api.kv_server serve --port 7070` to start the server and
+`python -m crossgame.api.kv_server benchmark --port 7070` to measure the cost of the move
+that is saved through the network.
+"""
+import argparse
+import asyncio
+import logging as log
+import struct
+import threading
+import time
+
+OP_GET: int = 1
+OP_SET: int = 2
+OP_DELETE: int = 3
+OP_PING: int = 4
+OP_SET_IF_NEWER: int = 5
+
+STATUS_OK: int = 0
+STATUS_NOT_FOUND: int = 1
+STATUS_ERROR: int = 2
+STATUS_CONFLICT: int = 3
+
+REQUEST_HEADER: struct.Struct = struct.Struct('<BHI')
+RESPONSE_HEADER: struct.Struct = struct.Struct('<BI')
+VERSION: struct.Struct = struct.Struct('<I')
+
+
+class KeyValueServer:
+    """Key-value server that keeps values in memory and serves clients on the asyncio event loop."""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 7070) -> None:
+        """
+        Initialize server.
+
+        Args:
+            host (str, optional): address to listen. Defaults to '127.0.0.1'.
+            port (int, optional): port to listen, 0 - any free port. Defaults to 7070.
+        """
+        self.host = host
+        self.port = port
+        self.values: dict[bytes, bytes] = {}
+        self.versions: dict[bytes, int] = {}
+        self.server: asyncio.AbstractServer | None = None
+        self.loop: asyncio.AbstractEventLoop | None = None
+
+    async def start(self) -> int:
+        """
+        Start listening.
+
+        Returns:
+            int: port of the server
+        """
+        self.server = await asyncio.start_server(self.__handle_client, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        log.info('Key-value server is listening on %s:%s', self.host, self.port)
+        return self.port
+
+    async def serve_forever(self) -> None:
+        """Start listening and serve clients until the task is cancelled."""
+        await self.start()
+        async with self.server:  # type: ignore
+            await self.server.serve_forever()  # type: ignore
+
+    def run_in_thread(self) -> int:
+        """
+        Start the server on the event loop in the daemon thread.
+
+        Returns:
+            int: port of the server
+        """
+        started = threading.Event()
+        self.loop = asyncio.new_event_loop()
+
+        def run() -> None:
+            asyncio.set_event_loop(self.loop)
+            self.loop.run_until_complete(self.start())  # type: ignore
+            started.set()
+            self.loop.run_forever()  # type: ignore
+
+        threading.Thread(target=run, name='kv-server', daemon=True).start()
+        started.wait()
+        return self.port
+
+    def stop(self) -> None:
+        """Stop the server started by run_in_thread."""
+        if self.loop is None or self.server is None:
+            return
+
+        async def close() -> None:
+            self.server.close()  # type: ignore
+            await self.server.wait_closed()  # type: ignore
+            self.loop.stop()  # type: ignore
+
+        asyncio.run_coroutine_threadsafe(close(), self.loop)
+
+    def execute(self, operation: int, key: bytes, value: bytes) -> tuple[int, bytes]:
+        """
+        Execute the request.
+
+        Args:
+            operation (int): operation code
+            key (bytes): key
+            value (bytes): value (SET), version and value (SET_IF_NEWER)
+
+        Returns:
+            tuple[int, bytes]: status and value of the response
+        """
+        if operation == OP_GET:
+            stored = self.values.get(key)
+            return (STATUS_OK, stored) if stored is not None else (STATUS_NOT_FOUND, b'')
+        if operation == OP_SET:
+            self.values[key] = value
+            self.versions.pop(key, None)
+            return STATUS_OK, b''
+        if operation == OP_SET_IF_NEWER:
+            if len(value) < VERSION.size:
+                return STATUS_ERROR, b'Version of the value is missing'
+            (version,) = VERSION.unpack_from(value, 0)
+            stored_version = self.versions.get(key)
+            if stored_version is not None and version <= stored_version:
+                return STATUS_CONFLICT, VERSION.pack(stored_version)
+            self.values[key] = value[VERSION.size:]
+            self.versions[key] = version
+            return STATUS_OK, b''
+        if operation == OP_DELETE:
+            self.versions.pop(key, None)
+            return (STATUS_OK, b'') if self.values.pop(key, None) is not None else (STATUS_NOT_FOUND, b'')
+        if operation == OP_PING:
+            return STATUS_OK, b''
+        return STATUS_ERROR, f'Unknown operation {operation}'.encode('utf-8')
+
+    async def __handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                operation, key_length, value_length = REQUEST_HEADER.unpack(
+                    await reader.readexactly(REQUEST_HEADER.size))
+                key = await reader.readexactly(key_length)
+                value = await reader.readexactly(value_length)
+                status, response = self.execute(operation, key, value)
+                writer.write(RESPONSE_HEADER.pack(status, len(response)) + response)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+def benchmark(host: str, port: int, moves: int = 1000) -> dict[str, float]:
+    """
+    Measure time of the save and the load of the game through the key-value server.
+
+    Args:
+        host (str): address of the server
+        port (int): port of the server
+        moves (int, optional): number of saved moves. Defaults to 1000.
+
+    Returns:
+        dict: name of the measurement -> microseconds per move
+    """
+    # imported here, the client module depends on the protocol defined in this module
+    from crossgame.api.kv_persistance import GameStateKeyValuePersistence, KeyValueClient
+    from crossgame.api.persistance import SavedGameInfo
+    from crossgame.api.player import Player
+    from crossgame.logic.game import TicTacToeGameKInARow
+    from crossgame.logic.game_enums import Sign
+
+    client = KeyValueClient(host, port)
+    persistance = GameStateKeyValuePersistence(client)
+    players = [Player('player-1', 'id-1', Sign.X, True), Player('player-2', 'id-2', Sign.O)]
+    game_info = SavedGameInfo('benchmark', players, TicTacToeGameKInARow('benchmark', players), True)
+    results = {}
+    start = time.perf_counter()
+    for _ in range(moves):
+        client.ping()
+    results['round trip'] = (time.perf_counter() - start) / moves * 1e6
+    start = time.perf_counter()
+    for _ in range(moves):
+        game_info.version += 1
+        persistance.save_game_info('benchmark', game_info)
+        persistance.get_game_info('benchmark')
+    results['save and load'] = (time.perf_counter() - start) / moves * 1e6
+    start = time.perf_counter()
+    with client.pipeline() as pipeline:
+        for index in range(moves):
+            pipeline.set(f'benchmark-{index}'.encode('utf-8'), b'move')
+    results['pipelined set'] = (time.perf_counter() - start) / moves * 1e6
+    client.close()
+    return results
+
+
+def main() -> None:
+    """Start the server or run the benchmark."""
+    parser = argparse.ArgumentParser(description='Key-value server for the game persistence')
+    parser.add_argument('command', choices=['serve', 'benchmark'])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=7070)
+    args = parser.parse_args()
+    if args.command == 'serve':
+        log.basicConfig(level=log.INFO)
+        asyncio.run(KeyValueServer(args.host, args.port).serve_forever())
+    else:
+        for name, value in benchmark(args.host, args.port).items():
+            print(f'{name:14} {value:8.1f} us')
+
+
+if __name__ == '__main__':
+    main()
@@ -8,17 +8,31 @@ Module contains logic to manage game state.
         _type_: GameStateInMemoryPersistence, SavedGameInfo
 """
 import logging as log
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from enum import Enum
+from itertools import islice
+from typing import Callable
 
 from crossgame.api.player import Player
 from crossgame.exceptions.game_exceptions import GameNotFoundException
 from crossgame.logic.game import TicTacToeGame
 
 
+class SessionStatus(Enum):
+    """Status of the game session used by the indexes of the persistence."""
+
+    WAITING = 1
+    IN_PROGRESS = 2
+    FINISHED = 3
+
+
 class SavedGameInfo:
     """SavedGameInfo is a object that contains information for saving in the scope of the session."""
 
     def __init__(self, game_id: str, players: list[Player], game: TicTacToeGame = None,
-                 is_started: bool = False) -> None:
+                 is_started: bool = False, created_at: float = None, version: int = 0) -> None:
         """
         Initialize SavedGameInfo object.
 
@@ -27,19 +41,96 @@ class SavedGameInfo:
             players (list[Player]): player name list
             game (TicTacToeGame, optional): current game. Defaults to None.
             is_started (bool): true if game was started
+            created_at (float, optional): time of the session creation (seconds since the epoch).
+                                          Defaults to None - now.
+            version (int, optional): counter of the changes of the session, increased by the Controller.
+                                     Defaults to 0.
         """
         self.game: TicTacToeGame = game
         self.players: list[Player] = players
         self.game_id: str = game_id
         self.is_started: bool = is_started
+        self.created_at: float = time.time() if created_at is None else created_at
+        self.version: int = version
+
+    def is_finished(self) -> bool:
+        """Return True if the game has a winner or is finished with a draw."""
+        return self.game is not None and self.game.winner is not None
+
+    def get_status(self) -> SessionStatus:
+        """Return WAITING before the start, FINISHED if the game is finished, IN_PROGRESS otherwise."""
+        if not self.is_started or self.game is None:
+            return SessionStatus.WAITING
+        return SessionStatus.FINISHED if self.is_finished() else SessionStatus.IN_PROGRESS
+
+    def get_player(self, player_id: str) -> Player | None:
+        """Return the player of the session by id, None if the player is not found."""
+        return next((player for player in self.players if player.player_id == player_id), None)
+
+
+@dataclass
+class EvictionStats:
+    """Counters of the games removed by the persistence itself."""
+
+    lru_evictions: int = 0
+    idle_expirations: int = 0
+    finished_expirations: int = 0
 
 
 class GameStateInMemoryPersistence:
-    """STUB persistence service that works in memory."""
+    """
+    Persistence service that works in memory.
+
+    The number of games can be limited (the least recently used game is evicted),
+    games can expire after the idle time and finished games after their own time to live.
+    Expiration is checked on access, and each operation also sweeps a few of
+    the oldest games, so the cost of cleaning is amortized O(1) per operation.
+
+    Secondary indexes (player id to game ids, status to game ids) are updated on save
+    and removal, so lookups by player, lobby listing and listing of recently active
+    games don't scan all games. Removal listeners are called with the id of each removed,
+    evicted or expired game, for example to drop the caches of the game.
+    """
+
+    SWEEP_BATCH: int = 8
+    # games are not seen by other processes, waiting clients are woken up by the Controller only
+    is_shared: bool = False
 
-    def __init__(self) -> None:
-        """Initialize Game State Persistence Stub."""
-        self.game_info_dict: dict[str, SavedGameInfo] = {}
+    def __init__(self, max_games: int = None, idle_ttl: float = None, finished_ttl: float = None,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        Initialize Game State Persistence.
+
+        Args:
+            max_games (int, optional): max number of stored games. Defaults to None - unlimited.
+            idle_ttl (float, optional): seconds after the last access when the game is removed.
+                                        Defaults to None - never.
+            finished_ttl (float, optional): seconds after the finish when the game is removed.
+                                            Defaults to None - never.
+            clock (Callable[[], float], optional): source of the current time. Defaults to time.monotonic.
+        """
+        self.max_games = max_games
+        self.idle_ttl = idle_ttl
+        self.finished_ttl = finished_ttl
+        self.clock = clock
+        self.game_info_dict: OrderedDict[str, SavedGameInfo] = OrderedDict()
+        self.last_access: dict[str, float] = {}
+        self.finished_at: OrderedDict[str, float] = OrderedDict()
+        self.player_games: dict[str, set[str]] = {}
+        # game id -> time when the game is indexed with the status, in the order of the time
+        self.status_games: dict[SessionStatus, dict[str, float]] = {status: {} for status in SessionStatus}
+        self.indexed_keys: dict[str, tuple[SessionStatus, tuple[str, ...]]] = {}
+        self.stats = EvictionStats()
+        self.removal_listeners: list[Callable[[str], None]] = []
+
+    def add_removal_listener(self, listener: Callable[[str], None]) -> None:
+        """
+        Register the function called with the id of the game after it is removed, evicted or expired.
+
+        Args:
+            listener (Callable[[str], None]): function (game_id) -> None
+        """
+        self.removal_listeners.append(listener)
 
     def save_game_info(self, game_id: str, game_info: SavedGameInfo) -> None:
         """
@@ -49,7 +140,19 @@ class GameStateInMemoryPersistence:
             game_id (str): unique id of the game session
             game_info (SavedGameInfo): object that contains current state of the game and players
         """
+        now = self.clock()
         self.game_info_dict[game_id] = game_info
+        self.__touch(game_id, now)
+        self.__index(game_id, game_info, now)
+        if game_info.is_finished() and game_id not in self.finished_at:
+            self.finished_at[game_id] = now
+        self.__sweep(now)
+        if self.max_games is not None:
+            while len(self.game_info_dict) > self.max_games:
+                evicted_id = next(iter(self.game_info_dict))
+                self.__delete(evicted_id)
+                self.stats.lru_evictions += 1
+                log.debug('Game %s is evicted, max number of games is reached', evicted_id)
 
     def get_game_info(self, game_id: str) -> SavedGameInfo:
         """
@@ -59,13 +162,18 @@ class GameStateInMemoryPersistence:
             game_id (str): unique id of the game session
 
         Raises:
-            GameNotFoundException: raised if the passed id doesn't exist
+            GameNotFoundException: raised if the passed id doesn't exist or the game is expired
 
         Returns:
             SavedGameInfo: information about saved game session
         """
+        now = self.clock()
+        self.__sweep(now)
+        if game_id in self.game_info_dict and self.__expire_if_needed(game_id, now):
+            log.debug('Game %s is expired', game_id)
         if game_id not in self.game_info_dict:
             raise GameNotFoundException(f'Game with id {game_id} is not found')
+        self.__touch(game_id, now)
         return self.game_info_dict.get(game_id)  # type: ignore
 
     def remove_game_info(self, game_id: str) -> None:
@@ -79,4 +187,138 @@ class GameStateInMemoryPersistence:
             log.warning(
                 'Game with %s id is not found, will be skipped', game_id)
         else:
-            del self.game_info_dict[game_id]
+            self.__delete(game_id)
+
+    def get_finished_game_ids(self, limit: int = None) -> list[str]:
+        """
+        Return ids of the finished games, the earliest finished first.
+
+        Args:
+            limit (int, optional): max number of ids. Defaults to None - all.
+
+        Returns:
+            list[str]: ids of the finished games
+        """
+        return list(islice(self.finished_at, limit))
+
+    def get_game_ids_by_player(self, player_id: str) -> list[str]:
+        """
+        Return ids of the games of the player.
+
+        Args:
+            player_id (str): player ID that was assigned during creation of player
+
+        Returns:
+            list[str]: ids of the games, empty if the player is not found
+        """
+        return list(self.player_games.get(player_id, ()))
+
+    def get_game_ids_by_status(self, status: SessionStatus, limit: int = None) -> list[str]:
+        """
+        Return ids of the games with the status, the earliest changed to this status first.
+
+        Args:
+            status (SessionStatus): status of the game session
+            limit (int, optional): max number of ids. Defaults to None - all.
+
+        Returns:
+            list[str]: ids of the games
+        """
+        return list(islice(self.status_games[status], limit))
+
+    def get_open_game_ids(self, limit: int = None) -> list[str]:
+        """
+        Return ids of the games that wait for the second player (lobby), the earliest created first.
+
+        Args:
+            limit (int, optional): max number of ids. Defaults to None - all.
+
+        Returns:
+            list[str]: ids of the games
+        """
+        open_ids = (game_id for game_id in self.status_games[SessionStatus.WAITING]
+                    if len(self.indexed_keys[game_id][1]) < 2)
+        return list(islice(open_ids, limit))
+
+    def get_recent_game_ids(self, limit: int = None) -> list[str]:
+        """
+        Return ids of the games, the most recently accessed first.
+
+        Args:
+            limit (int, optional): max number of ids. Defaults to None - all.
+
+        Returns:
+            list[str]: ids of the games
+        """
+        return list(islice(reversed(self.game_info_dict), limit))
+
+    def __touch(self, game_id: str, now: float) -> None:
+        self.game_info_dict.move_to_end(game_id)
+        self.last_access[game_id] = now
+
+    def __index(self, game_id: str, game_info: SavedGameInfo, now: float) -> None:
+        """Update secondary indexes of the game, players and status can be changed since the last save."""
+        keys = (game_info.get_status(), tuple(player.player_id for player in game_info.players))
+        previous_keys = self.indexed_keys.get(game_id)
+        if keys == previous_keys:
+            return
+        if previous_keys is not None:
+            self.__unindex(game_id)
+        status, player_ids = keys
+        self.indexed_keys[game_id] = keys
+        self.status_games[status][game_id] = now
+        for player_id in player_ids:
+            self.player_games.setdefault(player_id, set()).add(game_id)
+
+    def __unindex(self, game_id: str) -> None:
+        status, player_ids = self.indexed_keys.pop(game_id)
+        del self.status_games[status][game_id]
+        for player_id in player_ids:
+            game_ids = self.player_games[player_id]
+            game_ids.discard(game_id)
+            if not game_ids:
+                del self.player_games[player_id]
+
+    def __delete(self, game_id: str) -> None:
+        del self.game_info_dict[game_id]
+        del self.last_access[game_id]
+        self.finished_at.pop(game_id, None)
+        self.__unindex(game_id)
+        for listener in self.removal_listeners:
+            try:
+                listener(game_id)
+            except Exception:  # pylint: disable=broad-except
+                log.exception('Removal listener failed, game_id %s', game_id)
+
+    def __expire_if_needed(self, game_id: str, now: float) -> bool:
+        if self.idle_ttl is not None and now - self.last_access[game_id] >= self.idle_ttl:
+            self.__delete(game_id)
+            self.stats.idle_expirations += 1
+            return True
+        finished_at = self.finished_at.get(game_id)
+        if self.finished_ttl is not None and finished_at is not None and now - finished_at >= self.finished_ttl:
+            self.__delete(game_id)
+            self.stats.finished_expirations += 1
+            return True
+        return False
+
+    def __sweep(self, now: float) -> None:
+        """Check a few of the least recently used and the earliest finished games."""
+        if self.idle_ttl is not None:
+            for _ in range(self.SWEEP_BATCH):
+                if not self.game_info_dict:
+                    break
+                oldest_id = next(iter(self.game_info_dict))
+                if now - self.last_access[oldest_id] < self.idle_ttl:
+                    break
+                self.__delete(oldest_id)
+                self.stats.idle_expirations += 1
+        if self.finished_ttl is not None:
+            for _ in range(self.SWEEP_BATCH):
+                if not self.finished_at:
+                    break
+                oldest_id, finished_at = next(iter(self.finished_at.items()))
+                if now - finished_at < self.finished_ttl:
+                    break
+                self.__delete(oldest_id)
+                self.stats.finished_expirations += 1
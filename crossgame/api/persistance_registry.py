@@ -0,0 +1,83 @@
+"""
+Module contains registry of the persistence services selected by the configuration string.
+
+The configuration string is `<name>` or `<name>:<argument>`, for example:
+    memory                          - GameStateInMemoryPersistence
+    sharded                         - GameStateShardedPersistence
+    shared-memory:crossgame         - GameStateSharedMemoryPersistence, argument is the segment name
+    sqlite:/var/lib/games.db        - GameStateSqlitePersistence, argument is the database path
+    journal:/var/lib/games          - GameStateJournalPersistence, argument is the directory
+    kv:127.0.0.1:7070               - GameStateKeyValuePersistence, argument is the server address
+    write-behind:sqlite:games.db    - WriteBehindPersistence in front of the persistence from the argument
+By default the string is taken from the CROSSGAME_PERSISTENCE environment variable.
+
+    Raises:
+        ValueError: raised if the persistence name is unknown or the argument is missing
+"""
+import os
+from typing import Any, Callable
+
+from crossgame.api.journal_persistance import GameStateJournalPersistence
+from crossgame.api.kv_persistance import GameStateKeyValuePersistence, KeyValueClient
+from crossgame.api.persistance import GameStateInMemoryPersistence
+from crossgame.api.sharded_persistance import GameStateShardedPersistence
+from crossgame.api.shared_memory_persistance import GameStateSharedMemoryPersistence
+from crossgame.api.sqlite_persistance import GameStateSqlitePersistence
+from crossgame.api.write_behind_persistance import WriteBehindPersistence
+
+PERSISTENCE_ENVIRONMENT_VARIABLE: str = 'CROSSGAME_PERSISTENCE'
+DEFAULT_PERSISTENCE: str = 'memory'
+
+
+def create_kv_persistence(address: str) -> GameStateKeyValuePersistence:
+    """Create persistence connected to the key-value server at host:port."""
+    host, _, port = address.rpartition(':')
+    return GameStateKeyValuePersistence(KeyValueClient(host or '127.0.0.1', int(port)))
+
+
+PERSISTENCE_FACTORIES: dict[str, Callable[[str | None], Any]] = {
+    'memory': lambda _: GameStateInMemoryPersistence(),
+    'sharded': lambda _: GameStateShardedPersistence(),
+    'shared-memory': lambda name: GameStateSharedMemoryPersistence(name or 'crossgame'),
+    'sqlite': GameStateSqlitePersistence,
+    'journal': GameStateJournalPersistence,
+    'kv': create_kv_persistence,
+    'write-behind': lambda config: WriteBehindPersistence(create_persistence(config)),
+}
+ARGUMENT_IS_REQUIRED: set[str] = {'sqlite', 'journal', 'kv', 'write-behind'}
+
+
+def register_persistence(name: str, factory: Callable[[str | None], Any]) -> None:
+    """
+    Add the persistence service to the registry.
+
+    Args:
+        name (str): name used in the configuration string
+        factory (Callable[[str | None], Any]): creates the persistence from the argument of the configuration
+    """
+    PERSISTENCE_FACTORIES[name] = factory
+
+
+def create_persistence(config: str = None, default: str = DEFAULT_PERSISTENCE) -> Any:
+    """
+    Create the persistence service by the configuration string.
+
+    Args:
+        config (str, optional): configuration string.
+                                Defaults to None - the CROSSGAME_PERSISTENCE environment variable or default.
+        default (str, optional): configuration used if nothing is configured. Defaults to 'memory'.
+
+    Raises:
+        ValueError: raised if the persistence name is unknown or the required argument is missing
+
+    Returns:
+        Any: persistence service
+    """
+    if config is None:
+        config = os.environ.get(PERSISTENCE_ENVIRONMENT_VARIABLE) or default
+    name, _, argument = config.partition(':')
+    if name not in PERSISTENCE_FACTORIES:
+        raise ValueError(f'Unknown persistence {name}, available: {", ".join(PERSISTENCE_FACTORIES)}')
+    if name in ARGUMENT_IS_REQUIRED and not argument:
+        raise ValueError(f'Persistence {name} requires the argument: {name}:<argument>')
+    return PERSISTENCE_FACTORIES[name](argument or None)
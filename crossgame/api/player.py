@@ -1,13 +1,25 @@
 """Module contains player related classes."""
+from enum import Enum
+
 from crossgame.logic.game_enums import Sign
 
 
+class PlayerType(Enum):
+    """Type of the player that will be used for creating of the game."""
+
+    PLAYER = 1
+    AI_EASY = 2
+    AI_GOOD = 3
+
+
 class Player:
     """Represents the player information."""
 
-    def __init__(self, player_name: str, player_id: str, sign: Sign, is_active: bool = False) -> None:
+    def __init__(self, player_name: str, player_id: str, sign: Sign, is_active: bool = False,
+                 player_type: PlayerType = PlayerType.PLAYER) -> None:
         """Init Player Object."""
         self.player_name = str(player_name)
         self.player_id = str(player_id)
         self.sign = sign
         self.is_active = is_active
+        self.player_type = player_type
@@ -0,0 +1,199 @@
+"""
+Module contains thread-safe in-memory persistence service for multi-threaded servers.
+
+Games are split between shards by the hash of the game id. Each shard is
+GameStateInMemoryPersistence guarded by its own lock, so operations on games
+of different shards run without waiting for each other.
+
+    Raises:
+        GameNotFoundException: raised if the game_id is not found
+"""
+import heapq
+import math
+import threading
+import time
+from itertools import islice
+from typing import Callable
+from zlib import crc32
+
+from crossgame.api.persistance import EvictionStats, GameStateInMemoryPersistence, SavedGameInfo, SessionStatus
+
+
+class GameStateShardedPersistence:
+    """In-memory persistence service split into shards with separate locks."""
+
+    is_shared: bool = False
+
+    def __init__(self, shards: int = 16, max_games: int = None, idle_ttl: float = None,
+                 finished_ttl: float = None, clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        Initialize persistence.
+
+        Args:
+            shards (int, optional): number of shards. Defaults to 16.
+            max_games (int, optional): max number of stored games, divided equally between shards
+                                       (the least recently used game of the shard is evicted).
+                                       Defaults to None - unlimited.
+            idle_ttl (float, optional): seconds after the last access when the game is removed.
+                                        Defaults to None - never.
+            finished_ttl (float, optional): seconds after the finish when the game is removed.
+                                            Defaults to None - never.
+            clock (Callable[[], float], optional): source of the current time. Defaults to time.monotonic.
+        """
+        shard_max_games = math.ceil(max_games / shards) if max_games is not None else None
+        self.shards = [(threading.Lock(), GameStateInMemoryPersistence(shard_max_games, idle_ttl, finished_ttl, clock))
+                       for _ in range(shards)]
+
+    @property
+    def stats(self) -> EvictionStats:
+        """Return counters of the removed games summed over all shards."""
+        stats = EvictionStats()
+        for lock, shard in self.shards:
+            with lock:
+                stats.lru_evictions += shard.stats.lru_evictions
+                stats.idle_expirations += shard.stats.idle_expirations
+                stats.finished_expirations += shard.stats.finished_expirations
+        return stats
+
+    def __len__(self) -> int:
+        """Return number of stored games."""
+        return sum(len(shard.game_info_dict) for _, shard in self.shards)
+
+    def add_removal_listener(self, listener: Callable[[str], None]) -> None:
+        """
+        Register the function called with the id of the game after it is removed, evicted or expired.
+
+        Args:
+            listener (Callable[[str], None]): function (game_id) -> None, called under the lock of the shard
+        """
+        for lock, shard in self.shards:
+            with lock:
+                shard.add_removal_listener(listener)
+
+    def save_game_info(self, game_id: str, game_info: SavedGameInfo) -> None:
+        """
+        Save game info.
+
+        Args:
+            game_id (str): unique id of the game session
+            game_info (SavedGameInfo): object that contains current state of the game and players
+        """
+        lock, shard = self.__get_shard(game_id)
+        with lock:
+            shard.save_game_info(game_id, game_info)
+
+    def get_game_info(self, game_id: str) -> SavedGameInfo:
+        """
+        Retrieve game info.
+
+        Args:
+            game_id (str): unique id of the game session
+
+        Raises:
+            GameNotFoundException: raised if the passed id doesn't exist or the game is expired
+
+        Returns:
+            SavedGameInfo: information about saved game session
+        """
+        lock, shard = self.__get_shard(game_id)
+        with lock:
+            return shard.get_game_info(game_id)
+
+    def remove_game_info(self, game_id: str) -> None:
+        """
+        Remove game info.
+
+        Args:
+            game_id (str): unique id of the game session
+        """
+        lock, shard = self.__get_shard(game_id)
+        with lock:
+            shard.remove_game_info(game_id)
+
+    def get_finished_game_ids(self, limit: int = None) -> list[str]:
+        """
+        Return ids of the finished games, the earliest finished first.
+
+        Args:
+            limit (int, optional): max number of ids. Defaults to None - all.
+
+        Returns:
+            list[str]: ids of the finished games
+        """
+        return self.__merge(lambda shard: [(shard.finished_at[game_id], game_id)
+                                           for game_id in shard.get_finished_game_ids(limit)], limit)
+
+    def get_game_ids_by_player(self, player_id: str) -> list[str]:
+        """
+        Return ids of the games of the player.
+
+        Args:
+            player_id (str): player ID that was assigned during creation of player
+
+        Returns:
+            list[str]: ids of the games, empty if the player is not found
+        """
+        game_ids: list[str] = []
+        for lock, shard in self.shards:
+            with lock:
+                game_ids.extend(shard.get_game_ids_by_player(player_id))
+        return game_ids
+
+    def get_game_ids_by_status(self, status: SessionStatus, limit: int = None) -> list[str]:
+        """
+        Return ids of the games with the status, the earliest changed to this status first.
+
+        Args:
+            status (SessionStatus): status of the game session
+            limit (int, optional): max number of ids. Defaults to None - all.
+
+        Returns:
+            list[str]: ids of the games
+        """
+        return self.__merge(lambda shard: [(shard.status_games[status][game_id], game_id)
+                                           for game_id in shard.get_game_ids_by_status(status, limit)], limit)
+
+    def get_open_game_ids(self, limit: int = None) -> list[str]:
+        """
+        Return ids of the games that wait for the second player (lobby), the earliest created first.
+
+        Args:
+            limit (int, optional): max number of ids. Defaults to None - all.
+
+        Returns:
+            list[str]: ids of the games
+        """
+        return self.__merge(lambda shard: [(shard.status_games[SessionStatus.WAITING][game_id], game_id)
+                                           for game_id in shard.get_open_game_ids(limit)], limit)
+
+    def get_recent_game_ids(self, limit: int = None) -> list[str]:
+        """
+        Return ids of the games, the most recently accessed first.
+
+        Args:
+            limit (int, optional): max number of ids. Defaults to None - all.
+
+        Returns:
+            list[str]: ids of the games
+        """
+        recent: list[tuple[float, str]] = []
+        for lock, shard in self.shards:
+            with lock:
+                recent.extend((shard.last_access[game_id], game_id) for game_id in shard.get_recent_game_ids(limit))
+        if limit is None:
+            recent.sort(reverse=True)
+        else:
+            recent = heapq.nlargest(limit, recent)
+        return [game_id for _, game_id in recent]
+
+    def __merge(self, get_keyed_ids: Callable[[GameStateInMemoryPersistence], list[tuple[float, str]]],
+                limit: int | None) -> list[str]:
+        """Merge the first ids of each shard (sorted by the time of the shard index) into the global order."""
+        keyed_ids: list[list[tuple[float, str]]] = []
+        for lock, shard in self.shards:
+            with lock:
+                keyed_ids.append(get_keyed_ids(shard))
+        return [game_id for _, game_id in islice(heapq.merge(*keyed_ids), limit)]
+
+    def __get_shard(self, game_id: str) -> tuple[threading.Lock, GameStateInMemoryPersistence]:
+        return self.shards[crc32(game_id.encode('utf-8')) % len(self.shards)]
@@ -0,0 +1,317 @@
+"""
+Module contains persistence service that keeps games in the shared memory.
+
+All worker processes of the server attach to the same shared memory segment,
+so a game created by one worker can be played through any other one.
+The segment contains fixed-size slots. A slot keeps the game id and the game packed by the codec.
+The slot of the game is found by the hash of its id with linear probing.
+
+Each home slot has a lock: a thread lock within the process and a lock of the byte
+in the lock file (fcntl) between processes. Claiming and releasing of slots
+is additionally guarded by the index lock. The Controller uses the slot locks
+as game locks, so a move is serialized across all the workers.
+
+    Raises:
+        GameNotFoundException: raised if the game_id is not found
+        StorageIsFullException: raised if there is no free slot for the new game
+        IncorrectFieldSizeException: raised by check_game_size if the finished game doesn't fit the slot
+"""
+import logging as log
+import os
+import struct
+import tempfile
+import threading
+from multiprocessing import resource_tracker, shared_memory
+from zlib import crc32
+
+from crossgame.api.codec import decode_game_info, decode_session_version, encode_game_info, get_max_encoded_size
+from crossgame.api.persistance import SavedGameInfo
+from crossgame.exceptions.game_exceptions import (GameNotFoundException, IncorrectFieldSizeException,
+                                                  StorageIsFullException)
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore
+
+MAGIC: bytes = b'CGSM'
+LAYOUT_VERSION: int = 1
+HEADER: struct.Struct = struct.Struct('<4sHII')
+HEADER_SIZE: int = 64
+SLOT_HEADER: struct.Struct = struct.Struct('<BBI64s')
+MAX_KEY_LENGTH: int = 64
+
+SLOT_FREE: int = 0
+SLOT_USED: int = 1
+SLOT_REMOVED: int = 2
+
+
+class SlotLock:
+    """Re-entrant lock shared by the threads of all processes that use the same lock file."""
+
+    def __init__(self, fd: int | None, offset: int) -> None:
+        """
+        Initialize lock.
+
+        Args:
+            fd (int | None): descriptor of the lock file, None - lock only the threads of the process
+            offset (int): byte of the lock file that is locked
+        """
+        self.fd = fd
+        self.offset = offset
+        self.thread_lock = threading.RLock()
+        self.count = 0
+
+    def __enter__(self) -> 'SlotLock':
+        """Acquire the lock."""
+        self.thread_lock.acquire()
+        if self.count == 0 and self.fd is not None:
+            try:
+                fcntl.lockf(self.fd, fcntl.LOCK_EX, 1, self.offset)
+            except BaseException:
+                self.thread_lock.release()
+                raise
+        self.count += 1
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Release the lock."""
+        self.count -= 1
+        if self.count == 0 and self.fd is not None:
+            fcntl.lockf(self.fd, fcntl.LOCK_UN, 1, self.offset)
+        self.thread_lock.release()
+
+
+class SlotLockRegistry:
+    """Locks of the home slots, used by the Controller as game locks."""
+
+    def __init__(self, fd: int | None, slots: int) -> None:
+        """
+        Initialize registry.
+
+        Args:
+            fd (int | None): descriptor of the lock file, None - lock only the threads of the process
+            slots (int): number of slots
+        """
+        self.locks = [SlotLock(fd, index + 1) for index in range(slots)]
+
+    def get(self, game_id: str) -> SlotLock:
+        """
+        Return the lock of the game (shared by all processes).
+
+        Args:
+            game_id (str): unique id of the game session
+
+        Returns:
+            SlotLock: lock of the home slot of the game
+        """
+        return self.locks[get_home_slot(encode_key(game_id), len(self.locks))]
+
+
+def encode_key(game_id: str) -> bytes:
+    """
+    Return the game id as the slot key.
+
+    Raises:
+        ValueError: raised if the game id is too long
+    """
+    key = game_id.encode('utf-8')
+    if len(key) > MAX_KEY_LENGTH:
+        raise ValueError(f'Game id {game_id} is longer than {MAX_KEY_LENGTH} bytes')
+    return key
+
+
+def get_home_slot(key: bytes, slots: int) -> int:
+    """Return the first slot to probe for the key."""
+    return crc32(key) % slots
+
+
+class GameStateSharedMemoryPersistence:
+    """Persistence service that keeps games in fixed-size slots of the shared memory segment."""
+
+    def __init__(self, name: str = 'crossgame', slots: int = 4096, slot_size: int = 2048,
+                 lock_path: str = None) -> None:
+        """
+        Create the shared memory segment or attach to the existing one.
+
+        Args:
+            name (str, optional): name of the shared memory segment. Defaults to 'crossgame'.
+            slots (int, optional): max number of games. Defaults to 4096.
+            slot_size (int, optional): size of the slot in bytes (slot header and packed game).
+                                       Defaults to 2048.
+            lock_path (str, optional): path to the lock file. Defaults to <temp dir>/<name>.lock.
+
+        Raises:
+            ValueError: raised if the existing segment has other layout
+        """
+        self.name = name
+        self.slots = slots
+        self.slot_size = slot_size
+        self.lock_path = lock_path or os.path.join(tempfile.gettempdir(), f'{name}.lock')
+        self.fd: int | None = None
+        if fcntl is not None:
+            self.fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        else:
+            log.warning('fcntl is not available, games are locked only within the process')
+        self.index_lock = SlotLock(self.fd, 0)
+        self.game_locks = SlotLockRegistry(self.fd, slots)
+        with self.index_lock:
+            self.memory = self.__open_memory()
+        self.buffer = self.memory.buf
+
+    def save_game_info(self, game_id: str, game_info: SavedGameInfo) -> None:
+        """
+        Save game info to its slot, the slot is claimed if the game is new.
+
+        Args:
+            game_id (str): unique id of the game session
+            game_info (SavedGameInfo): object that contains current state of the game and players
+
+        Raises:
+            StorageIsFullException: raised if there is no free slot
+            ValueError: raised if the packed game or the game id doesn't fit the slot
+        """
+        key = encode_key(game_id)
+        data = encode_game_info(game_info)
+        if len(data) > self.slot_size - SLOT_HEADER.size:
+            raise ValueError(f'Game {game_id} takes {len(data)} bytes, slot size is {self.slot_size}')
+        with self.game_locks.get(game_id):
+            slot = self.__find_slot(key)
+            if slot is None:
+                with self.index_lock:
+                    slot = self.__find_slot(key)
+                    if slot is None:
+                        slot = self.__claim_slot(game_id, key)
+            offset = self.__get_offset(slot)
+            self.buffer[offset + SLOT_HEADER.size:offset + SLOT_HEADER.size + len(data)] = data
+            SLOT_HEADER.pack_into(self.buffer, offset, SLOT_USED, len(key), len(data), key)
+
+    def check_game_size(self, game_info: SavedGameInfo) -> None:
+        """
+        Check that the game fits the slot when all the cells of its field are taken.
+
+        Args:
+            game_info (SavedGameInfo): object that contains current state of the game and players
+
+        Raises:
+            IncorrectFieldSizeException: raised if the finished game or the unbounded game doesn't fit the slot
+        """
+        size = get_max_encoded_size(game_info)
+        if size is None or size > self.slot_size - SLOT_HEADER.size:
+            raise IncorrectFieldSizeException(
+                f'Game {game_info.game_id} doesn\'t fit the slot of {self.slot_size} bytes')
+
+    def get_game_info(self, game_id: str) -> SavedGameInfo:
+        """
+        Retrieve game info.
+
+        Args:
+            game_id (str): unique id of the game session
+
+        Raises:
+            GameNotFoundException: raised if the passed id doesn't exist
+
+        Returns:
+            SavedGameInfo: information about saved game session (decoded copy)
+        """
+        key = encode_key(game_id)
+        with self.game_locks.get(game_id):
+            slot = self.__find_slot(key)
+            if slot is None:
+                raise GameNotFoundException(f'Game with id {game_id} is not found')
+            offset = self.__get_offset(slot)
+            _, _, length, _ = SLOT_HEADER.unpack_from(self.buffer, offset)
+            return decode_game_info(self.buffer[offset + SLOT_HEADER.size:offset + SLOT_HEADER.size + length])
+
+    def get_game_version(self, game_id: str) -> int:
+        """
+        Retrieve version of the game session, only the beginning of the packed game is read.
+
+        Args:
+            game_id (str): unique id of the game session
+
+        Raises:
+            GameNotFoundException: raised if the passed id doesn't exist
+
+        Returns:
+            int: version of the game session
+        """
+        key = encode_key(game_id)
+        with self.game_locks.get(game_id):
+            slot = self.__find_slot(key)
+            if slot is None:
+                raise GameNotFoundException(f'Game with id {game_id} is not found')
+            offset = self.__get_offset(slot)
+            _, _, length, _ = SLOT_HEADER.unpack_from(self.buffer, offset)
+            return decode_session_version(self.buffer[offset + SLOT_HEADER.size:offset + SLOT_HEADER.size + length])
+
+    def remove_game_info(self, game_id: str) -> None:
+        """
+        Remove game info, the slot is marked as removed and can be claimed by other game.
+
+        Args:
+            game_id (str): unique id of the game session
+        """
+        key = encode_key(game_id)
+        with self.game_locks.get(game_id), self.index_lock:
+            slot = self.__find_slot(key)
+            if slot is None:
+                log.warning('Game with %s id is not found, will be skipped', game_id)
+                return
+            self.buffer[self.__get_offset(slot)] = SLOT_REMOVED
+
+    def close(self) -> None:
+        """Detach from the shared memory segment and close the lock file."""
+        self.buffer = None
+        self.memory.close()
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+    def unlink(self) -> None:
+        """Destroy the shared memory segment, should be called once when all workers are stopped."""
+        # SharedMemory.unlink() unregisters the segment from the resource tracker, it was unregistered on open
+        resource_tracker.register(self.memory._name, 'shared_memory')  # pylint: disable=protected-access
+        self.memory.unlink()
+
+    def __open_memory(self) -> shared_memory.SharedMemory:
+        size = HEADER_SIZE + self.slots * self.slot_size
+        try:
+            memory = shared_memory.SharedMemory(self.name, create=True, size=size)
+            HEADER.pack_into(memory.buf, 0, MAGIC, LAYOUT_VERSION, self.slots, self.slot_size)
+            log.info('Shared memory %s is created, %s slots of %s bytes', self.name, self.slots, self.slot_size)
+        except FileExistsError:
+            memory = shared_memory.SharedMemory(self.name)
+            header = HEADER.unpack_from(memory.buf, 0)
+            if header != (MAGIC, LAYOUT_VERSION, self.slots, self.slot_size):
+                memory.close()
+                raise ValueError(f'Shared memory {self.name} has other layout {header}')
+        # the segment should outlive the process that created it, it is removed by unlink()
+        resource_tracker.unregister(memory._name, 'shared_memory')  # pylint: disable=protected-access
+        return memory
+
+    def __find_slot(self, key: bytes) -> int | None:
+        """Return slot of the game or None, probing stops at the first free slot."""
+        home = get_home_slot(key, self.slots)
+        for step in range(self.slots):
+            slot = (home + step) % self.slots
+            state, key_length, _, slot_key = SLOT_HEADER.unpack_from(self.buffer, self.__get_offset(slot))
+            if state == SLOT_FREE:
+                return None
+            if state == SLOT_USED and slot_key[:key_length] == key:
+                return slot
+        return None
+
+    def __claim_slot(self, game_id: str, key: bytes) -> int:
+        """Take the free slot for the game, it is marked as used before the index lock is released."""
+        home = get_home_slot(key, self.slots)
+        for step in range(self.slots):
+            slot = (home + step) % self.slots
+            offset = self.__get_offset(slot)
+            if self.buffer[offset] != SLOT_USED:
+                SLOT_HEADER.pack_into(self.buffer, offset, SLOT_USED, len(key), 0, key)
+                return slot
+        raise StorageIsFullException(f'There is no free slot for the game {game_id}')
+
+    def __get_offset(self, slot: int) -> int:
+        return HEADER_SIZE + slot * self.slot_size
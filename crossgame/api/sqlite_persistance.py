@@ -0,0 +1,185 @@
+"""
+Module contains persistence service that keeps games in the SQLite database.
+
+Games are stored as blobs packed by the codec, the version of the session is kept
+in its own column, so it is read without the blob. The database works in WAL mode,
+so several processes (for example gunicorn workers) can read and write the same games.
+Each thread uses its own connection. Game locks are the byte locks of the lock file
+next to the database, so the Controller serializes the read-modify-write of a game
+across all the processes, not only across the threads of one process.
+The in-memory database (:memory:) exists only while its connection is open, so all
+the threads share the one connection and take turns on it.
+
+    Raises:
+        GameNotFoundException: raised if the game_id is not found
+"""
+import logging as log
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from crossgame.api.codec import decode_game_info, encode_game_info
+from crossgame.api.persistance import SavedGameInfo
+from crossgame.api.shared_memory_persistance import SlotLockRegistry, fcntl
+from crossgame.exceptions.game_exceptions import GameNotFoundException
+
+CREATE_TABLE_SQL: str = '''
+CREATE TABLE IF NOT EXISTS game_infos (
+    game_id TEXT PRIMARY KEY,
+    data BLOB NOT NULL,
+    updated_at REAL NOT NULL,
+    version INTEGER NOT NULL
+)
+'''
+SAVE_SQL: str = '''
+INSERT INTO game_infos (game_id, data, updated_at, version) VALUES (?, ?, ?, ?)
+ON CONFLICT (game_id) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at, version = excluded.version
+'''
+GET_SQL: str = 'SELECT data FROM game_infos WHERE game_id = ?'
+GET_VERSION_SQL: str = 'SELECT version FROM game_infos WHERE game_id = ?'
+REMOVE_SQL: str = 'DELETE FROM game_infos WHERE game_id = ?'
+IN_MEMORY_PATH: str = ':memory:'
+
+
+class GameStateSqlitePersistence:
+    """Persistence service that keeps games in the SQLite database in WAL mode."""
+
+    def __init__(self, path: str, timeout: float = 5.0, lock_path: str = None, locks: int = 1024) -> None:
+        """
+        Initialize persistence and create the table if it doesn't exist.
+
+        Args:
+            path (str): path to the database file
+            timeout (float, optional): seconds to wait for the lock of the database. Defaults to 5.0.
+            lock_path (str, optional): path to the file of the game locks.
+                                       Defaults to <path>.lock, the in-memory database (:memory:) has no lock file.
+            locks (int, optional): number of game locks, games share a lock by the hash of the id. Defaults to 1024.
+        """
+        self.path = path
+        self.timeout = timeout
+        self.lock_path = lock_path or (None if path == IN_MEMORY_PATH else f'{path}.lock')
+        self.fd: int | None = None
+        if self.lock_path is None:
+            log.debug('In-memory database, games are locked only within the process')
+        elif fcntl is not None:
+            self.fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        else:
+            log.warning('fcntl is not available, games are locked only within the process')
+        self.game_locks = SlotLockRegistry(self.fd, locks)
+        self.local = threading.local()
+        self.connections: list[sqlite3.Connection] = []
+        self.connections_lock = threading.Lock()
+        self.memory_lock = threading.Lock()
+        with self.__connect() as connection:
+            connection.execute('PRAGMA journal_mode=WAL')
+            with connection:
+                connection.execute(CREATE_TABLE_SQL)
+
+    def save_game_info(self, game_id: str, game_info: SavedGameInfo) -> None:
+        """
+        Save game info.
+
+        Args:
+            game_id (str): unique id of the game session
+            game_info (SavedGameInfo): object that contains current state of the game and players
+        """
+        data = encode_game_info(game_info)
+        with self.__connect() as connection, connection:
+            connection.execute(SAVE_SQL, (game_id, data, time.time(), game_info.version))
+
+    def save_game_infos(self, game_infos: dict[str, SavedGameInfo]) -> None:
+        """
+        Save several games in one transaction.
+
+        Args:
+            game_infos (dict[str, SavedGameInfo]): game id -> object that contains current state of the game and players
+        """
+        now = time.time()
+        rows = [(game_id, encode_game_info(game_info), now, game_info.version)
+                for game_id, game_info in game_infos.items()]
+        with self.__connect() as connection, connection:
+            connection.executemany(SAVE_SQL, rows)
+
+    def get_game_info(self, game_id: str) -> SavedGameInfo:
+        """
+        Retrieve game info.
+
+        Args:
+            game_id (str): unique id of the game session
+
+        Raises:
+            GameNotFoundException: raised if the passed id doesn't exist
+
+        Returns:
+            SavedGameInfo: information about saved game session
+        """
+        with self.__connect() as connection:
+            row = connection.execute(GET_SQL, (game_id,)).fetchone()
+        if row is None:
+            raise GameNotFoundException(f'Game with id {game_id} is not found')
+        return decode_game_info(row[0])
+
+    def get_game_version(self, game_id: str) -> int:
+        """
+        Retrieve version of the game session from its column, the game is not read.
+
+        Args:
+            game_id (str): unique id of the game session
+
+        Raises:
+            GameNotFoundException: raised if the passed id doesn't exist
+
+        Returns:
+            int: version of the game session
+        """
+        with self.__connect() as connection:
+            row = connection.execute(GET_VERSION_SQL, (game_id,)).fetchone()
+        if row is None:
+            raise GameNotFoundException(f'Game with id {game_id} is not found')
+        return row[0]
+
+    def remove_game_info(self, game_id: str) -> None:
+        """
+        Remove game info.
+
+        Args:
+            game_id (str): unique id of the game session
+        """
+        with self.__connect() as connection, connection:
+            removed = connection.execute(REMOVE_SQL, (game_id,)).rowcount
+        if not removed:
+            log.warning('Game with %s id is not found, will be skipped', game_id)
+
+    def close(self) -> None:
+        """Close connections of all the threads and the lock file."""
+        with self.connections_lock:
+            for connection in self.connections:
+                connection.close()
+            self.connections.clear()
+        self.local = threading.local()
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+    @contextmanager
+    def __connect(self) -> Iterator[sqlite3.Connection]:
+        if self.path != IN_MEMORY_PATH:
+            yield self.__get_connection()
+            return
+        with self.memory_lock:
+            yield self.__get_connection()
+
+    def __get_connection(self) -> sqlite3.Connection:
+        if self.path == IN_MEMORY_PATH and self.connections:
+            return self.connections[0]
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False)
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self.local.connection = connection
+            with self.connections_lock:
+                self.connections.append(connection)
+        return connection
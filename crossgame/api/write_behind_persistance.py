@@ -0,0 +1,240 @@
+"""
+Module contains write-behind layer in front of the durable persistence service.
+
+The layer keeps the hot copy of the games in memory and answers reads from it.
+Saves are recorded as dirty games, several saves of one game are coalesced into one
+write, and the background thread writes dirty games to the backend in batches
+(when the batch is full or the flush interval is passed). The game is packed by
+the codec at the moment of the save, so the background write doesn't see
+later changes made by the other threads.
+
+Durability is configured by wait_for_flush:
+    False - save returns immediately, the game is written by the next batch
+    True  - save returns when the batch with the game is written (errors are raised to the caller),
+            the hot copy is updated only after the write, a failed save drops the hot copy of the game
+The hot copy keeps at most max_games recently used games, evicted games are read again
+from the dirty games, the games of the batch that is being written or the backend.
+Backends that have save_game_infos (SQLite) write the whole batch in one transaction.
+
+    Raises:
+        GameNotFoundException: raised if the game_id is not found
+"""
+import logging as log
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from crossgame.api.codec import decode_game_info, encode_game_info
+from crossgame.api.persistance import SavedGameInfo
+from crossgame.exceptions.game_exceptions import GameNotFoundException
+
+REMOVED: None = None
+
+
+class FlushTicket:
+    """Result of the batch write, savers that wait for the durability wait for it."""
+
+    def __init__(self) -> None:
+        """Initialize ticket of the batch that is not written yet."""
+        self.done = threading.Event()
+        self.error: BaseException | None = None
+
+
+class WriteBehindPersistence:
+    """Persistence service that writes games to the backend in background batches."""
+
+    # reads are answered by the hot copy of the process
+    is_shared: bool = False
+
+    def __init__(self, backend: Any, batch_size: int = 64, flush_interval: float = 0.05,
+                 wait_for_flush: bool = False, max_games: int = 10000) -> None:
+        """
+        Initialize persistence and start the background writer.
+
+        Args:
+            backend (Any): durable persistence service (save_game_info, get_game_info, remove_game_info)
+            batch_size (int, optional): number of dirty games that starts the write. Defaults to 64.
+            flush_interval (float, optional): max seconds the game stays dirty. Defaults to 0.05.
+            wait_for_flush (bool, optional): True - save waits until the game is written.
+                                             Defaults to False.
+            max_games (int, optional): max number of games in the hot copy. Defaults to 10000.
+        """
+        self.backend = backend
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.wait_for_flush = wait_for_flush
+        self.max_games = max_games
+        self.game_info_dict: OrderedDict[str, SavedGameInfo] = OrderedDict()
+        self.dirty: dict[str, bytes | None] = {}
+        # batch taken by the writer, its games are not in the backend until the write is finished
+        self.in_flight: dict[str, bytes | None] = {}
+        self.ticket = FlushTicket()
+        self.condition = threading.Condition()
+        self.force_flush = False
+        self.is_closed = False
+        self.writes = 0
+        self.batches = 0
+        self.writer = threading.Thread(target=self.__run, name='write-behind', daemon=True)
+        self.writer.start()
+
+    def save_game_info(self, game_id: str, game_info: SavedGameInfo) -> None:
+        """
+        Save game info to the hot copy and mark it dirty.
+
+        Args:
+            game_id (str): unique id of the game session
+            game_info (SavedGameInfo): object that contains current state of the game and players
+
+        Raises:
+            Exception: error of the backend if wait_for_flush is True
+        """
+        data = encode_game_info(game_info)
+        with self.condition:
+            if not self.wait_for_flush:
+                self.__put_hot_copy(game_id, game_info)
+            ticket = self.__mark_dirty(game_id, data)
+        if not self.wait_for_flush:
+            return
+        try:
+            self.__wait(ticket)
+        except Exception:
+            # the hot copy may be the same object changed by the caller, next read takes the game from the backend
+            with self.condition:
+                self.game_info_dict.pop(game_id, None)
+            raise
+        with self.condition:
+            self.__put_hot_copy(game_id, game_info)
+
+    def get_game_info(self, game_id: str) -> SavedGameInfo:
+        """
+        Retrieve game info from the hot copy or from the backend.
+
+        Args:
+            game_id (str): unique id of the game session
+
+        Raises:
+            GameNotFoundException: raised if the passed id doesn't exist
+
+        Returns:
+            SavedGameInfo: information about saved game session
+        """
+        with self.condition:
+            game_info = self.game_info_dict.get(game_id)
+            if game_info is not None:
+                self.game_info_dict.move_to_end(game_id)
+                return game_info
+            for pending in (self.dirty, self.in_flight):
+                if game_id in pending:
+                    data = pending[game_id]
+                    if data is REMOVED:
+                        raise GameNotFoundException(f'Game with id {game_id} is not found')
+                    return self.__put_hot_copy(game_id, decode_game_info(data))
+        game_info = self.backend.get_game_info(game_id)
+        with self.condition:
+            return self.game_info_dict.get(game_id) or self.__put_hot_copy(game_id, game_info)
+
+    def remove_game_info(self, game_id: str) -> None:
+        """
+        Remove game info from the hot copy, the backend is changed by the next batch.
+
+        Args:
+            game_id (str): unique id of the game session
+        """
+        with self.condition:
+            self.game_info_dict.pop(game_id, None)
+            ticket = self.__mark_dirty(game_id, REMOVED)
+        if self.wait_for_flush:
+            self.__wait(ticket)
+
+    def flush(self) -> None:
+        """
+        Write all dirty games now and wait for the result.
+
+        Raises:
+            Exception: error of the backend
+        """
+        with self.condition:
+            if not self.dirty:
+                return
+            self.force_flush = True
+            ticket = self.ticket
+            self.condition.notify()
+        self.__wait(ticket)
+
+    def close(self) -> None:
+        """Write dirty games and stop the background writer."""
+        with self.condition:
+            self.is_closed = True
+            self.condition.notify()
+        self.writer.join()
+
+    def __put_hot_copy(self, game_id: str, game_info: SavedGameInfo) -> SavedGameInfo:
+        self.game_info_dict[game_id] = game_info
+        self.game_info_dict.move_to_end(game_id)
+        while len(self.game_info_dict) > self.max_games:
+            self.game_info_dict.popitem(last=False)
+        return game_info
+
+    def __mark_dirty(self, game_id: str, data: bytes | None) -> FlushTicket:
+        self.dirty[game_id] = data
+        if len(self.dirty) >= self.batch_size or self.wait_for_flush:
+            self.condition.notify()
+        return self.ticket
+
+    @staticmethod
+    def __wait(ticket: FlushTicket) -> None:
+        ticket.done.wait()
+        if ticket.error is not None:
+            raise ticket.error
+
+    def __run(self) -> None:
+        while True:
+            with self.condition:
+                deadline = None
+                while not self.is_closed:
+                    timeout = None
+                    if self.dirty:
+                        if len(self.dirty) >= self.batch_size or self.wait_for_flush or self.force_flush:
+                            break
+                        if deadline is None:
+                            deadline = time.monotonic() + self.flush_interval
+                        timeout = deadline - time.monotonic()
+                        if timeout <= 0:
+                            break
+                    self.condition.wait(timeout)
+                self.force_flush = False
+                batch, self.dirty = self.dirty, {}
+                self.in_flight = batch
+                ticket, self.ticket = self.ticket, FlushTicket()
+                is_closed = self.is_closed
+            self.__write(batch, ticket)
+            if is_closed:
+                return
+
+    def __write(self, batch: dict[str, bytes | None], ticket: FlushTicket) -> None:
+        try:
+            game_infos = {game_id: decode_game_info(data) for game_id, data in batch.items() if data is not REMOVED}
+            if hasattr(self.backend, 'save_game_infos'):
+                self.backend.save_game_infos(game_infos)
+            else:
+                for game_id, game_info in game_infos.items():
+                    self.backend.save_game_info(game_id, game_info)
+            for game_id, data in batch.items():
+                if data is REMOVED:
+                    self.backend.remove_game_info(game_id)
+            self.writes += len(batch)
+            if batch:
+                self.batches += 1
+        except Exception as error:  # pylint: disable=broad-except
+            ticket.error = error
+            if self.wait_for_flush:
+                log.exception('Write of %s games failed', len(batch))
+            else:
+                log.exception('Write of %s games failed, they will be written by the next batch', len(batch))
+                with self.condition:
+                    for game_id, data in batch.items():
+                        self.dirty.setdefault(game_id, data)
+        with self.condition:
+            self.in_flight = {}
+        ticket.done.set()
@@ -0,0 +1,343 @@
+"""
+Module contains WebSocket server that pushes moves of the games to the players.
+
+Clients connect to ws://<host>:<port>/games/<game_id>?player_id=<player_id>
+(player_id is needed only to make moves). Messages are JSON:
+    server: {"version": <version>, "moves": []}                  - current version, right after the connection
+    server: {"version": <version>, "moves": [[row, column, sign], ...]} - moves of the start or the move of the game
+    client: {"row": <row>, "column": <column>}                   - move of the player
+    server: {"error": <exception name>, "message": <text>}       - the move of the client failed
+All connections are served by one asyncio event loop, so an idle connection costs only its buffers.
+The message with the moves is encoded once and the same frame is written to all subscribers
+of the game. Subscribers that don't read their socket are disconnected.
+
+Only the part of RFC 6455 used by the browsers is implemented: text, ping and close frames,
+without fragmentation and extensions.
+
+    Raises:
+        ValueError: raised if the client breaks the protocol
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import logging as log
+import re
+import struct
+import threading
+from typing import Any
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from crossgame.api.controller import Controller
+from crossgame.api.game_updates import MoveDelta
+from crossgame.exceptions.game_exceptions import GameNotFoundException
+
+WEBSOCKET_GUID: bytes = b'258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+PATH_PATTERN: re.Pattern = re.compile(r'/games/([^/]+)')
+
+OPCODE_TEXT: int = 0x1
+OPCODE_BINARY: int = 0x2
+OPCODE_CLOSE: int = 0x8
+OPCODE_PING: int = 0x9
+OPCODE_PONG: int = 0xA
+
+CLOSE_PROTOCOL_ERROR: int = 1002
+
+SHORT_LENGTH: struct.Struct = struct.Struct('!H')
+LONG_LENGTH: struct.Struct = struct.Struct('!Q')
+CLOSE_CODE: struct.Struct = struct.Struct('!H')
+
+
+def get_accept_key(key: str) -> str:
+    """Return value of the Sec-WebSocket-Accept header for the key of the client."""
+    return base64.b64encode(hashlib.sha1(key.encode('ascii') + WEBSOCKET_GUID).digest()).decode('ascii')
+
+
+def encode_frame(opcode: int, payload: bytes) -> bytes:
+    """Pack the final unmasked frame (frames of the server are not masked)."""
+    length = len(payload)
+    if length < 126:
+        header = bytes((0x80 | opcode, length))
+    elif length < 1 << 16:
+        header = bytes((0x80 | opcode, 126)) + SHORT_LENGTH.pack(length)
+    else:
+        header = bytes((0x80 | opcode, 127)) + LONG_LENGTH.pack(length)
+    return header + payload
+
+
+def encode_message(message: dict[str, Any]) -> bytes:
+    """Pack the message to the text frame."""
+    return encode_frame(OPCODE_TEXT, json.dumps(message, separators=(',', ':')).encode('utf-8'))
+
+
+def encode_moves(deltas: list[MoveDelta]) -> bytes:
+    """Pack the moves to the text frame sent to the subscribers of the game."""
+    return encode_message({'version': deltas[-1].version,
+                           'moves': [[delta.row, delta.column, delta.sign.name] for delta in deltas]})
+
+
+def unmask(payload: bytes, mask: bytes) -> bytes:
+    """Apply the mask of the client frame, the whole payload is XORed as one integer."""
+    length = len(payload)
+    repeated_mask = (mask * (length // 4 + 1))[:length]
+    return (int.from_bytes(payload, 'little') ^ int.from_bytes(repeated_mask, 'little')).to_bytes(length, 'little')
+
+
+async def read_frame(reader: asyncio.StreamReader, max_size: int) -> tuple[int, bytes]:
+    """
+    Read the frame of the client.
+
+    Args:
+        reader (asyncio.StreamReader): stream of the connection
+        max_size (int): max size of the payload
+
+    Raises:
+        ValueError: raised if the frame is fragmented, not masked or too big
+
+    Returns:
+        tuple[int, bytes]: opcode and unmasked payload
+    """
+    first, second = await reader.readexactly(2)
+    if not first & 0x80 or first & 0x70:
+        raise ValueError('Fragmented frames and extensions are not supported')
+    if not second & 0x80:
+        raise ValueError('Frames of the client should be masked')
+    length = second & 0x7F
+    if length == 126:
+        (length,) = SHORT_LENGTH.unpack(await reader.readexactly(SHORT_LENGTH.size))
+    elif length == 127:
+        (length,) = LONG_LENGTH.unpack(await reader.readexactly(LONG_LENGTH.size))
+    if length > max_size:
+        raise ValueError(f'Frame of {length} bytes is too big')
+    mask = await reader.readexactly(4)
+    return first & 0x0F, unmask(await reader.readexactly(length), mask)
+
+
+class GameHub:
+    """Subscribers of the games and the fan-out of the moves on the event loop."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_buffer_size: int = 64 * 1024) -> None:
+        """
+        Initialize hub.
+
+        Args:
+            loop (asyncio.AbstractEventLoop): event loop of the connections
+            max_buffer_size (int, optional): bytes not sent to the subscriber when it is disconnected.
+                                             Defaults to 64 KB.
+        """
+        self.loop = loop
+        self.max_buffer_size = max_buffer_size
+        self.subscribers: dict[str, set[asyncio.StreamWriter]] = {}
+        self.broadcasts = 0
+
+    def subscribe(self, game_id: str, writer: asyncio.StreamWriter) -> None:
+        """Add the connection to the subscribers of the game (event loop only)."""
+        self.subscribers.setdefault(game_id, set()).add(writer)
+
+    def unsubscribe(self, game_id: str, writer: asyncio.StreamWriter) -> None:
+        """Remove the connection from the subscribers of the game (event loop only)."""
+        writers = self.subscribers.get(game_id)
+        if writers is not None:
+            writers.discard(writer)
+            if not writers:
+                del self.subscribers[game_id]
+
+    def on_moves(self, game_id: str, deltas: list[MoveDelta]) -> None:
+        """
+        Send the moves to the subscribers of the game, called by the Controller from any thread.
+
+        Args:
+            game_id (str): unique id of the game session
+            deltas (list[MoveDelta]): new moves
+        """
+        if game_id not in self.subscribers:
+            return
+        frame = encode_moves(deltas)
+        self.loop.call_soon_threadsafe(self.broadcast, game_id, frame)
+
+    def broadcast(self, game_id: str, frame: bytes) -> None:
+        """Write the frame to all subscribers of the game (event loop only)."""
+        self.broadcasts += 1
+        for writer in list(self.subscribers.get(game_id, ())):
+            if writer.transport.get_write_buffer_size() > self.max_buffer_size:
+                log.warning('Subscriber of game %s does not read the updates, disconnected', game_id)
+                self.unsubscribe(game_id, writer)
+                writer.transport.abort()
+            else:
+                writer.write(frame)
+
+
+class GameWebSocketServer:
+    """WebSocket server of the game channels, moves are made and received through the Controller."""
+
+    def __init__(self, controller: Controller, host: str = '127.0.0.1', port: int = 8765,
+                 max_message_size: int = 4096, max_buffer_size: int = 64 * 1024) -> None:
+        """
+        Initialize server.
+
+        Args:
+            controller (Controller): controller of the games
+            host (str, optional): address to listen. Defaults to '127.0.0.1'.
+            port (int, optional): port to listen, 0 - any free port. Defaults to 8765.
+            max_message_size (int, optional): max size of the message of the client. Defaults to 4096.
+            max_buffer_size (int, optional): bytes not sent to the subscriber when it is disconnected.
+                                             Defaults to 64 KB.
+        """
+        self.controller = controller
+        self.host = host
+        self.port = port
+        self.max_message_size = max_message_size
+        self.max_buffer_size = max_buffer_size
+        self.server: asyncio.AbstractServer | None = None
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.hub: GameHub | None = None
+
+    async def start(self) -> int:
+        """
+        Start listening and receiving moves of the Controller.
+
+        Raises:
+            OSError: raised if the address can't be bound, for example the port is taken by other process
+
+        Returns:
+            int: port of the server
+        """
+        self.loop = asyncio.get_running_loop()
+        self.hub = GameHub(self.loop, self.max_buffer_size)
+        self.server = await asyncio.start_server(self.__handle_client, self.host, self.port, backlog=1024)
+        # the listener is added only to the bound server, a failed start leaves the Controller untouched
+        self.controller.add_move_listener(self.hub.on_moves)
+        self.port = self.server.sockets[0].getsockname()[1]
+        log.info('WebSocket server is listening on %s:%s', self.host, self.port)
+        return self.port
+
+    async def serve_forever(self) -> None:
+        """Start listening and serve clients until the task is cancelled."""
+        await self.start()
+        async with self.server:  # type: ignore
+            await self.server.serve_forever()  # type: ignore
+
+    def run_in_thread(self) -> int:
+        """
+        Start the server on the event loop in the daemon thread.
+
+        Raises:
+            OSError: raised if the address can't be bound, the thread is finished
+
+        Returns:
+            int: port of the server
+        """
+        started = threading.Event()
+        errors: list[BaseException] = []
+        loop = asyncio.new_event_loop()
+
+        def run() -> None:
+            asyncio.set_event_loop(loop)
+            try:
+                loop.run_until_complete(self.start())
+            except BaseException as error:  # pylint: disable=broad-except
+                errors.append(error)
+                loop.close()
+                return
+            finally:
+                started.set()
+            loop.run_forever()
+
+        thread = threading.Thread(target=run, name='ws-server', daemon=True)
+        thread.start()
+        started.wait()
+        if errors:
+            thread.join()
+            self.loop = self.server = self.hub = None
+            raise errors[0]
+        return self.port
+
+    def stop(self) -> None:
+        """Stop the server started by run_in_thread."""
+        if self.loop is None or self.server is None or self.hub is None:
+            return
+        self.controller.remove_move_listener(self.hub.on_moves)
+
+        async def close() -> None:
+            self.server.close()  # type: ignore
+            for writers in list(self.hub.subscribers.values()):  # type: ignore
+                for writer in writers:
+                    writer.close()
+            await self.server.wait_closed()  # type: ignore
+            self.loop.stop()  # type: ignore
+
+        asyncio.run_coroutine_threadsafe(close(), self.loop)
+
+    async def __handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        game_id = None
+        try:
+            channel = await self.__handshake(reader, writer)
+            if channel is None:
+                return
+            game_id, player_id = channel
+            self.hub.subscribe(game_id, writer)  # type: ignore
+            # subscribed before the version is taken, so no move is lost between them
+            version = await self.loop.run_in_executor(None, self.controller.get_version, game_id)  # type: ignore
+            writer.write(encode_message({'version': version, 'moves': []}))
+            while True:
+                opcode, payload = await read_frame(reader, self.max_message_size)
+                if opcode == OPCODE_CLOSE:
+                    writer.write(encode_frame(OPCODE_CLOSE, payload[:CLOSE_CODE.size]))
+                    break
+                if opcode == OPCODE_PING:
+                    writer.write(encode_frame(OPCODE_PONG, payload))
+                elif opcode == OPCODE_TEXT:
+                    await self.__make_move(writer, game_id, player_id, payload)
+        except ValueError as error:
+            log.debug('WebSocket client broke the protocol: %s', error)
+            writer.write(encode_frame(OPCODE_CLOSE, CLOSE_CODE.pack(CLOSE_PROTOCOL_ERROR)))
+        except GameNotFoundException:
+            log.debug('Game %s is removed, the channel is closed', game_id)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            pass
+        finally:
+            if game_id is not None:
+                self.hub.unsubscribe(game_id, writer)  # type: ignore
+            writer.close()
+
+    async def __handshake(self, reader: asyncio.StreamReader,
+                          writer: asyncio.StreamWriter) -> tuple[str, str | None] | None:
+        """Upgrade the HTTP connection, return the game id and the player id of the channel."""
+        lines = (await reader.readuntil(b'\r\n\r\n')).decode('latin-1').split('\r\n')
+        method, _, target = lines[0].partition(' ')
+        target = target.rpartition(' ')[0]
+        headers = {name.strip().lower(): value.strip()
+                   for name, _, value in (line.partition(':') for line in lines[1:] if line)}
+        url = urlsplit(target)
+        match = PATH_PATTERN.fullmatch(url.path)
+        key = headers.get('sec-websocket-key')
+        if method != 'GET' or match is None or not key or headers.get('upgrade', '').lower() != 'websocket':
+            writer.write(b'HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\nConnection: close\r\n\r\n')
+            return None
+        game_id = unquote(match.group(1))
+        try:
+            await self.loop.run_in_executor(None, self.controller.get_version, game_id)  # type: ignore
+        except GameNotFoundException:
+            writer.write(b'HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n')
+            return None
+        writer.write(b'HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n'
+                     b'Sec-WebSocket-Accept: ' + get_accept_key(key).encode('ascii') + b'\r\n\r\n')
+        player_id = parse_qs(url.query).get('player_id', [None])[0]
+        return game_id, player_id
+
+    async def __make_move(self, writer: asyncio.StreamWriter, game_id: str, player_id: str | None,
+                          payload: bytes) -> None:
+        """Make the move of the client, the result is sent to all subscribers by the move listener."""
+        try:
+            message = json.loads(payload)
+            row, column = message['row'], message['column']
+            if any(not isinstance(value, int) or isinstance(value, bool) or value < 0 for value in (row, column)):
+                raise ValueError('row and column should be non-negative integers')
+            if player_id is None:
+                raise ValueError('player_id is required to make moves')
+            await self.loop.run_in_executor(None, self.controller.make_move,  # type: ignore
+                                            game_id, player_id, row, column)
+        except GameNotFoundException:
+            raise
+        except Exception as error:  # pylint: disable=broad-except
+            writer.write(encode_message({'error': type(error).__name__, 'message': str(error)}))
@@ -93,3 +93,42 @@ class PlayerNotFoundException(Exception):
     def __init__(self, *args: object) -> None:
         """Initialize Exception."""
         Exception.__init__(self, *args)
+
+
+class NoAvailableMovesException(Exception):
+    """
+    Raised when AI is asked to make a move but there is no empty cell or the game is finished.
+
+    Args:
+        Exception (_type_): NoAvailableMovesException
+    """
+
+    def __init__(self, *args: object) -> None:
+        """Initialize Exception."""
+        Exception.__init__(self, *args)
+
+
+class StorageIsFullException(Exception):
+    """
+    Raised when there is no free place to save the game.
+
+    Args:
+        Exception (_type_): StorageIsFullException
+    """
+
+    def __init__(self, *args: object) -> None:
+        """Initialize Exception."""
+        Exception.__init__(self, *args)
+
+
+class GameVersionConflictException(Exception):
+    """
+    Raised when the game was changed by other node since it was read, the change is not saved.
+
+    Args:
+        Exception (_type_): GameVersionConflictException
+    """
+
+    def __init__(self, *args: object) -> None:
+        """Initialize Exception."""
+        Exception.__init__(self, *args)
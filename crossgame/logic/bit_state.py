@@ -0,0 +1,176 @@
+"""
+Represent Tic-Tac-Toe Game State backed by bitboards.
+
+Each Sign has its own integer bitmask where the bit with index ``x * height + y``
+is set when the cell x:y contains that Sign. Win detection compares the bitmask of
+the Sign with the precomputed masks of all rows, columns and diagonals.
+
+Raises:
+    IncorrectFieldSize: can be raised if class initialized with incorrect params
+    CellIsAlreadyBusy: can be raised if will be a try to put value in the cell that already has a value
+"""
+import logging as log
+from functools import lru_cache
+
+from crossgame.exceptions.game_exceptions import (CellIsAlreadyBusyException,
+                                                  IncorrectFieldSizeException)
+from crossgame.logic.empty_cells import EmptyCellIndex
+from crossgame.logic.game_enums import GameStatus, Sign
+from crossgame.logic.state import GameState, State
+
+
+@lru_cache(maxsize=None)
+def get_line_masks(size: int) -> tuple[int, ...]:
+    """
+    Build bitmasks of all winning lines for the square field.
+
+    Args:
+        size (int): width (and height) of the field
+
+    Returns:
+        tuple: masks for each row, column and both diagonals
+    """
+    masks: list[int] = []
+    for i in range(size):
+        masks.append(sum(1 << (i * size + j) for j in range(size)))
+        masks.append(sum(1 << (j * size + i) for j in range(size)))
+    masks.append(sum(1 << (i * size + i) for i in range(size)))
+    masks.append(sum(1 << (i * size + size - i - 1) for i in range(size)))
+    return tuple(masks)
+
+
+class BitboardGameState:
+    """Represent state of the game as one bitmask per Sign."""
+
+    def __init__(self, width: int = 3, height: int = 3) -> None:
+        """
+        Initialize games state.
+
+        Args:
+            width (int, optional): Defaults to 3.
+            height (int, optional): Defaults to 3.
+
+        Raises:
+            IncorrectFieldSizeException: raised if field is not an odd square of size 3 or more
+        """
+        if width != height or width % 2 == 0 or width < 3 or height < 3:
+            raise IncorrectFieldSizeException(
+                'Field width and height should be equal')
+        self.width = width
+        self.height = height
+        self.win_length = width
+        self.line_masks = get_line_masks(width)
+        self.boards: dict[Sign, int] = {sign: 0 for sign in Sign}
+        self.empty_cells = width * height
+        self.free_cells = EmptyCellIndex((x, y) for x in range(width) for y in range(height))
+
+    @property
+    def field(self) -> list[list[Sign]]:
+        """Return field as a matrix, the same view as GameState.field."""
+        return [[self.__get_cell(x, y) for y in range(self.height)] for x in range(self.width)]
+
+    @field.setter
+    def field(self, field: list[list[Sign]]) -> None:
+        """Load bitmasks from the matrix."""
+        self.boards = {sign: 0 for sign in Sign}
+        self.empty_cells = self.width * self.height
+        self.free_cells = EmptyCellIndex()
+        for x, row in enumerate(field):
+            for y, sign in enumerate(row):
+                if sign is not None:
+                    self.boards[sign] |= 1 << self.__get_index(x, y)
+                    self.empty_cells -= 1
+                else:
+                    self.free_cells.add((x, y))
+
+    def get_game_state(self) -> list[list[Sign]]:
+        """
+        Retrieve and returns Game State.
+
+        Returns:
+            list: field with values
+        """
+        game_state = self.field
+        log.debug('Game state: %s', GameState.make_pritty_array_str(game_state))
+        return game_state
+
+    def make_move(self, x_coordinate: int, y_coordinate: int, sign: Sign) -> None:
+        """
+        Put a Sign (X or O) to the field with its coordinates x and y.
+
+        Args:
+            x_coordinate (int): row of the field
+            y_coordinate (int): column of the field
+            sign (Sign): Move Sign (X or O)
+
+        Raises:
+            CellIsAlreadyBusy: Raises exception if there is a try to put value in the cell that already has a value
+        """
+        if self.is_cell_empty(x_coordinate, y_coordinate):
+            log.debug('Cell %s:%s will be set to %s',
+                      x_coordinate, y_coordinate, sign)
+            self.boards[sign] |= 1 << self.__get_index(x_coordinate, y_coordinate)
+            self.empty_cells -= 1
+            self.free_cells.remove((x_coordinate, y_coordinate))
+        else:
+            raise CellIsAlreadyBusyException(
+                f'Cell {x_coordinate}:{y_coordinate} already has a value')
+
+    def is_cell_empty(self, x: int, y: int) -> bool:
+        """
+        Check if the sell does have a value or not.
+
+        Args:
+            x (int): row of the field
+            y (int): column of the field
+
+        Returns:
+            bool: if cell is empty will be returned True, if not - False
+        """
+        bit = 1 << self.__get_index(x, y)
+        res = not any(board & bit for board in self.boards.values())
+        log.debug('Cell %s:%s has value = %s', x, y, res)
+        return res
+
+    def game_is_finished(self) -> State:
+        """
+        Check if the game was finished or it is still alive.
+
+        Returns:
+            State: status of the game and the winner sign if it exists
+        """
+        for sign, board in self.boards.items():
+            for mask in self.line_masks:
+                if board & mask == mask:
+                    log.debug('Check Result, is_finished = True, checked_symbol=%s', sign)
+                    return State(GameStatus.FINISHED, sign)
+        if self.empty_cells == 0:
+            return State(GameStatus.DRAW, None)
+        return State(GameStatus.IN_PROGRESS, None)
+
+    def is_winning_move(self, x: int, y: int, sign: Sign) -> bool:
+        """
+        Check if the sign put to the empty cell x:y fills a whole line.
+
+        Args:
+            x (int): row of the field
+            y (int): column of the field
+            sign (Sign): sign to check
+
+        Returns:
+            bool: True if the move wins the game
+        """
+        board = self.boards[sign] | 1 << self.__get_index(x, y)
+        return any(board & mask == mask for mask in self.line_masks)
+
+    def __get_index(self, x: int, y: int) -> int:
+        if not 0 <= x < self.width or not 0 <= y < self.height:
+            raise IndexError(f'Cell {x}:{y} is out of the field')
+        return x * self.height + y
+
+    def __get_cell(self, x: int, y: int) -> Sign | None:
+        bit = 1 << self.__get_index(x, y)
+        for sign, board in self.boards.items():
+            if board & bit:
+                return sign
+        return None
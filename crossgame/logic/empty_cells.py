@@ -0,0 +1,60 @@
+"""Contains index of the empty cells of the field."""
+import random
+from typing import Iterable, Iterator
+
+
+class EmptyCellIndex:
+    """Set of empty cells with O(1) add, remove and random choice."""
+
+    def __init__(self, cells: Iterable[tuple[int, int]] = ()) -> None:
+        """
+        Initialize index.
+
+        Args:
+            cells (Iterable[tuple[int, int]], optional): empty cells (row, column). Defaults to ().
+        """
+        self.positions: dict[tuple[int, int], int] = {cell: 0 for cell in cells}
+        self.cells: list[tuple[int, int]] = list(self.positions)
+        for position, cell in enumerate(self.cells):
+            self.positions[cell] = position
+
+    def __len__(self) -> int:
+        """Return number of empty cells."""
+        return len(self.cells)
+
+    def __contains__(self, cell: object) -> bool:
+        """Check if the cell is empty."""
+        return cell in self.positions
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        """Iterate over empty cells (in no particular order)."""
+        return iter(list(self.cells))
+
+    def add(self, cell: tuple[int, int]) -> None:
+        """Mark the cell as empty."""
+        if cell not in self.positions:
+            self.positions[cell] = len(self.cells)
+            self.cells.append(cell)
+
+    def remove(self, cell: tuple[int, int]) -> None:
+        """Mark the cell as occupied, the last cell takes its place in the list."""
+        position = self.positions.pop(cell)
+        last = self.cells.pop()
+        if position < len(self.cells):
+            self.cells[position] = last
+            self.positions[last] = position
+
+    def random_cell(self, rnd: random.Random) -> tuple[int, int]:
+        """
+        Return random empty cell.
+
+        Args:
+            rnd (random.Random): source of random numbers
+
+        Raises:
+            IndexError: raised if there is no empty cell
+
+        Returns:
+            tuple[int, int]: row and column of the cell
+        """
+        return self.cells[rnd.randrange(len(self.cells))]
@@ -12,12 +12,16 @@ Represent the main logic of the game (game handler).
 """
 
 from dataclasses import dataclass
+from functools import partial
+from typing import Callable, NamedTuple
 
 from crossgame.api.player import Player
 from crossgame.exceptions.game_exceptions import (
     CurrentPlayerCantMakeAmoveException, GameIdException,
     NumberOfPlayersException, PlayerNotFoundException)
 from crossgame.logic.game_enums import GameStatus, Sign
+from crossgame.logic.k_in_a_row_state import KInARowGameState
+from crossgame.logic.sparse_state import SparseGameState, Viewport
 from crossgame.logic.state import GameState
 
 
@@ -30,6 +34,14 @@ class WinnerInfo:
     is_draw: bool = False
 
 
+class Move(NamedTuple):
+    """Move made in the game, player_index is the index of the player in the list of players."""
+
+    player_index: int
+    row: int
+    column: int
+
+
 @dataclass
 class GameStateDto:
     """Represent current game status."""
@@ -44,7 +56,8 @@ class GameStateDto:
 class TicTacToeGame:
     """Base Tic-Tac-Toe game class."""
 
-    def __init__(self, game_id: str, players: list[Player], row: int = 3, column: int = 3) -> None:
+    def __init__(self, game_id: str, players: list[Player], row: int = 3, column: int = 3,
+                 state_type: Callable[[int, int], GameState] = GameState) -> None:
         """
         Create an instance of TicTacToeGame.
 
@@ -53,6 +66,8 @@ class TicTacToeGame:
             players (list[Player]): list of players
             row (int, optional): number of rows. Defaults to 3.
             column (int, optional): number of columns. Defaults to 3.
+            state_type (Callable, optional): factory of the game state (GameState, BitboardGameState).
+                                             Defaults to GameState.
 
         Raises:
             GameIdException: raised if no game_id is passed
@@ -64,7 +79,10 @@ class TicTacToeGame:
             raise NumberOfPlayersException('Number of players should be 2')
         self.game_id = str(game_id)
         self.players = players
-        self.game_state = GameState(row, column)
+        self.rows = row
+        self.columns = column
+        self.moves: list[Move] = []
+        self.game_state = state_type(row, column)
         self.game_status = GameStatus.IN_PROGRESS
         self.winner = None
 
@@ -88,6 +106,7 @@ class TicTacToeGame:
         current_player: Player = self.__get_player_by_id(player_id)
         if current_player.is_active:
             self.game_state.make_move(row, column, current_player.sign)
+            self.moves.append(Move(self.players.index(current_player), row, column))
             current_player.is_active = False
             next_player: Player = self.__get_other_player(player_id)
             next_player.is_active = True
@@ -162,3 +181,49 @@ class TicTacToeGameClassic(TicTacToeGame):
             players (list[Player]): List of the Players
         """
         TicTacToeGame.__init__(self, game_id, players, 3, 3)
+
+
+class TicTacToeGameKInARow(TicTacToeGame):
+    """Tic-Tac-Toe game on the rectangular field where win_length signs in a row win (Gomoku-style)."""
+
+    def __init__(self, game_id: str, players: list[Player], row: int = 15, column: int = 15,
+                 win_length: int = 5) -> None:
+        """
+        Init k-in-a-row game implementation.
+
+        Args:
+            game_id (str): Unique Game ID
+            players (list[Player]): List of the Players
+            row (int, optional): number of rows. Defaults to 15.
+            column (int, optional): number of columns. Defaults to 15.
+            win_length (int, optional): number of signs in a row to win. Defaults to 5.
+        """
+        TicTacToeGame.__init__(self, game_id, players, row, column,
+                               partial(KInARowGameState, win_length=win_length))
+
+
+class TicTacToeGameInfinite(TicTacToeGame):
+    """Tic-Tac-Toe game on the unbounded field where win_length signs in a row win."""
+
+    def __init__(self, game_id: str, players: list[Player], win_length: int = 5) -> None:
+        """
+        Init infinite game implementation.
+
+        Args:
+            game_id (str): Unique Game ID
+            players (list[Player]): List of the Players
+            win_length (int, optional): number of signs in a row to win. Defaults to 5.
+        """
+        TicTacToeGame.__init__(self, game_id, players, 0, 0, lambda _row, _column: SparseGameState(win_length))
+
+    def get_field_view(self, viewport: Viewport) -> list[list[Sign]]:
+        """
+        Return dense view of the part of the field.
+
+        Args:
+            viewport (Viewport): part of the field (top-left cell and size)
+
+        Returns:
+            list: field with values, field[0][0] is the top-left cell of the viewport
+        """
+        return self.game_state.get_game_state(viewport)
@@ -0,0 +1,169 @@
+"""
+Represent Game State with configurable k-in-a-row rules (Gomoku-style).
+
+The field can be rectangular and the win length doesn't depend on the field size.
+Win detection checks only four directions through the last move, so its cost
+depends on the win length, not on the size of the field.
+
+Raises:
+    IncorrectFieldSize: can be raised if class initialized with incorrect params
+    CellIsAlreadyBusy: can be raised if will be a try to put value in the cell that already has a value
+"""
+import logging as log
+
+from crossgame.exceptions.game_exceptions import (CellIsAlreadyBusyException,
+                                                  IncorrectFieldSizeException)
+from crossgame.logic.empty_cells import EmptyCellIndex
+from crossgame.logic.game_enums import GameStatus, Sign
+from crossgame.logic.state import GameState, State
+
+DIRECTIONS: tuple[tuple[int, int], ...] = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+
+class KInARowGameState:
+    """Represent state of the game where win_length signs in a row win."""
+
+    def __init__(self, width: int = 15, height: int = 15, win_length: int = 5) -> None:
+        """
+        Initialize games state.
+
+        Args:
+            width (int, optional): number of rows. Defaults to 15.
+            height (int, optional): number of columns. Defaults to 15.
+            win_length (int, optional): number of signs in a row to win. Defaults to 5.
+
+        Raises:
+            IncorrectFieldSizeException: raised if the field is smaller than 3x3 or the line doesn't fit the field
+        """
+        if width < 3 or height < 3 or win_length < 3 or win_length > max(width, height):
+            raise IncorrectFieldSizeException(
+                f'Field {width}x{height} can not be used with win length {win_length}')
+        self.width = width
+        self.height = height
+        self.win_length = win_length
+        self.field = [[None for _ in range(height)] for _ in range(width)]
+        log.info('Game Field %sx%s was generated, win length %s', width, height, win_length)
+
+    @property
+    def field(self) -> list[list[Sign]]:
+        """Return the game field (matrix)."""
+        return self._field
+
+    @field.setter
+    def field(self, field: list[list[Sign]]) -> None:
+        """
+        Replace the game field and recalculate the game result.
+
+        Args:
+            field (list): matrix with values
+        """
+        self._field = field
+        self.empty_cells = self.width * self.height
+        self.free_cells = EmptyCellIndex((x, y) for x, row in enumerate(field) for y, sign in enumerate(row)
+                                         if sign is None)
+        self.last_move: tuple[int, int] | None = None
+        self.state = State(GameStatus.IN_PROGRESS, None)
+        for x, row in enumerate(field):
+            for y, sign in enumerate(row):
+                if sign is not None:
+                    self.__update_state(x, y, sign)
+
+    def get_game_state(self) -> list[list[Sign]]:
+        """
+        Retrieve and returns Game State.
+
+        Returns:
+            list: field with values
+        """
+        game_state = [item for item in self.field]
+        log.debug('Game state: %s', GameState.make_pritty_array_str(game_state))
+        return game_state
+
+    def make_move(self, x_coordinate: int, y_coordinate: int, sign: Sign) -> None:
+        """
+        Put a Sign (X or O) to the field with its coordinates x and y.
+
+        Args:
+            x_coordinate (int): row of the field
+            y_coordinate (int): column of the field
+            sign (Sign): Move Sign (X or O)
+
+        Raises:
+            CellIsAlreadyBusy: Raises exception if there is a try to put value in the cell that already has a value
+            IndexError: Raises exception if the cell is out of the field
+        """
+        if not 0 <= x_coordinate < self.width or not 0 <= y_coordinate < self.height:
+            raise IndexError(f'Cell {x_coordinate}:{y_coordinate} is out of the field')
+        if self.is_cell_empty(x_coordinate, y_coordinate):
+            log.debug('Cell %s:%s will be set to %s',
+                      x_coordinate, y_coordinate, sign)
+            self.free_cells.remove((x_coordinate, y_coordinate))
+            self.field[x_coordinate][y_coordinate] = sign
+            self.__update_state(x_coordinate, y_coordinate, sign)
+        else:
+            raise CellIsAlreadyBusyException(
+                f'Cell {x_coordinate}:{y_coordinate} already has a value')
+
+    def is_cell_empty(self, x: int, y: int) -> bool:
+        """
+        Check if the sell does have a value or not.
+
+        Args:
+            x (int): row of the field
+            y (int): column of the field
+
+        Returns:
+            bool: if cell is empty will be returned True, if not - False
+        """
+        res = not self.field[x][y]
+        log.debug('Cell %s:%s has value = %s', x, y, res)
+        return res
+
+    def game_is_finished(self) -> State:
+        """
+        Check if the game was finished or it is still alive.
+
+        Returns:
+            State: status of the game and the winner sign if it exists
+        """
+        return self.state
+
+    def is_winning_move(self, x: int, y: int, sign: Sign) -> bool:
+        """
+        Check if the sign in the cell x:y is a part of win_length signs in a row.
+
+        Only the cells closer than win_length to x:y are checked.
+
+        Args:
+            x (int): row of the field
+            y (int): column of the field
+            sign (Sign): sign that is (or would be) placed in the cell
+
+        Returns:
+            bool: True if the line is completed
+        """
+        for dx, dy in DIRECTIONS:
+            count = 1 + self.__count_signs(x, y, dx, dy, sign) + self.__count_signs(x, y, -dx, -dy, sign)
+            if count >= self.win_length:
+                return True
+        return False
+
+    def __count_signs(self, x: int, y: int, dx: int, dy: int, sign: Sign) -> int:
+        count = 0
+        for _ in range(self.win_length - 1):
+            x += dx
+            y += dy
+            if not (0 <= x < self.width and 0 <= y < self.height) or self.field[x][y] != sign:
+                break
+            count += 1
+        return count
+
+    def __update_state(self, x: int, y: int, sign: Sign) -> None:
+        self.empty_cells -= 1
+        self.last_move = (x, y)
+        if self.state.status == GameStatus.FINISHED:
+            return
+        if self.is_winning_move(x, y, sign):
+            self.state = State(GameStatus.FINISHED, sign)
+        elif self.empty_cells == 0:
+            self.state = State(GameStatus.DRAW, None)
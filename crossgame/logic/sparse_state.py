@@ -0,0 +1,176 @@
+"""
+Represent Game State on the unbounded (infinite) field.
+
+Only occupied cells are stored (dict keyed by coordinates), so the memory
+depends on the number of moves, not on the size of the field. The bounding box
+of the occupied cells is tracked to build dense views of the field. The default view
+is limited to MAX_VIEW_SIZE rows and columns around the last move, so the moves
+far away from each other don't make the view huge.
+
+Raises:
+    IncorrectFieldSize: can be raised if class initialized with incorrect params
+    CellIsAlreadyBusy: can be raised if will be a try to put value in the cell that already has a value
+"""
+import logging as log
+from dataclasses import dataclass
+
+from crossgame.exceptions.game_exceptions import (CellIsAlreadyBusyException,
+                                                  IncorrectFieldSizeException)
+from crossgame.logic.game_enums import GameStatus, Sign
+from crossgame.logic.k_in_a_row_state import DIRECTIONS
+from crossgame.logic.state import State
+
+MAX_COORDINATE: int = 2 ** 31 - 1
+MAX_VIEW_SIZE: int = 64
+
+
+@dataclass
+class Viewport:
+    """Rectangular part of the field, top-left corner and size."""
+
+    row: int
+    column: int
+    rows: int
+    columns: int
+
+
+class SparseGameState:
+    """Represent state of the game on the unbounded field where win_length signs in a row win."""
+
+    def __init__(self, win_length: int = 5) -> None:
+        """
+        Initialize games state.
+
+        Args:
+            win_length (int, optional): number of signs in a row to win. Defaults to 5.
+
+        Raises:
+            IncorrectFieldSizeException: raised if win_length is less than 3
+        """
+        if win_length < 3:
+            raise IncorrectFieldSizeException('Win length should be 3 or more')
+        self.win_length = win_length
+        self.cells: dict[tuple[int, int], Sign] = {}
+        self.bounding_box: Viewport | None = None
+        self.last_move: tuple[int, int] | None = None
+        self.state = State(GameStatus.IN_PROGRESS, None)
+
+    def get_game_state(self, viewport: Viewport = None) -> list[list[Sign]]:
+        """
+        Build dense view of the part of the field.
+
+        Args:
+            viewport (Viewport, optional): part of the field to return.
+                                           Defaults to None - see get_default_viewport.
+
+        Returns:
+            list: field with values, field[0][0] is the top-left cell of the viewport
+        """
+        if viewport is None:
+            viewport = self.get_default_viewport()
+        if viewport is None:
+            return []
+        return [[self.cells.get((x, y)) for y in range(viewport.column, viewport.column + viewport.columns)]
+                for x in range(viewport.row, viewport.row + viewport.rows)]
+
+    def get_default_viewport(self) -> Viewport | None:
+        """
+        Return the bounding box of the occupied cells limited to MAX_VIEW_SIZE rows and columns around the last move.
+
+        Returns:
+            Viewport | None: part of the field, None if the field is empty
+        """
+        box = self.bounding_box
+        if box is None or self.last_move is None:
+            return box
+        row, rows = self.__limit(box.row, box.rows, self.last_move[0])
+        column, columns = self.__limit(box.column, box.columns, self.last_move[1])
+        return Viewport(row, column, rows, columns)
+
+    def make_move(self, x_coordinate: int, y_coordinate: int, sign: Sign) -> None:
+        """
+        Put a Sign (X or O) to the field with its coordinates x and y.
+
+        Args:
+            x_coordinate (int): row of the field, can be negative
+            y_coordinate (int): column of the field, can be negative
+            sign (Sign): Move Sign (X or O)
+
+        Raises:
+            CellIsAlreadyBusy: Raises exception if there is a try to put value in the cell that already has a value
+        """
+        if abs(x_coordinate) > MAX_COORDINATE or abs(y_coordinate) > MAX_COORDINATE:
+            raise IndexError(f'Cell {x_coordinate}:{y_coordinate} is out of the field')
+        if not self.is_cell_empty(x_coordinate, y_coordinate):
+            raise CellIsAlreadyBusyException(
+                f'Cell {x_coordinate}:{y_coordinate} already has a value')
+        log.debug('Cell %s:%s will be set to %s', x_coordinate, y_coordinate, sign)
+        self.cells[(x_coordinate, y_coordinate)] = sign
+        self.last_move = (x_coordinate, y_coordinate)
+        self.__extend_bounding_box(x_coordinate, y_coordinate)
+        if self.state.status != GameStatus.FINISHED and self.is_winning_move(x_coordinate, y_coordinate, sign):
+            self.state = State(GameStatus.FINISHED, sign)
+
+    def is_cell_empty(self, x: int, y: int) -> bool:
+        """
+        Check if the sell does have a value or not.
+
+        Args:
+            x (int): row of the field
+            y (int): column of the field
+
+        Returns:
+            bool: if cell is empty will be returned True, if not - False
+        """
+        return (x, y) not in self.cells
+
+    def game_is_finished(self) -> State:
+        """
+        Check if the game was finished or it is still alive (the unbounded game never ends with a draw).
+
+        Returns:
+            State: status of the game and the winner sign if it exists
+        """
+        return self.state
+
+    def is_winning_move(self, x: int, y: int, sign: Sign) -> bool:
+        """
+        Check if the sign in the cell x:y is a part of win_length signs in a row.
+
+        Args:
+            x (int): row of the field
+            y (int): column of the field
+            sign (Sign): sign that is (or would be) placed in the cell
+
+        Returns:
+            bool: True if the line is completed
+        """
+        for dx, dy in DIRECTIONS:
+            count = 1
+            for direction in (1, -1):
+                for step in range(1, self.win_length):
+                    if self.cells.get((x + dx * step * direction, y + dy * step * direction)) != sign:
+                        break
+                    count += 1
+            if count >= self.win_length:
+                return True
+        return False
+
+    @staticmethod
+    def __limit(start: int, size: int, center: int) -> tuple[int, int]:
+        """Return start and size of the range of at most MAX_VIEW_SIZE cells around the center within the box."""
+        if size <= MAX_VIEW_SIZE:
+            return start, size
+        limited_start = min(max(center - MAX_VIEW_SIZE // 2, start), start + size - MAX_VIEW_SIZE)
+        return limited_start, MAX_VIEW_SIZE
+
+    def __extend_bounding_box(self, x: int, y: int) -> None:
+        box = self.bounding_box
+        if box is None:
+            self.bounding_box = Viewport(x, y, 1, 1)
+            return
+        top = min(box.row, x)
+        left = min(box.column, y)
+        bottom = max(box.row + box.rows - 1, x)
+        right = max(box.column + box.columns - 1, y)
+        self.bounding_box = Viewport(top, left, bottom - top + 1, right - left + 1)
@@ -10,6 +10,7 @@ from dataclasses import dataclass
 
 from crossgame.exceptions.game_exceptions import (CellIsAlreadyBusyException,
                                                   IncorrectFieldSizeException)
+from crossgame.logic.empty_cells import EmptyCellIndex
 from crossgame.logic.game_enums import GameStatus, Sign
 
 
@@ -45,6 +46,39 @@ class GameState:
         log.info('Game Field was generated: %s',
                  GameState.make_pritty_array_str(self.field))
 
+    @property
+    def field(self) -> list[list[Sign]]:
+        """Return the game field (matrix)."""
+        return self._field
+
+    @field.setter
+    def field(self, field: list[list[Sign]]) -> None:
+        """
+        Replace the game field and rebuild line counters from it.
+
+        Args:
+            field (list): [[],[],[]] matrix with values
+        """
+        self._field = field
+        size = len(field)
+        self.row_counts: dict[Sign, list[int]] = {sign: [0] * size for sign in Sign}
+        self.column_counts: dict[Sign, list[int]] = {sign: [0] * size for sign in Sign}
+        self.diagonal_counts: dict[Sign, int] = {sign: 0 for sign in Sign}
+        self.anti_diagonal_counts: dict[Sign, int] = {sign: 0 for sign in Sign}
+        self.empty_cells = size * size
+        self.free_cells = EmptyCellIndex((x, y) for x, row in enumerate(field) for y, sign in enumerate(row)
+                                         if sign is None)
+        self.state = State(GameStatus.IN_PROGRESS, None)
+        for x, row in enumerate(field):
+            for y, sign in enumerate(row):
+                if sign is not None:
+                    self.__count_move(x, y, sign)
+
+    @property
+    def win_length(self) -> int:
+        """Return number of signs in a row required to win (the whole row, column or diagonal)."""
+        return len(self._field)
+
     def get_game_state(self) -> list[list[Sign]]:
         """
         Retrieve and returns Game State.
@@ -67,11 +101,16 @@ class GameState:
 
         Raises:
             CellIsAlreadyBusy: Raises exception if there is a try to put value in the cell that already has a value
+            IndexError: Raises exception if the cell is out of the field
         """
+        if not 0 <= x_coordinate < len(self.field) or not 0 <= y_coordinate < len(self.field):
+            raise IndexError(f'Cell {x_coordinate}:{y_coordinate} is out of the field')
         if self.is_cell_empty(x_coordinate, y_coordinate):
             log.debug('Cell %s:%s will be set to %s',
                       x_coordinate, y_coordinate, sign)
+            self.free_cells.remove((x_coordinate, y_coordinate))
             self.field[x_coordinate][y_coordinate] = sign
+            self.__count_move(x_coordinate, y_coordinate, sign)
         else:
             raise CellIsAlreadyBusyException(
                 f'Cell {x_coordinate}:{y_coordinate} already has a value')
@@ -95,34 +134,51 @@ class GameState:
         """
         Check if the game was finished or it is still alive.
 
+        The result is maintained by make_move, so the call doesn't scan the field.
+
         Returns:
-            tuple: (Bool, Sign)
-        """
-        arrays_to_check = [arr for arr in self.field]
-        arrays_to_check.append([self.field[i][i]
-                                for i in range(len(self.field))])
-        arrays_to_check.append([self.field[i][len(self.field) - i - 1]
-                                for i in range(len(self.field))])
-        for i in range(len(self.field)):
-            arr_to_append = []
-            for j in range(len(self.field)):
-                arr_to_append.append(self.field[j][i])
-            arrays_to_check.append(arr_to_append)
-
-        log.debug('Lines to be checked: %s', arrays_to_check)
-        for arr in arrays_to_check:
-            check_res = GameState.check_line(arr)
-            is_all_eq, first_sign = check_res
-            if is_all_eq:
-                log.debug('Check Result, is_finished = %s, checked_symbol=%s',
-                          is_all_eq, first_sign)
-                return State(GameStatus.FINISHED, first_sign)
-        game_status = GameStatus.DRAW
-        for row in self.field:
-            for col in row:
-                if col is None:
-                    game_status = GameStatus.IN_PROGRESS
-        return State(game_status, None)
+            State: status of the game and the winner sign if it exists
+        """
+        log.debug('Check Result, status = %s, checked_symbol=%s',
+                  self.state.status, self.state.sign)
+        return self.state
+
+    def is_winning_move(self, x: int, y: int, sign: Sign) -> bool:
+        """
+        Check if the sign put to the empty cell x:y fills a whole line.
+
+        Args:
+            x (int): row of the field
+            y (int): column of the field
+            sign (Sign): sign to check
+
+        Returns:
+            bool: True if the move wins the game
+        """
+        size = len(self._field) - 1
+        return (self.row_counts[sign][x] == size or self.column_counts[sign][y] == size
+                or (x == y and self.diagonal_counts[sign] == size)
+                or (x + y == size and self.anti_diagonal_counts[sign] == size))
+
+    def __count_move(self, x: int, y: int, sign: Sign) -> None:
+        """Update counters of the lines that go through the cell x:y and the cached State."""
+        size = len(self._field)
+        self.empty_cells -= 1
+        self.row_counts[sign][x] += 1
+        self.column_counts[sign][y] += 1
+        is_line_filled = self.row_counts[sign][x] == size or self.column_counts[sign][y] == size
+        if x == y:
+            self.diagonal_counts[sign] += 1
+            is_line_filled = is_line_filled or self.diagonal_counts[sign] == size
+        if x + y == size - 1:
+            self.anti_diagonal_counts[sign] += 1
+            is_line_filled = is_line_filled or self.anti_diagonal_counts[sign] == size
+        if self.state.status == GameStatus.FINISHED:
+            return
+        if is_line_filled:
+            self.state = State(GameStatus.FINISHED, sign)
+        elif self.empty_cells == 0:
+            self.state = State(GameStatus.DRAW, None)
 
     @staticmethod
     def check_line(line: list[Sign]) -> tuple[bool, Sign]:
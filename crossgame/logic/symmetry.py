@@ -0,0 +1,154 @@
+"""
+Contains functions to reduce positions by the symmetries of the field.
+
+Rotations and reflections of the field don't change the value of the position,
+so AI search tables, opening books and caches can keep only one (canonical)
+position for all its symmetric copies. Transform numbers 0..3 are rotations
+by 90 degrees clockwise, 4..7 are the same rotations applied after the transposition.
+A square field has all 8 transforms, a rectangular field has 4 of them.
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+
+from crossgame.logic.game_enums import Sign
+
+IDENTITY: int = 0
+TRANSFORMS_NUMBER: int = 8
+
+
+@dataclass(frozen=True)
+class CanonicalPosition:
+    """Canonical key of the position and the transform that maps the position to it."""
+
+    key: tuple[int, ...]
+    transform: int
+
+
+def transform_cell(x: int, y: int, width: int, height: int, transform: int) -> tuple[int, int]:
+    """
+    Apply transform to the cell coordinates.
+
+    Args:
+        x (int): row of the cell
+        y (int): column of the cell
+        width (int): number of rows
+        height (int): number of columns
+        transform (int): transform number (0..7)
+
+    Returns:
+        tuple[int, int]: row and column of the cell on the transformed field
+    """
+    if transform >= 4:
+        x, y = y, x
+        width, height = height, width
+    for _ in range(transform % 4):
+        x, y = y, width - 1 - x
+        width, height = height, width
+    return x, y
+
+
+@lru_cache(maxsize=None)
+def get_transforms(width: int, height: int) -> tuple[int, ...]:
+    """
+    Return transforms that map the field to itself.
+
+    Args:
+        width (int): number of rows
+        height (int): number of columns
+
+    Returns:
+        tuple: transform numbers, all 8 for the square field and 4 for the rectangular one
+    """
+    if width == height:
+        return tuple(range(TRANSFORMS_NUMBER))
+    return tuple(t for t in range(TRANSFORMS_NUMBER) if (t % 4 + t // 4) % 2 == 0)
+
+
+@lru_cache(maxsize=None)
+def get_cell_permutations(width: int, height: int) -> dict[int, tuple[int, ...]]:
+    """
+    Build flat index permutations for all the transforms of the field.
+
+    Args:
+        width (int): number of rows
+        height (int): number of columns
+
+    Returns:
+        dict: transform -> tuple where item with flat index i is the transformed flat index of i
+    """
+    permutations = {}
+    for transform in get_transforms(width, height):
+        permutation = []
+        for index in range(width * height):
+            x, y = transform_cell(index // height, index % height, width, height, transform)
+            permutation.append(x * height + y)
+        permutations[transform] = tuple(permutation)
+    return permutations
+
+
+@lru_cache(maxsize=None)
+def get_inverse_transform(width: int, height: int, transform: int) -> int:
+    """
+    Find the transform that reverts the passed one.
+
+    Args:
+        width (int): number of rows
+        height (int): number of columns
+        transform (int): transform number
+
+    Returns:
+        int: inverse transform number
+    """
+    permutations = get_cell_permutations(width, height)
+    permutation = permutations[transform]
+    for candidate, candidate_permutation in permutations.items():
+        if all(candidate_permutation[permutation[i]] == i for i in range(width * height)):
+            return candidate
+    raise ValueError(f'Transform {transform} has no inverse for the field {width}x{height}')
+
+
+def canonicalize_cells(cells: list[int], width: int, height: int) -> CanonicalPosition:
+    """
+    Find canonical key of the flat list of cell values.
+
+    Args:
+        cells (list[int]): cell values (0 - empty, 1 - X, 2 - O), index = row * height + column
+        width (int): number of rows
+        height (int): number of columns
+
+    Returns:
+        CanonicalPosition: the smallest key among all the transforms and the transform used
+    """
+    best: CanonicalPosition | None = None
+    for transform, permutation in get_cell_permutations(width, height).items():
+        transformed = [0] * len(cells)
+        for index, value in enumerate(cells):
+            transformed[permutation[index]] = value
+        key = tuple(transformed)
+        if best is None or key < best.key:
+            best = CanonicalPosition(key, transform)
+    return best  # type: ignore
+
+
+def canonicalize(field: list[list[Sign]]) -> CanonicalPosition:
+    """
+    Find canonical key of the field.
+
+    Args:
+        field (list): field with values
+
+    Returns:
+        CanonicalPosition: the smallest key among all the transforms and the transform used
+    """
+    cells = [sign.value if sign is not None else 0 for row in field for sign in row]
+    return canonicalize_cells(cells, len(field), len(field[0]))
+
+
+def transform_move(row: int, column: int, width: int, height: int, transform: int) -> tuple[int, int]:
+    """Map move from the original field to the transformed (canonical) one."""
+    return transform_cell(row, column, width, height, transform)
+
+
+def inverse_transform_move(row: int, column: int, width: int, height: int, transform: int) -> tuple[int, int]:
+    """Map move from the transformed (canonical) field back to the original one."""
+    return transform_cell(row, column, width, height, get_inverse_transform(width, height, transform))
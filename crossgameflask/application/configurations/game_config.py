@@ -1,5 +1,34 @@
+import logging as log
+import os
+
 from crossgame.api.controller import Controller
-from crossgame.api.persistance import GameStateInMemoryPersistence
+from crossgame.api.persistance_registry import PERSISTENCE_ENVIRONMENT_VARIABLE, create_persistence
+from crossgame.api.sharded_persistance import GameStateShardedPersistence
+from crossgame.api.ws_server import GameWebSocketServer
+
+GAME_MAX_GAMES: int = 10000
+GAME_IDLE_TTL: float = 60 * 60
+GAME_FINISHED_TTL: float = 10 * 60
 
-GAME_PERSISTENCE: GameStateInMemoryPersistence = GameStateInMemoryPersistence()
+# selected by the CROSSGAME_PERSISTENCE environment variable, by default games are kept in the memory of the process
+# in the sharded store (request threads run concurrently, each shard has its own lock) and idle or finished games
+# expire. Servers with several worker processes should set a shared persistence, for example sqlite:<path>
+# or shared-memory:crossgameflask (fixed number of slots, finished games are not expired)
+GAME_PERSISTENCE = create_persistence() if os.environ.get(PERSISTENCE_ENVIRONMENT_VARIABLE) else \
+    GameStateShardedPersistence(max_games=GAME_MAX_GAMES, idle_ttl=GAME_IDLE_TTL, finished_ttl=GAME_FINISHED_TTL)
 GAME_CONTROLLER: Controller = Controller(GAME_PERSISTENCE)
+
+# the WebSocket channel pushes moves made by GAME_CONTROLLER of this process,
+# it is enabled by the CROSSGAME_WEBSOCKET_PORT environment variable. With several worker processes
+# (gunicorn without --preload) only the first worker binds the port, pages also keep the events stream
+# to receive the moves made through the other workers
+GAME_WEBSOCKET_PORT: int | None = int(os.environ['CROSSGAME_WEBSOCKET_PORT']) \
+    if os.environ.get('CROSSGAME_WEBSOCKET_PORT') else None
+GAME_WEBSOCKET_SERVER: GameWebSocketServer | None = None
+if GAME_WEBSOCKET_PORT is not None:
+    GAME_WEBSOCKET_SERVER = GameWebSocketServer(GAME_CONTROLLER, '0.0.0.0', GAME_WEBSOCKET_PORT)
+    try:
+        GAME_WEBSOCKET_SERVER.run_in_thread()
+    except OSError as error:
+        log.info('WebSocket port %s is not bound by process %s: %s', GAME_WEBSOCKET_PORT, os.getpid(), error)
+        GAME_WEBSOCKET_SERVER = None
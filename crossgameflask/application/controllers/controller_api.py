@@ -0,0 +1,136 @@
+import logging as log
+from typing import Any
+
+from flask import Blueprint, jsonify, request
+from werkzeug import Response
+from werkzeug.exceptions import BadRequest, HTTPException
+
+from crossgame.api.player import PlayerType
+from crossgame.exceptions.game_exceptions import (CellIsAlreadyBusyException, CurrentPlayerCantMakeAmoveException,
+                                                  GameNotFoundException, GameVersionConflictException,
+                                                  IncorrectFieldSizeException, NoAvailableMovesException,
+                                                  NumberOfPlayersException, PlayerNotFoundException)
+from crossgameflask.application.configurations.game_config import GAME_CONTROLLER as CONTROLLER
+from crossgameflask.application.controllers.helpers.helper_dtos import generate_game_state_json
+
+API_BLUEPRINT: Blueprint = Blueprint('api_blueprint', __name__, url_prefix='/api/v1')
+# the position of the parallel AI keeps sides in one byte, bigger fields also take seconds of a request thread
+MAX_BOARD_SIZE: int = 255
+
+ERROR_STATUSES: dict[type, int] = {
+    GameNotFoundException: 404,
+    PlayerNotFoundException: 404,
+    CellIsAlreadyBusyException: 409,
+    CurrentPlayerCantMakeAmoveException: 409,
+    NumberOfPlayersException: 409,
+    NoAvailableMovesException: 409,
+    GameVersionConflictException: 409,
+    IncorrectFieldSizeException: 400,
+    IndexError: 400,
+}
+
+
+def _get_json_body() -> dict[str, Any]:
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict):
+        raise BadRequest('JSON object is expected')
+    return body
+
+
+def _get_str(body: dict[str, Any], name: str) -> str:
+    value = body.get(name)
+    if not isinstance(value, str) or len(value.strip()) < 1:
+        raise BadRequest(f'{name} should be a non-empty string')
+    return value
+
+
+def _get_int(body: dict[str, Any], name: str, default: int = None) -> int:
+    value = body.get(name, default)
+    if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+        raise BadRequest(f'{name} should be a non-negative integer')
+    return value
+
+
+def _get_board_size(body: dict[str, Any], name: str, default: int = None) -> int:
+    value = _get_int(body, name, default)
+    if value > MAX_BOARD_SIZE:
+        raise IncorrectFieldSizeException(f'{name} should not be greater than {MAX_BOARD_SIZE}')
+    return value
+
+
+def _make_game_state_response(game_id: str) -> Response:
+    # the version is taken before the state, a change between them is returned by the next poll.
+    # Persistences with get_game_version (shared memory, SQLite, key-value) read it without unpacking the game.
+    version = CONTROLLER.get_version(game_id)
+    # If-None-Match uses the weak comparison, W/"3" (added by compressing proxies) matches "3"
+    if request.method == 'GET' and request.if_none_match.contains_weak(str(version)):
+        response = Response(status=304)
+    else:
+        game_state = CONTROLLER.get_status(game_id)
+        if game_state is None:
+            body = {'game_id': game_id, 'version': version, 'is_started': False}
+        else:
+            body = generate_game_state_json(game_state, version)
+        response = jsonify(body)
+    response.set_etag(str(version))
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+@API_BLUEPRINT.errorhandler(Exception)
+def _handle_api_error(error: Exception) -> Response:
+    if isinstance(error, HTTPException):
+        status, message = error.code or 500, error.description
+    else:
+        status = next((code for error_type, code in ERROR_STATUSES.items() if isinstance(error, error_type)), 500)
+        message = str(error) if status != 500 else 'Internal server error'
+        if status == 500:
+            log.exception('API request %s failed', request.path)
+    response = jsonify({'error': type(error).__name__, 'message': message or type(error).__name__})
+    response.status_code = status
+    return response
+
+
+@API_BLUEPRINT.route('/games', methods=['POST'])
+def _post_new_game() -> Response:
+    body = _get_json_body()
+    game_state = CONTROLLER.start_game_session(_get_str(body, 'player_name'))
+    game_id = game_state.game_id
+    response = jsonify({'game_id': game_id, 'player_id': game_state.active_player.player_id,
+                        'version': CONTROLLER.get_version(game_id)})
+    response.status_code = 201
+    return response
+
+
+@API_BLUEPRINT.route('/games/<string:game_id>/players', methods=['POST'])
+def _post_join_game(game_id: str) -> Response:
+    body = _get_json_body()
+    player_type_name = body.get('player_type', PlayerType.PLAYER.name)
+    if player_type_name not in PlayerType.__members__:
+        raise BadRequest(f'player_type should be one of {", ".join(PlayerType.__members__)}')
+    game_state = CONTROLLER.join_to_game_game_session(_get_str(body, 'player_name'), game_id,
+                                                      PlayerType[player_type_name])
+    response = jsonify({'game_id': game_id, 'player_id': game_state.active_player.player_id,
+                        'version': CONTROLLER.get_version(game_id)})
+    response.status_code = 201
+    return response
+
+
+@API_BLUEPRINT.route('/games/<string:game_id>/start', methods=['POST'])
+def _post_start_game(game_id: str) -> Response:
+    body = request.get_json(silent=True) or {}
+    win_length = _get_board_size(body, 'win_length') if body.get('win_length') is not None else None
+    CONTROLLER.start_game(game_id, _get_board_size(body, 'rows', 3), _get_board_size(body, 'columns', 3), win_length)
+    return _make_game_state_response(game_id)
+
+
+@API_BLUEPRINT.route('/games/<string:game_id>/moves', methods=['POST'])
+def _post_make_move(game_id: str) -> Response:
+    body = _get_json_body()
+    CONTROLLER.make_move(game_id, _get_str(body, 'player_id'), _get_int(body, 'row'), _get_int(body, 'column'))
+    return _make_game_state_response(game_id)
+
+
+@API_BLUEPRINT.route('/games/<string:game_id>', methods=['GET'])
+def _get_game_status(game_id: str) -> Response:
+    return _make_game_state_response(game_id)
@@ -1,23 +1,42 @@
+from typing import Iterator
+
 from flask import (Blueprint, make_response, redirect, render_template,
                    request, url_for)
 from werkzeug import Response
+from werkzeug.exceptions import BadRequest
 
 import crossgameflask.application.controllers.helpers.form_attributes as attr
-from crossgame.logic.game import GameStateDto, WinnerInfo
+from crossgame.api.persistance import SavedGameInfo, SessionStatus
+from crossgame.exceptions.game_exceptions import GameNotFoundException
+from crossgame.logic.game import WinnerInfo
 from crossgameflask.application.configurations.game_config import GAME_CONTROLLER as CONTROLLER
+from crossgameflask.application.configurations.game_config import GAME_WEBSOCKET_PORT
+from crossgameflask.application.controllers.helpers.fragment_cache import FragmentCache
 from crossgameflask.application.controllers.helpers.helper_dtos import generate_field
-from crossgameflask.application.controllers.helpers.utils import get_str_attr_from_form
+from crossgameflask.application.controllers.helpers.utils import get_int_attr_from_form, get_str_attr_from_form
 from crossgameflask.application.errors.exceptions import NoUserInTheSession
 
 GAME_BLUEPRINT: Blueprint = Blueprint('game_blueprint', __name__, template_folder='templates', url_prefix='/game')
+UPDATE_WAIT_TIMEOUT: float = 15.0
+ROLE_ACTIVE: str = 'active'
+ROLE_WAITING: str = 'waiting'
+
+# rendered tables of the game field, the fragments of the older versions are removed by the moves,
+# fragments of the removed or expired games are removed by the persistence that reports removals
+FIELD_FRAGMENT_CACHE: FragmentCache = FragmentCache()
+CONTROLLER.add_move_listener(FIELD_FRAGMENT_CACHE.on_moves)
+if hasattr(CONTROLLER.persistance, 'add_removal_listener'):
+    CONTROLLER.persistance.add_removal_listener(FIELD_FRAGMENT_CACHE.invalidate)
 
 
-def _render_wait_for_players_page(game_id: str) -> str:
+def _render_wait_for_players_page(game_id: str, version: int) -> str:
     game_status_page_url: str = url_for('game_blueprint._get_game_status_page', game_id=game_id)
+    game_events_url: str = url_for('game_blueprint._get_game_events', game_id=game_id, version=version)
     style_url = url_for('static', filename='custom_game_style.css')
 
     return render_template('game/wait_for_players_page.html',
                            game_status_page_url=game_status_page_url,
+                           game_events_url=game_events_url,
                            game_id=game_id,
                            style_url=style_url)
 
@@ -35,17 +54,28 @@ def _render_finish_game_page(winner_info: WinnerInfo) -> str:
                            index_page_url=index_page_url)
 
 
-def _render_game_field_page(game_state: GameStateDto, player_id: str) -> str:
-    game_id: str = game_state.game_id
-    active_player = game_state.active_player
+def _render_game_field_page(game_info: SavedGameInfo, player_id: str) -> str:
+    game_id: str = game_info.game_id
+    version: int = game_info.version
+    player = game_info.get_player(player_id)
 
-    is_active_view: bool = active_player.is_active and player_id == active_player.player_id
+    is_active_view: bool = player is not None and player.is_active
     get_game_status_page_url: str = url_for('game_blueprint._get_game_status_page', game_id=game_id)
+    game_events_url: str = url_for('game_blueprint._get_game_events', game_id=game_id, version=version)
+    game_websocket_url: str = ''
+    if GAME_WEBSOCKET_PORT is not None:
+        game_websocket_url = f'ws://{request.host.rpartition(":")[0] or request.host}:{GAME_WEBSOCKET_PORT}' \
+                             f'/games/{game_id}'
     post_make_move_url: str = url_for('game_blueprint._post_make_move_redirect_to_game_field_page')
-    game_field = generate_field(game_state.field)
+    # the field is copied and rendered only if the fragment of this version and role is not cached
+    game_field_html = FIELD_FRAGMENT_CACHE.get_or_render(
+        game_id, version, ROLE_ACTIVE if is_active_view else ROLE_WAITING,
+        lambda: render_template('game/game_field_fragment.html',
+                                game_id=game_id,
+                                is_active_view=is_active_view,
+                                post_make_move_url=post_make_move_url,
+                                game_field=generate_field(game_info.game.get_field())))
 
-    players = CONTROLLER.persistance.get_game_info(game_id).players
-    player = next((x for x in players if x.player_id == player_id), None)
     pl_name = player.player_name if player is not None else ''
     pl_sign = player.sign.name if player is not None else ''
 
@@ -56,8 +86,10 @@ def _render_game_field_page(game_state: GameStateDto, player_id: str) -> str:
                            player_id=player_id,
                            is_active_view=is_active_view,
                            get_game_status_page_url=get_game_status_page_url,
-                           post_make_move_url=post_make_move_url,
-                           game_field=game_field,
+                           game_events_url=game_events_url,
+                           game_websocket_url=game_websocket_url,
+                           version=version,
+                           game_field_html=game_field_html,
                            style_url=style_url,
                            player_name=pl_name,
                            player_sign=pl_sign)
@@ -69,15 +101,7 @@ def _post_new_game_redirect_to_wait_for_players_page() -> Response:
     game_state = CONTROLLER.start_game_session(player_name)
     game_id = game_state.game_id
 
-    style_url = url_for('static', filename='custom_game_style.css')
-
-    game_status_page_url: str = url_for('game_blueprint._get_game_status_page', game_id=game_id)
-    rendered_template = render_template('game/wait_for_players_page.html',
-                                        game_status_page_url=game_status_page_url,
-                                        game_id=game_id,
-                                        style_url=style_url)
-
-    resp = make_response(rendered_template)
+    resp = make_response(_render_wait_for_players_page(game_id, CONTROLLER.get_version(game_id)))
     resp.set_cookie(attr.USER_ID, game_state.active_player.player_id)
     return resp
 
@@ -102,10 +126,13 @@ def _post_make_move_redirect_to_game_field_page() -> Response:
     if not player_id:
         raise NoUserInTheSession()
     game_id: str = get_str_attr_from_form(attr.GAME_ID)
-    row: int = int(get_str_attr_from_form(attr.ROW))
-    column: int = int(get_str_attr_from_form(attr.COLUMN))
+    row: int = get_int_attr_from_form(attr.ROW)
+    column: int = get_int_attr_from_form(attr.COLUMN)
 
-    CONTROLLER.make_move(game_id, player_id, row, column)
+    try:
+        CONTROLLER.make_move(game_id, player_id, row, column)
+    except IndexError as error:
+        raise BadRequest(str(error)) from error
 
     return redirect(url_for('game_blueprint._get_game_status_page', game_id=game_id))
 
@@ -116,15 +143,41 @@ def _get_game_status_page(game_id: str) -> str:
     if not player_id:
         raise NoUserInTheSession()
 
-    game_state = CONTROLLER.get_status(game_id)
-
-    if game_state is None:
-        return _render_wait_for_players_page(game_id)
-
-    if not game_state.is_started:
-        return _render_wait_for_players_page(game_id)
-
-    if game_state.winner:
-        return _render_finish_game_page(game_state.winner)
-
-    return _render_game_field_page(game_state, player_id)
+    # version, players and the game are taken from one read of the session
+    game_info = CONTROLLER.get_game_info(game_id)
+    status = game_info.get_status()
+
+    if status == SessionStatus.WAITING:
+        return _render_wait_for_players_page(game_id, game_info.version)
+
+    if status == SessionStatus.FINISHED:
+        FIELD_FRAGMENT_CACHE.invalidate(game_id)
+        return _render_finish_game_page(game_info.game.winner)
+
+    return _render_game_field_page(game_info, player_id)
+
+
+# each open stream holds a worker thread while the page is open, so the server should run threaded
+# or green-threaded workers (gunicorn --worker-class gthread --threads 64, or --worker-class gevent):
+# a sync worker serves only one stream at a time
+@GAME_BLUEPRINT.route('/events/<string:game_id>', methods=['GET'])
+def _get_game_events(game_id: str) -> Response:
+    known_version: int = request.args.get('version', default=0, type=int)
+    # unknown game is reported before the stream is started
+    CONTROLLER.get_version(game_id)
+
+    def stream() -> Iterator[str]:
+        version = known_version
+        while True:
+            try:
+                current_version = CONTROLLER.wait_for_update(game_id, version, UPDATE_WAIT_TIMEOUT)
+            except GameNotFoundException:
+                return
+            if current_version == version:
+                yield ': keep-alive\n\n'
+            else:
+                version = current_version
+                yield f'event: update\ndata: {version}\n\n'
+
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
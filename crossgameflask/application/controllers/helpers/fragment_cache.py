@@ -0,0 +1,67 @@
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+from crossgame.api.game_updates import MoveDelta
+
+
+class FragmentCache:
+    """
+    Bounded cache of the rendered fragments of the games keyed by game id, version and role of the viewer.
+
+    Fragments of the older versions are removed when the game is changed,
+    the least recently used fragments are removed when the cache is full.
+    """
+
+    def __init__(self, max_size: int = 4096) -> None:
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        self.fragments: OrderedDict[tuple[str, int, str], str] = OrderedDict()
+        self.game_keys: dict[str, set[tuple[str, int, str]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_render(self, game_id: str, version: int, role: str, render: Callable[[], str]) -> str:
+        key = (game_id, version, role)
+        with self.lock:
+            fragment = self.fragments.get(key)
+            if fragment is not None:
+                self.fragments.move_to_end(key)
+                self.hits += 1
+                return fragment
+            self.misses += 1
+        fragment = render()
+        with self.lock:
+            if key not in self.fragments:
+                self.__remove_older_versions(game_id, version)
+                self.fragments[key] = fragment
+                self.game_keys.setdefault(game_id, set()).add(key)
+                while len(self.fragments) > self.max_size:
+                    self.__remove(next(iter(self.fragments)))
+        return fragment
+
+    def invalidate(self, game_id: str, before_version: int = None) -> None:
+        with self.lock:
+            if before_version is None:
+                for key in list(self.game_keys.get(game_id, ())):
+                    self.__remove(key)
+            else:
+                self.__remove_older_versions(game_id, before_version)
+
+    def on_moves(self, game_id: str, deltas: list[MoveDelta]) -> None:
+        # move listener of the Controller
+        self.invalidate(game_id, deltas[-1].version)
+
+    def __len__(self) -> int:
+        return len(self.fragments)
+
+    def __remove_older_versions(self, game_id: str, version: int) -> None:
+        for key in [key for key in self.game_keys.get(game_id, ()) if key[1] < version]:
+            self.__remove(key)
+
+    def __remove(self, key: tuple[str, int, str]) -> None:
+        del self.fragments[key]
+        game_keys = self.game_keys[key[0]]
+        game_keys.discard(key)
+        if not game_keys:
+            del self.game_keys[key[0]]
@@ -1,5 +1,7 @@
 from dataclasses import dataclass
+from typing import Any
 
+from crossgame.logic.game import GameStateDto
 from crossgame.logic.game_enums import Sign
 
 
@@ -19,3 +21,22 @@ def generate_field(field: list[list[Sign]]) -> list[list[ViewFieldCell]]:
             column.append(ViewFieldCell(row, col, val))
         rows.append(column)
     return rows
+
+
+def generate_game_state_json(game_state: GameStateDto, version: int) -> dict[str, Any]:
+    active_player = game_state.active_player
+    winner = game_state.winner
+    return {
+        'game_id': game_state.game_id,
+        'version': version,
+        'is_started': game_state.is_started,
+        'player_names': game_state.player_names,
+        'active_player': {'player_name': active_player.player_name,
+                          'sign': active_player.sign.name} if active_player is not None else None,
+        'field': [[cell.name if cell is not None else None for cell in row]
+                  for row in game_state.field] if game_state.field is not None else None,
+        'winner': {'is_draw': winner.is_draw,
+                   'sign': winner.sign.name if winner.sign is not None else None,
+                   'player_name': winner.player.player_name if winner.player is not None else None}
+        if winner is not None else None,
+    }
@@ -1,4 +1,5 @@
 from flask import request
+from werkzeug.exceptions import BadRequest
 
 from crossgameflask.application.errors.exceptions import AttributeIsNotFoundInTheFormException, IncorrectStringValue
 
@@ -16,3 +17,10 @@ def get_str_attr_from_form(attr_name: str) -> str:
     validate_form_str_attribute(attr_name)
     form = request.form
     return form[attr_name]
+
+
+def get_int_attr_from_form(attr_name: str) -> int:
+    value = get_str_attr_from_form(attr_name).strip()
+    if not value.isdecimal():
+        raise BadRequest(f'{attr_name} should be a non-negative integer')
+    return int(value)
@@ -2,6 +2,7 @@ import os
 
 from flask import Flask
 
+from crossgameflask.application.controllers import controller_api
 from crossgameflask.application.controllers import controller_game
 from crossgameflask.application.controllers import controller_index
 from crossgameflask.application.errors.error_handlers import internal_error, page_not_found
@@ -29,6 +30,7 @@ def configure_flask_app(application: Flask, test_config=None):
         pass
     application.register_blueprint(controller_index.INDEX_BLUEPRINT)
     application.register_blueprint(controller_game.GAME_BLUEPRINT)
+    application.register_blueprint(controller_api.API_BLUEPRINT)
     application.register_error_handler(400, page_not_found)
     application.register_error_handler(500, internal_error)
     application.register_error_handler(AttributeIsNotFoundInTheFormException, internal_error)
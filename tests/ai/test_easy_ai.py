@@ -0,0 +1,54 @@
+from unittest import TestCase
+
+from crossgame.ai.easy_ai import EasyAI
+from crossgame.exceptions.game_exceptions import NoAvailableMovesException
+from crossgame.logic.bit_state import BitboardGameState
+from crossgame.logic.empty_cells import EmptyCellIndex
+from crossgame.logic.game_enums import Sign
+from crossgame.logic.k_in_a_row_state import KInARowGameState
+from crossgame.logic.state import GameState
+
+
+class TestEasyAI(TestCase):
+    def test_empty_cell_index(self):
+        index = EmptyCellIndex([(0, 0), (0, 1), (1, 1)])
+        index.remove((0, 0))
+        self.assertEqual(2, len(index))
+        self.assertNotIn((0, 0), index)
+        self.assertEqual({(0, 1), (1, 1)}, set(index))
+        index.remove((1, 1))
+        index.add((0, 0))
+        self.assertEqual({(0, 1), (0, 0)}, set(index))
+
+    def test_states_maintain_free_cells(self):
+        for state in [GameState(), BitboardGameState(), KInARowGameState(3, 3, 3)]:
+            state.make_move(1, 1, Sign.X)
+            state.make_move(0, 2, Sign.O)
+            self.assertEqual(7, len(state.free_cells))
+            self.assertNotIn((1, 1), state.free_cells)
+            self.assertIn((0, 0), state.free_cells)
+
+    def test_random_move_is_legal(self):
+        state = KInARowGameState(19, 19, 5)
+        ai = EasyAI(seed=1)
+        for turn in range(100):
+            sign = Sign.X if turn % 2 == 0 else Sign.O
+            row, column = ai.choose_move(state, sign)
+            self.assertTrue(state.is_cell_empty(row, column))
+            state.make_move(row, column, sign)
+
+    def test_takes_win_and_blocks(self):
+        for state in [GameState(), BitboardGameState(), KInARowGameState(3, 3, 3)]:
+            state.field = [[Sign.X, Sign.X, None],
+                           [Sign.O, None, None],
+                           [Sign.O, None, None]]
+            ai = EasyAI(check_lines=True, seed=1)
+            self.assertEqual((0, 2), ai.choose_move(state, Sign.X))
+            self.assertEqual((0, 2), ai.choose_move(state, Sign.O))
+
+    def test_finished_game(self):
+        state = GameState()
+        state.field = [[Sign.X, Sign.X, Sign.X],
+                       [Sign.O, Sign.O, None],
+                       [None, None, None]]
+        self.assertRaises(NoAvailableMovesException, EasyAI().choose_move, state, Sign.O)
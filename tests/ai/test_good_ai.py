@@ -0,0 +1,73 @@
+from unittest import TestCase
+
+from crossgame.ai.good_ai import GoodAI, TableEntry, TranspositionTable
+from crossgame.exceptions.game_exceptions import NoAvailableMovesException
+from crossgame.logic.game_enums import Sign
+from crossgame.logic.k_in_a_row_state import KInARowGameState
+from crossgame.logic.state import GameState
+
+
+def play_game(first_ai, second_ai):
+    state = GameState()
+    players = [(first_ai, Sign.X), (second_ai, Sign.O)]
+    turn = 0
+    while state.empty_cells > 0 and state.game_is_finished().sign is None:
+        ai, sign = players[turn % 2]
+        state.make_move(*ai.choose_move(state, sign), sign)
+        turn += 1
+    return state.game_is_finished()
+
+
+class TestGoodAI(TestCase):
+    def test_takes_immediate_win(self):
+        state = GameState()
+        state.field = [[Sign.X, Sign.X, None],
+                       [Sign.O, Sign.O, None],
+                       [None, None, None]]
+        self.assertEqual((0, 2), GoodAI().choose_move(state, Sign.X))
+        self.assertEqual((1, 2), GoodAI().choose_move(state, Sign.O))
+
+    def test_blocks_opponent(self):
+        state = GameState()
+        state.field = [[Sign.X, None, None],
+                       [None, Sign.O, None],
+                       [None, None, Sign.X]]
+        ai = GoodAI()
+        move = ai.choose_move(state, Sign.O)
+        self.assertIn(move, [(0, 1), (1, 0), (1, 2), (2, 1)])
+
+    def test_perfect_play_is_draw(self):
+        ai = GoodAI()
+        result = play_game(ai, ai)
+        self.assertIsNone(result.sign)
+
+    def test_table_is_reused(self):
+        ai = GoodAI()
+        state = GameState()
+        first_move = ai.choose_move(state, Sign.X)
+        table_size = len(ai.table)
+        self.assertEqual(first_move, ai.choose_move(state, Sign.X))
+        self.assertEqual(table_size, len(ai.table))
+
+    def test_k_in_a_row_board(self):
+        state = KInARowGameState(9, 9, 4)
+        for y in range(3):
+            state.make_move(4, 2 + y, Sign.O)
+        state.make_move(4, 1, Sign.X)
+        state.make_move(8, 8, Sign.X)
+        self.assertEqual((4, 5), GoodAI(max_depth=2).choose_move(state, Sign.X))
+
+    def test_finished_game(self):
+        state = GameState()
+        state.field = [[Sign.X, Sign.X, Sign.X],
+                       [Sign.O, Sign.O, None],
+                       [None, None, None]]
+        self.assertRaises(NoAvailableMovesException, GoodAI().choose_move, state, Sign.O)
+
+    def test_transposition_table_eviction(self):
+        table = TranspositionTable(2)
+        for key in range(3):
+            table.put(key, TableEntry(1, 0, 0, key))
+        self.assertEqual(2, len(table))
+        self.assertIsNone(table.get(0))
+        self.assertEqual(1, table.evictions)
@@ -0,0 +1,55 @@
+import time
+from unittest import TestCase
+
+from crossgame.ai.ai_provider import get_good_ai
+from crossgame.ai.good_ai import GoodAI
+from crossgame.ai.mcts_ai import MctsAI
+from crossgame.logic.game_enums import Sign
+from crossgame.logic.k_in_a_row_state import KInARowGameState
+from crossgame.logic.state import GameState
+
+
+class TestMctsAI(TestCase):
+    def test_takes_immediate_win(self):
+        state = GameState()
+        state.field = [[Sign.X, Sign.X, None],
+                       [Sign.O, Sign.O, None],
+                       [None, None, None]]
+        ai = MctsAI(time_budget=5, playout_budget=2000, seed=1)
+        self.assertEqual((0, 2), ai.choose_move(state, Sign.X))
+
+    def test_blocks_opponent(self):
+        state = KInARowGameState(7, 7, 4)
+        for y in range(1, 4):
+            state.make_move(3, y, Sign.O)
+        state.make_move(3, 0, Sign.X)
+        state.make_move(0, 0, Sign.X)
+        ai = MctsAI(time_budget=5, playout_budget=3000, seed=1)
+        self.assertEqual((3, 4), ai.choose_move(state, Sign.X))
+
+    def test_latency_on_big_board(self):
+        state = KInARowGameState(15, 15, 5)
+        ai = MctsAI(time_budget=0.2, seed=1)
+        for _ in range(3):
+            started = time.perf_counter()
+            row, column = ai.choose_move(state, Sign.X)
+            self.assertLess(time.perf_counter() - started, 0.4)
+            state.make_move(row, column, Sign.X)
+            state.make_move(*GoodAI(max_depth=1).choose_move(state, Sign.O), Sign.O)
+
+    def test_tree_is_reused(self):
+        state = KInARowGameState(5, 5, 4)
+        ai = MctsAI(time_budget=5, playout_budget=500, seed=1)
+        row, column = ai.choose_move(state, Sign.X)
+        state.make_move(row, column, Sign.X)
+        answer = ai.root.children[0].move
+        state.make_move(*divmod(answer, 5), Sign.O)
+        reused = next(child for child in ai.root.children if child.move == answer)
+        self.assertGreater(reused.visits, 0)
+        ai.choose_move(state, Sign.X)
+        self.assertIn(ai.root, reused.children)
+
+    def test_provider(self):
+        self.assertIsInstance(get_good_ai(3, 3), GoodAI)
+        self.assertIs(get_good_ai(3, 3), get_good_ai(3, 3))
+        self.assertIsInstance(get_good_ai(15, 15), MctsAI)
@@ -0,0 +1,31 @@
+from unittest import TestCase
+
+from crossgame.ai.parallel_ai import ParallelMctsAI, decode_position, encode_position, search_root_moves
+from crossgame.ai.search_board import SearchBoard
+from crossgame.logic.game_enums import Sign
+from crossgame.logic.state import GameState
+
+
+class TestParallelMctsAI(TestCase):
+    def test_position_encoding(self):
+        board = SearchBoard(3, 5, 3, [0, 1, 2, 0, 0] * 3)
+        data = encode_position(board, Sign.O.value)
+        self.assertEqual(4 + 15, len(data))
+        decoded, value = decode_position(data)
+        self.assertEqual(Sign.O.value, value)
+        self.assertEqual((3, 5, 3), (decoded.width, decoded.height, decoded.win_length))
+        self.assertEqual(board.cells, decoded.cells)
+        self.assertEqual(board.empty_count, decoded.empty_count)
+
+    def test_search_root_moves(self):
+        board = SearchBoard(3, 3, 3, [1, 1, 0, 2, 2, 0, 0, 0, 0])
+        visits = search_root_moves(encode_position(board, Sign.X.value), 5, 500, 1)
+        self.assertEqual(2, max(visits, key=visits.get))
+
+    def test_takes_immediate_win(self):
+        state = GameState()
+        state.field = [[Sign.X, Sign.X, None],
+                       [Sign.O, Sign.O, None],
+                       [None, None, None]]
+        ai = ParallelMctsAI(trees=2, time_budget=5, playout_budget=500, seed=1)
+        self.assertEqual((0, 2), ai.choose_move(state, Sign.X))
@@ -0,0 +1,36 @@
+from unittest import TestCase
+
+from crossgame.ai.tablebase import (DRAW, LOSS, POSITIONS_NUMBER, WIN, generate_tablebase, get_tablebase, lookup,
+                                    read_tablebase, verify_tablebase)
+
+
+class TestTablebase(TestCase):
+    def test_shipped_tablebase_matches_generator(self):
+        table = read_tablebase()
+        self.assertEqual(POSITIONS_NUMBER, len(table))
+        self.assertEqual(generate_tablebase(), table)
+
+    def test_verify_with_minimax(self):
+        self.assertEqual([], verify_tablebase(get_tablebase()))
+
+    def test_lookup(self):
+        self.assertEqual(DRAW, lookup([0] * 9).value)
+        entry = lookup([1, 1, 0,
+                        2, 2, 0,
+                        0, 0, 0])
+        self.assertEqual(WIN, entry.value)
+        self.assertEqual([(0, 2)], entry.best_moves)
+        entry = lookup([1, 0, 0,
+                        0, 0, 0,
+                        0, 0, 0])
+        self.assertEqual(DRAW, entry.value)
+        self.assertEqual([(1, 1)], entry.best_moves)
+        entry = lookup([1, 1, 0,
+                        1, 2, 0,
+                        0, 0, 2])
+        self.assertEqual(LOSS, entry.value)
+
+    def test_lookup_of_finished_game(self):
+        self.assertIsNone(lookup([1, 1, 1,
+                                  2, 2, 0,
+                                  0, 0, 0]))
@@ -0,0 +1,96 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from crossgame.api.archive import (COLUMN_GAME_ID, COLUMN_OUTCOME, GameArchiver, read_archive, read_blocks,
+                                   unpack_strings)
+from crossgame.api.controller import Controller
+from crossgame.api.persistance import GameStateInMemoryPersistence
+from crossgame.api.sharded_persistance import GameStateShardedPersistence
+from crossgame.exceptions.game_exceptions import GameNotFoundException
+from crossgame.logic.game_enums import Sign
+
+
+def play(controller, moves, row=3, column=3, win_length=None):
+    init_state = controller.start_game_session('player-1')
+    player_2 = controller.join_to_game_game_session('player-2', init_state.game_id).active_player
+    controller.start_game(init_state.game_id, row, column, win_length)
+    player_ids = [init_state.active_player.player_id, player_2.player_id]
+    for index, (row_index, column_index) in enumerate(moves):
+        controller.make_move(init_state.game_id, player_ids[index % 2], row_index, column_index)
+    return init_state.game_id, player_ids
+
+
+X_WINS = [(0, 0), (1, 1), (0, 1), (2, 2), (0, 2)]
+DRAW = [(0, 0), (1, 1), (2, 2), (0, 1), (2, 1), (2, 0), (0, 2), (1, 2), (1, 0)]
+
+
+class RacingPersistence(GameStateInMemoryPersistence):
+    def __init__(self):
+        GameStateInMemoryPersistence.__init__(self)
+        self.removed_by_other = None
+
+    def get_game_info(self, game_id):
+        if game_id == self.removed_by_other:
+            GameStateInMemoryPersistence.remove_game_info(self, game_id)
+        return GameStateInMemoryPersistence.get_game_info(self, game_id)
+
+
+class TestGameArchiver(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_finished_games_are_moved_to_archive(self):
+        persistance = GameStateInMemoryPersistence()
+        controller = Controller(persistance)
+        winner_id, player_ids = play(controller, X_WINS)
+        draw_id, _ = play(controller, DRAW)
+        k_in_a_row_id, _ = play(controller, [(0, 0), (4, 4), (0, 1), (4, 3), (0, 2)], 5, 6, 3)
+        in_progress_id, _ = play(controller, [(1, 1)])
+
+        archiver = GameArchiver(persistance, self.directory.name, batch_size=2)
+        self.assertEqual(3, archiver.archive_finished_games())
+        self.assertEqual(0, archiver.archive_finished_games())
+        self.assertRaises(GameNotFoundException, persistance.get_game_info, winner_id)
+        self.assertIsNotNone(persistance.get_game_info(in_progress_id))
+
+        games = {game.game_id: game for game in read_archive(self.directory.name)}
+        self.assertEqual({winner_id, draw_id, k_in_a_row_id}, set(games))
+        winner = games[winner_id]
+        self.assertEqual(Sign.X, winner.winner)
+        self.assertEqual(X_WINS, winner.moves)
+        self.assertEqual(tuple(player_ids), winner.player_ids)
+        self.assertEqual((3, 3, None), (winner.rows, winner.columns, winner.win_length))
+        self.assertLessEqual(winner.created_at, winner.archived_at)
+        self.assertIsNone(games[draw_id].winner)
+        self.assertEqual((5, 6, 3), (games[k_in_a_row_id].rows, games[k_in_a_row_id].columns,
+                                     games[k_in_a_row_id].win_length))
+
+    def test_games_removed_before_archivation_are_not_counted(self):
+        persistance = RacingPersistence()
+        controller = Controller(persistance)
+        winner_id, _ = play(controller, X_WINS)
+        draw_id, _ = play(controller, DRAW)
+        persistance.removed_by_other = draw_id
+
+        self.assertEqual(1, GameArchiver(persistance, self.directory.name).archive_finished_games())
+        self.assertEqual([winner_id], [game.game_id for game in read_archive(self.directory.name)])
+
+    def test_chosen_columns_and_incomplete_block(self):
+        persistance = GameStateShardedPersistence(shards=2)
+        controller = Controller(persistance)
+        game_ids = {play(controller, X_WINS)[0] for _ in range(5)}
+        GameArchiver(persistance, self.directory.name).archive_finished_games()
+        path = os.path.join(self.directory.name, 'games-000000.cga')
+        with open(path, 'ab') as file:
+            file.write(b'CGAB\x01')
+
+        blocks = list(read_blocks(path, {COLUMN_GAME_ID, COLUMN_OUTCOME}))
+        self.assertEqual(1, len(blocks))
+        count, columns = blocks[0]
+        self.assertEqual({COLUMN_GAME_ID, COLUMN_OUTCOME}, set(columns))
+        self.assertEqual(game_ids, set(unpack_strings(columns[COLUMN_GAME_ID], count)))
+        self.assertEqual(bytes([Sign.X.value] * 5), columns[COLUMN_OUTCOME])
@@ -0,0 +1,147 @@
+import asyncio
+import threading
+from unittest import IsolatedAsyncioTestCase
+
+from crossgame.api.async_controller import AsyncController
+from crossgame.api.async_persistance import AsyncPersistenceAdapter, to_async_persistence
+from crossgame.api.game_updates import AsyncGameUpdateNotifier
+from crossgame.api.kv_persistance import AsyncKeyValueClient, GameStateAsyncKeyValuePersistence
+from crossgame.api.kv_server import KeyValueServer
+from crossgame.api.persistance import GameStateInMemoryPersistence
+from crossgame.api.player import PlayerType
+from crossgame.api.sqlite_persistance import GameStateSqlitePersistence
+from crossgame.exceptions.game_exceptions import CurrentPlayerCantMakeAmoveException, GameNotFoundException
+from crossgame.logic.game_enums import Sign
+
+
+class SlowAI:
+    def __init__(self):
+        self.thread_names = []
+
+    def choose_move(self, game_state, sign):
+        self.thread_names.append(threading.current_thread().name)
+        field = game_state.field
+        return next((row, column) for row in range(len(field)) for column in range(len(field[row]))
+                    if field[row][column] is None)
+
+
+class BlockingAI(SlowAI):
+    def __init__(self):
+        SlowAI.__init__(self)
+        self.called = threading.Event()
+        self.release = threading.Event()
+
+    def choose_move(self, game_state, sign):
+        self.called.set()
+        self.release.wait(5)
+        return SlowAI.choose_move(self, game_state, sign)
+
+
+class TestAsyncController(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.controller = AsyncController(GameStateInMemoryPersistence(), update_poll_interval=10)
+        self.first = await self.controller.start_game_session('player-1')
+        self.game_id = self.first.game_id
+
+    async def test_game_flow(self):
+        self.assertIsNone(await self.controller.get_status(self.game_id))
+        second = await self.controller.join_to_game_game_session('player-2', self.game_id)
+        await self.controller.start_game(self.game_id)
+        for index, (row, column) in enumerate([(0, 0), (1, 1), (0, 1), (2, 2), (0, 2)]):
+            player_id = second.active_player.player_id if index % 2 else self.first.active_player.player_id
+            state = await self.controller.make_move(self.game_id, player_id, row, column)
+        self.assertEqual(Sign.X, state.winner.sign)
+        self.assertEqual(7, await self.controller.get_version(self.game_id))
+        with self.assertRaises(CurrentPlayerCantMakeAmoveException):
+            await self.controller.make_move(self.game_id, self.first.active_player.player_id, 2, 0)
+        with self.assertRaises(GameNotFoundException):
+            await self.controller.get_status('unknown')
+
+    async def test_ai_moves_are_chosen_in_the_executor(self):
+        await self.controller.join_to_game_game_session('ai', self.game_id, PlayerType.AI_EASY)
+        ai = SlowAI()
+        second_player_id = (await self.controller.persistance.get_game_info(self.game_id)).players[1].player_id
+        self.controller.ai_players[second_player_id] = ai
+        await self.controller.start_game(self.game_id)
+        state = await self.controller.make_move(self.game_id, self.first.active_player.player_id, 2, 2)
+        self.assertEqual(Sign.O, state.field[0][0])
+        self.assertEqual(1, len(ai.thread_names))
+        self.assertNotEqual(threading.current_thread().name, ai.thread_names[0])
+
+    async def test_cancelled_move_is_finished(self):
+        await self.controller.join_to_game_game_session('ai', self.game_id, PlayerType.AI_EASY)
+        ai = BlockingAI()
+        second_player_id = (await self.controller.persistance.get_game_info(self.game_id)).players[1].player_id
+        self.controller.ai_players[second_player_id] = ai
+        await self.controller.start_game(self.game_id)
+        version = await self.controller.get_version(self.game_id)
+        move = asyncio.create_task(self.controller.make_move(self.game_id, self.first.active_player.player_id, 2, 2))
+        await asyncio.get_running_loop().run_in_executor(None, ai.called.wait, 5)
+        move.cancel()
+        ai.release.set()
+        with self.assertRaises(asyncio.CancelledError):
+            await move
+        self.assertEqual(version + 1, await self.controller.wait_for_update(self.game_id, version, 5))
+        state = await self.controller.get_status(self.game_id)
+        self.assertEqual((Sign.X, Sign.O), (state.field[2][2], state.field[0][0]))
+        self.assertEqual(Sign.X, state.active_player.sign)
+
+    async def test_wait_for_next_move(self):
+        await self.controller.join_to_game_game_session('player-2', self.game_id)
+        await self.controller.start_game(self.game_id)
+        moves = []
+        self.controller.add_move_listener(lambda game_id, deltas: moves.extend(deltas))
+        version = await self.controller.get_version(self.game_id)
+        waiter = asyncio.create_task(self.controller.wait_for_next_move(self.game_id, version, 5))
+        await asyncio.sleep(0.01)
+        await self.controller.make_move(self.game_id, self.first.active_player.player_id, 1, 1)
+        state = await asyncio.wait_for(waiter, 1)
+        self.assertEqual(Sign.X, state.field[1][1])
+        self.assertEqual([(1, 1, Sign.X, version + 1)], moves)
+        self.assertIsNone(await self.controller.wait_for_next_move(self.game_id, version + 1, 0.01))
+        self.assertEqual(0, len(self.controller.updates))
+
+    async def test_concurrent_moves_of_one_player(self):
+        await self.controller.join_to_game_game_session('player-2', self.game_id)
+        await self.controller.start_game(self.game_id)
+        results = await asyncio.gather(*(self.controller.make_move(self.game_id, self.first.active_player.player_id,
+                                                                   0, column) for column in range(3)),
+                                       return_exceptions=True)
+        self.assertEqual(2, sum(isinstance(result, CurrentPlayerCantMakeAmoveException) for result in results))
+
+
+class TestAsyncPersistence(IsolatedAsyncioTestCase):
+    async def test_notifier(self):
+        notifier = AsyncGameUpdateNotifier()
+        async with notifier.watch('game-1') as watch:
+            notifier.notify('game-1')
+            self.assertTrue(await watch.wait(0))
+            self.assertFalse(await watch.wait(0.01))
+        self.assertEqual(0, len(notifier))
+
+    async def test_blocking_persistence_is_called_in_the_executor(self):
+        self.assertFalse(to_async_persistence(GameStateInMemoryPersistence()).is_blocking)
+        persistance = GameStateSqlitePersistence(':memory:')
+        adapter = to_async_persistence(persistance)
+        self.assertIsInstance(adapter, AsyncPersistenceAdapter)
+        self.assertTrue(adapter.is_blocking)
+
+    async def test_key_value_persistence(self):
+        server = KeyValueServer(port=0)
+        port = await server.start()
+        client = AsyncKeyValueClient(port=port)
+        persistance = GameStateAsyncKeyValuePersistence(client)
+        self.assertIs(persistance, to_async_persistence(persistance))
+        controller = AsyncController(persistance)
+        first = await controller.start_game_session('player-1')
+        await controller.join_to_game_game_session('player-2', first.game_id)
+        await controller.start_game(first.game_id)
+        state = await controller.make_move(first.game_id, first.active_player.player_id, 1, 1)
+        self.assertEqual(Sign.X, (await controller.get_status(first.game_id)).field[1][1])
+        self.assertEqual(state.field, (await controller.get_status(first.game_id)).field)
+        await persistance.remove_game_info(first.game_id)
+        with self.assertRaises(GameNotFoundException):
+            await controller.get_version(first.game_id)
+        await client.close()
+        server.server.close()
+        await server.server.wait_closed()
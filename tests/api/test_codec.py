@@ -0,0 +1,85 @@
+from unittest import TestCase
+
+from crossgame.api.codec import (BoardView, decode_game_info, decode_game_state, decode_session_version,
+                                 encode_game_info, encode_game_state, pack_board, unpack_board)
+from crossgame.api.persistance import SavedGameInfo
+from crossgame.api.player import Player, PlayerType
+from crossgame.logic.bit_state import BitboardGameState
+from crossgame.logic.game import TicTacToeGame, TicTacToeGameInfinite, TicTacToeGameKInARow
+from crossgame.logic.game_enums import Sign
+from crossgame.logic.sparse_state import Viewport
+
+
+def create_players():
+    return [Player('Гравець', 'id-1', Sign.X, True), Player('ai', 'id-2', Sign.O, False, PlayerType.AI_GOOD)]
+
+
+class TestCodec(TestCase):
+    def test_board_packing(self):
+        field = [[Sign.X, None, Sign.O], [None, Sign.O, None], [Sign.X, Sign.X, None]]
+        data = pack_board(field)
+        self.assertEqual(3, len(data))
+        self.assertEqual(field, unpack_board(data, 3, 3))
+        view = BoardView(memoryview(data), 3, 3)
+        self.assertEqual(Sign.O, view.get(0, 2))
+        self.assertIsNone(view.get(2, 2))
+
+    def test_session_without_game(self):
+        info = decode_game_info(encode_game_info(SavedGameInfo('game-1', create_players()[:1], created_at=1.5)))
+        self.assertEqual('game-1', info.game_id)
+        self.assertEqual(1.5, info.created_at)
+        self.assertFalse(info.is_started)
+        self.assertIsNone(info.game)
+        self.assertEqual('Гравець', info.players[0].player_name)
+
+    def test_session_version_without_unpacking(self):
+        data = encode_game_info(SavedGameInfo('game-1', create_players(), version=7))
+        self.assertEqual(7, decode_session_version(data[:16]))
+
+    def test_dense_games(self):
+        for create_game in (lambda players: TicTacToeGame('game-1', players),
+                            lambda players: TicTacToeGame('game-1', players, 3, 3, BitboardGameState),
+                            lambda players: TicTacToeGameKInARow('game-1', players, 5, 7, 3)):
+            players = create_players()
+            game = create_game(players)
+            for player_id, row, column in [('id-1', 0, 0), ('id-2', 1, 2), ('id-1', 1, 1), ('id-2', 0, 2),
+                                           ('id-1', 2, 2)]:
+                game.make_move(player_id, row, column)
+            info = decode_game_info(encode_game_info(SavedGameInfo('game-1', players, game, True)))
+            self.assertTrue(info.is_started)
+            self.assertIs(type(game.game_state), type(info.game.game_state))
+            self.assertEqual(game.get_field(), info.game.get_field())
+            self.assertEqual(game.moves, info.game.moves)
+            self.assertIs(info.players, info.game.players)
+            self.assertEqual(Sign.X, info.game.winner.sign)
+            self.assertEqual([vars(player) for player in players], [vars(player) for player in info.players])
+
+    def test_infinite_game(self):
+        players = create_players()
+        game = TicTacToeGameInfinite('game-1', players, 5)
+        game.make_move('id-1', -100000, 3)
+        game.make_move('id-2', 7, -2)
+        info = decode_game_info(encode_game_info(SavedGameInfo('game-1', players, game, True)))
+        self.assertEqual(game.moves, info.game.moves)
+        viewport = Viewport(-100000, -2, 100008, 6)
+        self.assertEqual(game.get_field_view(viewport), info.game.get_field_view(viewport))
+
+    def test_game_state(self):
+        players = create_players()
+        game = TicTacToeGameKInARow('game-1', players, 4, 5, 3)
+        for player_id, row, column in [('id-1', 0, 0), ('id-2', 3, 4), ('id-1', 1, 1), ('id-2', 2, 4),
+                                       ('id-1', 2, 2)]:
+            state = game.make_move(player_id, row, column)
+        decoded = decode_game_state(encode_game_state(state))
+        self.assertEqual(state.field, decoded.field)
+        self.assertEqual(state.player_names, decoded.player_names)
+        self.assertEqual(vars(state.active_player), vars(decoded.active_player))
+        self.assertEqual(vars(state.winner.player), vars(decoded.winner.player))
+        self.assertEqual(Sign.X, decoded.winner.sign)
+        self.assertTrue(decoded.is_started)
+
+    def test_unknown_version(self):
+        data = bytearray(encode_game_info(SavedGameInfo('game-1', [])))
+        data[0] = 99
+        self.assertRaises(ValueError, decode_game_info, data)
+        self.assertRaises(ValueError, decode_game_state, encode_game_info(SavedGameInfo('game-1', [])))
@@ -1,6 +1,9 @@
 from unittest import TestCase
 
-from crossgame.api.controller import Controller
+from unittest.mock import patch
+
+from crossgame.ai.easy_ai import EasyAI
+from crossgame.api.controller import Controller, PlayerType
 from crossgame.api.persistance import GameStateInMemoryPersistence
 from crossgame.logic.game_enums import Sign
 
@@ -125,3 +128,67 @@ class TestController(TestCase):
         self.assertEqual('player-1', active_palyer.player_name)
         self.assertEqual('player-2', winner_player.player_name)
         self.assertEqual(Sign.O, winner_player.sign)
+
+    def test_start_game_with_k_in_a_row_rules(self):
+        persistance = GameStateInMemoryPersistence()
+        controller = Controller(persistance)
+        game_id = controller.start_game_session('player-1').game_id
+        controller.join_to_game_game_session('player-2', game_id)
+        game_state_dto = controller.start_game(game_id, 15, 19, 5)
+        self.assertEqual(15, len(game_state_dto.field))
+        self.assertEqual(19, len(game_state_dto.field[0]))
+        game = controller.persistance.get_game_info(game_id).game
+        self.assertEqual(5, game.game_state.win_length)
+
+    def test_get_hint(self):
+        persistance = GameStateInMemoryPersistence()
+        controller = Controller(persistance)
+        init_state = controller.start_game_session('player-1')
+        game_id = init_state.game_id
+        player_1 = init_state.active_player
+        player_2 = controller.join_to_game_game_session('player-2', game_id).active_player
+        self.assertIsNone(controller.get_hint(game_id))
+        controller.start_game(game_id)
+        controller.make_move(game_id, player_1.player_id, 0, 0)
+        self.assertEqual((1, 1), controller.get_hint(game_id))
+        controller.make_move(game_id, player_2.player_id, 1, 0)
+        controller.make_move(game_id, player_1.player_id, 0, 1)
+        controller.make_move(game_id, player_2.player_id, 1, 1)
+        self.assertEqual((0, 2), controller.get_hint(game_id))
+
+    def test_game_with_ai_player(self):
+        persistance = GameStateInMemoryPersistence()
+        controller = Controller(persistance)
+        init_state = controller.start_game_session('player-1')
+        game_id = init_state.game_id
+        player_1 = init_state.active_player
+        ai_player = controller.join_to_game_game_session('ai', game_id, PlayerType.AI_GOOD).active_player
+        self.assertEqual(PlayerType.AI_GOOD, ai_player.player_type)
+        controller.start_game(game_id)
+
+        game_state_dto = controller.make_move(game_id, player_1.player_id, 0, 0)
+        self.assertEqual(Sign.O, game_state_dto.field[1][1])
+        self.assertTrue(player_1.is_active)
+        for row, column in [(0, 1), (0, 2), (1, 0), (1, 2), (2, 0), (2, 1), (2, 2)]:
+            if game_state_dto.winner or game_state_dto.field[row][column] is not None:
+                continue
+            game_state_dto = controller.make_move(game_id, player_1.player_id, row, column)
+        self.assertIsNotNone(game_state_dto.winner)
+        self.assertNotEqual(player_1, game_state_dto.winner.player)
+        self.assertEqual({}, controller.ai_players)
+
+    def test_ai_players_are_bounded(self):
+        controller = Controller(GameStateInMemoryPersistence())
+        with patch('crossgame.api.controller.MAX_AI_PLAYERS', 2):
+            game_ids = []
+            for _ in range(3):
+                game_id = controller.start_game_session('player').game_id
+                controller.join_to_game_game_session('ai', game_id, PlayerType.AI_EASY)
+                controller.start_game(game_id, 5, 5)
+                game_ids.append(game_id)
+            # the first player X is human, so AI players are created on the moves of the human
+            for game_id in game_ids:
+                player = next(p for p in controller.persistance.get_game_info(game_id).players if p.is_active)
+                controller.make_move(game_id, player.player_id, 0, 0)
+        self.assertEqual(2, len(controller.ai_players))
+        self.assertTrue(all(isinstance(ai, EasyAI) for ai in controller.ai_players.values()))
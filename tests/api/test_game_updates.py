@@ -0,0 +1,78 @@
+import threading
+import time
+from unittest import TestCase
+
+from crossgame.api.codec import decode_game_info, encode_game_info
+from crossgame.api.controller import Controller
+from crossgame.api.game_updates import GameUpdateNotifier
+from crossgame.api.persistance import GameStateInMemoryPersistence
+
+
+class TestGameUpdateNotifier(TestCase):
+    def test_notification_after_watch_is_not_lost(self):
+        notifier = GameUpdateNotifier()
+        with notifier.watch('game-1') as watch:
+            notifier.notify('game-1')
+            self.assertTrue(watch.wait(0))
+            self.assertFalse(watch.wait(0.01))
+        self.assertEqual(0, len(notifier))
+
+    def test_other_games_are_not_notified(self):
+        notifier = GameUpdateNotifier()
+        with notifier.watch('game-1') as watch:
+            notifier.notify('game-2')
+            self.assertFalse(watch.wait(0.01))
+
+
+class CountingPersistence(GameStateInMemoryPersistence):
+    def __init__(self, is_shared):
+        GameStateInMemoryPersistence.__init__(self)
+        self.is_shared = is_shared
+        self.reads = 0
+
+    def get_game_info(self, game_id):
+        self.reads += 1
+        return GameStateInMemoryPersistence.get_game_info(self, game_id)
+
+
+class TestControllerUpdates(TestCase):
+    def setUp(self):
+        self.controller = Controller(GameStateInMemoryPersistence(), update_poll_interval=10)
+        self.first = self.controller.start_game_session('player-1')
+        self.game_id = self.first.game_id
+
+    def test_version_is_increased_by_changes(self):
+        self.assertEqual(0, self.controller.get_version(self.game_id))
+        self.controller.join_to_game_game_session('player-2', self.game_id)
+        self.controller.start_game(self.game_id)
+        self.controller.make_move(self.game_id, self.first.active_player.player_id, 0, 0)
+        self.assertEqual(3, self.controller.get_version(self.game_id))
+        info = self.controller.persistance.get_game_info(self.game_id)
+        self.assertEqual(3, decode_game_info(encode_game_info(info)).version)
+
+    def test_wait_for_update_returns_at_once_after_move(self):
+        self.controller.join_to_game_game_session('player-2', self.game_id)
+        self.controller.start_game(self.game_id)
+        version = self.controller.get_version(self.game_id)
+        timer = threading.Timer(0.05, self.controller.make_move,
+                                (self.game_id, self.first.active_player.player_id, 1, 1))
+        started = time.monotonic()
+        timer.start()
+        self.assertEqual(version + 1, self.controller.wait_for_update(self.game_id, version, 5))
+        self.assertLess(time.monotonic() - started, 2)
+        timer.join()
+
+    def test_version_is_polled_only_for_shared_persistence(self):
+        for is_shared, min_reads, max_reads in ((False, 2, 2), (True, 5, 1000)):
+            persistance = CountingPersistence(is_shared)
+            controller = Controller(persistance, update_poll_interval=0.01)
+            game_id = controller.start_game_session('player-1').game_id
+            persistance.reads = 0
+            self.assertEqual(0, controller.wait_for_update(game_id, 0, 0.2))
+            self.assertLessEqual(min_reads, persistance.reads)
+            self.assertGreaterEqual(max_reads, persistance.reads)
+
+    def test_wait_for_update_timeout(self):
+        self.assertEqual(0, self.controller.wait_for_update(self.game_id, 0, 0.01))
+        self.assertEqual(0, self.controller.wait_for_update(self.game_id, 5, 0.01))
+        self.assertEqual(0, len(self.controller.updates))
@@ -0,0 +1,116 @@
+import glob
+import os
+import tempfile
+import threading
+import uuid
+from unittest import TestCase
+
+from crossgame.api.controller import Controller
+from crossgame.api.journal_persistance import MOVE_RECORD, GameStateJournalPersistence
+from crossgame.api.persistance import SavedGameInfo
+from crossgame.api.player import Player, PlayerType
+from crossgame.exceptions.game_exceptions import GameNotFoundException
+from crossgame.logic.game import TicTacToeGameKInARow
+from crossgame.logic.game_enums import Sign
+
+
+class TestGameStateJournalPersistence(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.persistance = GameStateJournalPersistence(self.directory.name)
+
+    def tearDown(self):
+        self.persistance.close()
+        self.directory.cleanup()
+
+    def reopen(self, **kwargs):
+        self.persistance.close()
+        self.persistance = GameStateJournalPersistence(self.directory.name, **kwargs)
+        return self.persistance
+
+    def play(self, controller, moves):
+        init_state = controller.start_game_session('player-1')
+        game_id = init_state.game_id
+        player_2 = controller.join_to_game_game_session('player-2', game_id).active_player
+        controller.start_game(game_id)
+        player_ids = [init_state.active_player.player_id, player_2.player_id]
+        for index, (row, column) in enumerate(moves):
+            controller.make_move(game_id, player_ids[index % 2], row, column)
+        return game_id
+
+    def test_moves_are_fixed_size_records(self):
+        controller = Controller(self.persistance)
+        game_id = self.play(controller, [])
+        segment = self.persistance.segment
+        size = segment.tell()
+        controller.make_move(game_id, controller.get_status(game_id).active_player.player_id, 1, 1)
+        self.assertEqual(size + MOVE_RECORD.size, segment.tell())
+
+    def test_recovery_replays_journal(self):
+        game_id = self.play(Controller(self.persistance), [(1, 1), (0, 0), (2, 2)])
+        controller = Controller(self.reopen())
+        status = controller.get_status(game_id)
+        self.assertEqual(Sign.X, status.field[1][1])
+        self.assertEqual(Sign.O, status.field[0][0])
+        self.assertEqual(Sign.X, status.field[2][2])
+        self.assertEqual(Sign.O, status.active_player.sign)
+
+        controller.make_move(game_id, status.active_player.player_id, 0, 2)
+        self.assertEqual(Sign.O, Controller(self.reopen()).get_status(game_id).field[0][2])
+
+    def test_recovery_keeps_session_version_with_ai_replies(self):
+        controller = Controller(self.persistance)
+        game_id = controller.start_game_session('player-1').game_id
+        controller.join_to_game_game_session('ai', game_id, PlayerType.AI_EASY)
+        controller.start_game(game_id)
+        player_id = controller.get_status(game_id).active_player.player_id
+        controller.make_move(game_id, player_id, 1, 1)
+        version = controller.get_version(game_id)
+        self.assertEqual(version, Controller(self.reopen()).get_version(game_id))
+
+    def test_saves_from_threads(self):
+        self.reopen(snapshot_every=16, segment_size=256)
+        controller = Controller(self.persistance)
+        threads = [threading.Thread(target=self.play, args=(controller, [(1, 1), (0, 0), (2, 2)])) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(8, len(self.persistance.game_info_dict))
+        self.assertEqual(8, len(self.reopen().game_info_dict))
+
+    def test_snapshot_bounds_journal(self):
+        self.reopen(snapshot_every=4)
+        game_id = self.play(Controller(self.persistance), [(1, 1), (0, 0), (2, 2), (0, 1), (0, 2)])
+        self.assertEqual(1, len(glob.glob(os.path.join(self.directory.name, 'snapshot-*.bin'))))
+        self.assertEqual(1, len(glob.glob(os.path.join(self.directory.name, 'journal-*.log'))))
+
+        status = Controller(self.reopen()).get_status(game_id)
+        self.assertEqual(Sign.X, status.field[0][2])
+        self.assertEqual(Sign.O, status.field[0][1])
+
+    def test_truncated_tail_is_ignored(self):
+        game_id = self.play(Controller(self.persistance), [(1, 1), (0, 0)])
+        path = self.persistance.segment.name
+        self.persistance.close()
+        with open(path, 'r+b') as file:
+            file.truncate(os.path.getsize(path) - 3)
+
+        status = Controller(self.reopen()).get_status(game_id)
+        self.assertEqual(Sign.X, status.field[1][1])
+        self.assertIsNone(status.field[0][0])
+
+    def test_save_get_and_remove(self):
+        game_id = str(uuid.uuid4())
+        players = [Player('pl1', 'id-1', Sign.X, True), Player('pl2', 'id-2', Sign.O)]
+        game = TicTacToeGameKInARow(game_id, players, 5, 7, 3)
+        game.make_move('id-1', 4, 6)
+        self.persistance.save_game_info(game_id, SavedGameInfo(game_id, players, game, True))
+
+        info = self.reopen().get_game_info(game_id)
+        self.assertEqual(game.get_field(), info.game.get_field())
+        self.assertEqual(game.moves, info.game.moves)
+
+        self.persistance.remove_game_info(game_id)
+        self.assertRaises(GameNotFoundException, self.reopen().get_game_info, game_id)
+        self.assertRaises(ValueError, self.persistance.save_game_info, 'game-1', SavedGameInfo('game-1', []))
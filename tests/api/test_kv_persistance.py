@@ -0,0 +1,105 @@
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from crossgame.api.controller import Controller
+from crossgame.api.journal_persistance import GameStateJournalPersistence
+from crossgame.api.kv_persistance import GameStateKeyValuePersistence, KeyValueClient
+from crossgame.api.kv_server import STATUS_NOT_FOUND, STATUS_OK, KeyValueServer
+from crossgame.api.persistance import GameStateInMemoryPersistence
+from crossgame.api.persistance_registry import create_persistence
+from crossgame.api.sqlite_persistance import GameStateSqlitePersistence
+from crossgame.exceptions.game_exceptions import GameNotFoundException, GameVersionConflictException
+from crossgame.logic.game_enums import Sign
+
+
+class TestKeyValuePersistence(TestCase):
+    def setUp(self):
+        self.server = KeyValueServer(port=0)
+        self.port = self.server.run_in_thread()
+        self.client = KeyValueClient(port=self.port, pool_size=2)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+
+    def test_client_operations(self):
+        self.assertIsNone(self.client.get(b'key'))
+        self.client.set(b'key', b'value')
+        self.assertEqual(b'value', self.client.get(b'key'))
+        self.assertTrue(self.client.delete(b'key'))
+        self.assertFalse(self.client.delete(b'key'))
+
+    def test_set_if_newer(self):
+        self.assertTrue(self.client.set_if_newer(b'key', 0, b'first'))
+        self.assertFalse(self.client.set_if_newer(b'key', 0, b'second'))
+        self.assertTrue(self.client.set_if_newer(b'key', 2, b'third'))
+        self.assertFalse(self.client.set_if_newer(b'key', 1, b'fourth'))
+        self.assertEqual(b'third', self.client.get(b'key'))
+        self.client.delete(b'key')
+        self.assertTrue(self.client.set_if_newer(b'key', 0, b'fifth'))
+
+    def test_outdated_save_of_other_node_is_rejected(self):
+        controller = Controller(GameStateKeyValuePersistence(self.client))
+        init_state = controller.start_game_session('player-1')
+        controller.join_to_game_game_session('player-2', init_state.game_id)
+        controller.start_game(init_state.game_id)
+        persistance = controller.persistance
+        first_node = persistance.get_game_info(init_state.game_id)
+        second_node = persistance.get_game_info(init_state.game_id)
+        first_node.game.make_move(init_state.active_player.player_id, 1, 1)
+        first_node.version += 1
+        persistance.save_game_info(init_state.game_id, first_node)
+        second_node.game.make_move(init_state.active_player.player_id, 0, 0)
+        second_node.version += 1
+        self.assertRaises(GameVersionConflictException, persistance.save_game_info, init_state.game_id, second_node)
+        field = controller.get_status(init_state.game_id).field
+        self.assertEqual(Sign.X, field[1][1])
+        self.assertIsNone(field[0][0])
+
+    def test_pipeline(self):
+        with self.client.pipeline() as pipeline:
+            for index in range(100):
+                pipeline.set(f'key-{index}'.encode('utf-8'), bytes([index]))
+            pipeline.get(b'key-42')
+            pipeline.delete(b'missing')
+        self.assertEqual((STATUS_OK, bytes([42])), pipeline.results[100])
+        self.assertEqual(STATUS_NOT_FOUND, pipeline.results[101][0])
+        self.assertEqual(1, self.client.pool.qsize())
+
+    def test_controller_flow(self):
+        controller = Controller(GameStateKeyValuePersistence(self.client))
+        init_state = controller.start_game_session('player-1')
+        controller.join_to_game_game_session('player-2', init_state.game_id)
+        controller.start_game(init_state.game_id)
+        controller.make_move(init_state.game_id, init_state.active_player.player_id, 1, 1)
+
+        other_node = Controller(create_persistence(f'kv:127.0.0.1:{self.port}'))
+        status = other_node.get_status(init_state.game_id)
+        self.assertEqual(Sign.X, status.field[1][1])
+        self.assertEqual(Sign.O, status.active_player.sign)
+        self.assertEqual(3, other_node.get_version(init_state.game_id))
+
+        other_node.persistance.remove_game_info(init_state.game_id)
+        self.assertRaises(GameNotFoundException, controller.get_status, init_state.game_id)
+        self.assertRaises(GameNotFoundException, controller.get_version, init_state.game_id)
+
+
+class TestPersistenceRegistry(TestCase):
+    def test_create_by_config(self):
+        with tempfile.TemporaryDirectory() as directory:
+            sqlite = create_persistence(f'sqlite:{os.path.join(directory, "games.db")}')
+            self.assertIsInstance(sqlite, GameStateSqlitePersistence)
+            sqlite.close()
+            journal = create_persistence(f'journal:{directory}')
+            self.assertIsInstance(journal, GameStateJournalPersistence)
+            journal.close()
+        self.assertRaises(ValueError, create_persistence, 'sqlite')
+        self.assertRaises(ValueError, create_persistence, 'unknown')
+
+    def test_create_by_environment(self):
+        with patch.dict(os.environ, {'CROSSGAME_PERSISTENCE': 'memory'}):
+            self.assertIsInstance(create_persistence(default='sqlite'), GameStateInMemoryPersistence)
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertIsInstance(create_persistence(), GameStateInMemoryPersistence)
@@ -0,0 +1,136 @@
+from unittest import TestCase
+
+from crossgame.api.persistance import GameStateInMemoryPersistence, SavedGameInfo, SessionStatus
+from crossgame.api.player import Player
+from crossgame.exceptions.game_exceptions import GameNotFoundException
+from crossgame.logic.game import TicTacToeGameClassic
+from crossgame.logic.game_enums import Sign
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def create_game_info(game_id, finished=False):
+    players = [Player('pl1', f'{game_id}-1', Sign.X, True), Player('pl2', f'{game_id}-2', Sign.O)]
+    game = TicTacToeGameClassic(game_id, players)
+    if finished:
+        for player_id, row, column in [(0, 0, 0), (1, 1, 0), (0, 0, 1), (1, 1, 1), (0, 0, 2)]:
+            game.make_move(players[player_id].player_id, row, column)
+    return SavedGameInfo(game_id, players, game, True)
+
+
+class TestGameStateInMemoryPersistence(TestCase):
+    def test_save_get_remove(self):
+        persistance = GameStateInMemoryPersistence()
+        info = create_game_info('game-1')
+        persistance.save_game_info('game-1', info)
+        self.assertIs(info, persistance.get_game_info('game-1'))
+        persistance.remove_game_info('game-1')
+        self.assertRaises(GameNotFoundException, persistance.get_game_info, 'game-1')
+        persistance.remove_game_info('game-1')
+
+    def test_lru_eviction(self):
+        persistance = GameStateInMemoryPersistence(max_games=2)
+        persistance.save_game_info('game-1', create_game_info('game-1'))
+        persistance.save_game_info('game-2', create_game_info('game-2'))
+        persistance.get_game_info('game-1')
+        persistance.save_game_info('game-3', create_game_info('game-3'))
+        self.assertEqual(['game-1', 'game-3'], list(persistance.game_info_dict))
+        self.assertEqual(1, persistance.stats.lru_evictions)
+
+    def test_idle_ttl(self):
+        clock = FakeClock()
+        persistance = GameStateInMemoryPersistence(idle_ttl=10, clock=clock)
+        persistance.save_game_info('game-1', create_game_info('game-1'))
+        clock.now = 5
+        persistance.save_game_info('game-2', create_game_info('game-2'))
+        clock.now = 9
+        persistance.get_game_info('game-1')
+        clock.now = 16
+        self.assertRaises(GameNotFoundException, persistance.get_game_info, 'game-2')
+        self.assertEqual(['game-1'], list(persistance.game_info_dict))
+        self.assertEqual(1, persistance.stats.idle_expirations)
+
+    def test_sweep_on_other_operations(self):
+        clock = FakeClock()
+        persistance = GameStateInMemoryPersistence(idle_ttl=10, clock=clock)
+        for i in range(5):
+            persistance.save_game_info(f'game-{i}', create_game_info(f'game-{i}'))
+        clock.now = 20
+        persistance.save_game_info('game-new', create_game_info('game-new'))
+        self.assertEqual(['game-new'], list(persistance.game_info_dict))
+        self.assertEqual(5, persistance.stats.idle_expirations)
+
+    def test_finished_ttl(self):
+        clock = FakeClock()
+        persistance = GameStateInMemoryPersistence(finished_ttl=10, clock=clock)
+        persistance.save_game_info('game-1', create_game_info('game-1', finished=True))
+        persistance.save_game_info('game-2', create_game_info('game-2'))
+        clock.now = 11
+        persistance.get_game_info('game-2')
+        self.assertRaises(GameNotFoundException, persistance.get_game_info, 'game-1')
+        self.assertEqual(1, persistance.stats.finished_expirations)
+        self.assertEqual(0, persistance.stats.idle_expirations)
+
+
+class TestInMemoryPersistenceIndexes(TestCase):
+    def test_status_index_follows_saves(self):
+        persistance = GameStateInMemoryPersistence()
+        players = [Player('pl1', 'waiting-1', Sign.X, True)]
+        waiting = SavedGameInfo('waiting', players)
+        persistance.save_game_info('waiting', waiting)
+        persistance.save_game_info('game-1', create_game_info('game-1'))
+        persistance.save_game_info('game-2', create_game_info('game-2', finished=True))
+        self.assertEqual(['waiting'], persistance.get_game_ids_by_status(SessionStatus.WAITING))
+        self.assertEqual(['game-1'], persistance.get_game_ids_by_status(SessionStatus.IN_PROGRESS))
+        self.assertEqual(['game-2'], persistance.get_game_ids_by_status(SessionStatus.FINISHED))
+        self.assertEqual(['waiting'], persistance.get_open_game_ids())
+
+        players.append(Player('pl2', 'waiting-2', Sign.O))
+        persistance.save_game_info('waiting', waiting)
+        self.assertEqual([], persistance.get_open_game_ids())
+        waiting.game = TicTacToeGameClassic('waiting', players)
+        waiting.is_started = True
+        persistance.save_game_info('waiting', waiting)
+        self.assertEqual([], persistance.get_game_ids_by_status(SessionStatus.WAITING))
+        self.assertEqual(['game-1', 'waiting'], persistance.get_game_ids_by_status(SessionStatus.IN_PROGRESS))
+        self.assertEqual(['game-1'], persistance.get_game_ids_by_status(SessionStatus.IN_PROGRESS, limit=1))
+
+    def test_player_index(self):
+        persistance = GameStateInMemoryPersistence()
+        persistance.save_game_info('game-1', create_game_info('game-1'))
+        self.assertEqual(['game-1'], persistance.get_game_ids_by_player('game-1-2'))
+        self.assertEqual([], persistance.get_game_ids_by_player('unknown'))
+        persistance.remove_game_info('game-1')
+        self.assertEqual([], persistance.get_game_ids_by_player('game-1-2'))
+        self.assertEqual({}, persistance.player_games)
+        self.assertEqual([], persistance.get_game_ids_by_status(SessionStatus.IN_PROGRESS))
+
+    def test_indexes_of_evicted_games_are_removed(self):
+        clock = FakeClock()
+        persistance = GameStateInMemoryPersistence(max_games=2, idle_ttl=10, clock=clock)
+        for i in range(3):
+            persistance.save_game_info(f'game-{i}', create_game_info(f'game-{i}'))
+        self.assertEqual(['game-1', 'game-2'], persistance.get_game_ids_by_status(SessionStatus.IN_PROGRESS))
+        self.assertEqual([], persistance.get_game_ids_by_player('game-0-1'))
+        clock.now = 20
+        self.assertRaises(GameNotFoundException, persistance.get_game_info, 'game-1')
+        self.assertEqual({}, persistance.indexed_keys)
+
+    def test_recent_games(self):
+        persistance = GameStateInMemoryPersistence()
+        for i in range(3):
+            persistance.save_game_info(f'game-{i}', create_game_info(f'game-{i}'))
+        persistance.get_game_info('game-0')
+        self.assertEqual(['game-0', 'game-2', 'game-1'], persistance.get_recent_game_ids())
+        self.assertEqual(['game-0'], persistance.get_recent_game_ids(1))
+
+    def test_saved_game_info_player_lookup(self):
+        info = create_game_info('game-1')
+        self.assertEqual('pl2', info.get_player('game-1-2').player_name)
+        self.assertIsNone(info.get_player('unknown'))
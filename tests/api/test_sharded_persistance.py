@@ -0,0 +1,113 @@
+import threading
+from unittest import TestCase
+
+from crossgame.api.controller import Controller
+from crossgame.api.game_locks import GameLockRegistry
+from crossgame.api.persistance import SavedGameInfo, SessionStatus
+from crossgame.api.player import Player
+from crossgame.api.sharded_persistance import GameStateShardedPersistence
+from crossgame.exceptions.game_exceptions import CurrentPlayerCantMakeAmoveException, GameNotFoundException
+from crossgame.logic.game_enums import Sign
+
+
+class TestGameStateShardedPersistence(TestCase):
+    def test_save_get_and_remove(self):
+        persistance = GameStateShardedPersistence(shards=4)
+        for index in range(20):
+            persistance.save_game_info(f'game-{index}', SavedGameInfo(f'game-{index}', []))
+        self.assertEqual(20, len(persistance))
+        self.assertTrue(all(shard.game_info_dict for _, shard in persistance.shards))
+        self.assertEqual('game-7', persistance.get_game_info('game-7').game_id)
+        removed = []
+        persistance.add_removal_listener(removed.append)
+        persistance.remove_game_info('game-7')
+        self.assertRaises(GameNotFoundException, persistance.get_game_info, 'game-7')
+        self.assertEqual(['game-7'], removed)
+
+    def test_max_games_is_divided_between_shards(self):
+        persistance = GameStateShardedPersistence(shards=4, max_games=8)
+        for index in range(100):
+            persistance.save_game_info(f'game-{index}', SavedGameInfo(f'game-{index}', []))
+        self.assertLessEqual(len(persistance), 8)
+        self.assertEqual(100 - len(persistance), persistance.stats.lru_evictions)
+
+    def test_indexes_over_shards(self):
+        persistance = GameStateShardedPersistence(shards=4)
+        for index in range(10):
+            players = [Player('pl1', f'player-{index}', Sign.X, True)]
+            persistance.save_game_info(f'game-{index}', SavedGameInfo(f'game-{index}', players))
+        self.assertEqual(['game-3'], persistance.get_game_ids_by_player('player-3'))
+        self.assertEqual(10, len(persistance.get_game_ids_by_status(SessionStatus.WAITING)))
+        self.assertEqual(3, len(persistance.get_open_game_ids(limit=3)))
+        persistance.get_game_info('game-5')
+        self.assertEqual('game-5', persistance.get_recent_game_ids(1)[0])
+        self.assertEqual(10, len(persistance.get_recent_game_ids()))
+
+    def test_limited_lists_are_ordered_over_shards(self):
+        ticks = iter(range(1000))
+        persistance = GameStateShardedPersistence(shards=4, clock=lambda: next(ticks))
+        game_ids = [f'game-{index}' for index in range(12)]
+        for game_id in game_ids:
+            persistance.save_game_info(game_id, SavedGameInfo(game_id, [Player('pl1', 'player', Sign.X, True)]))
+        self.assertEqual(game_ids[:5], persistance.get_open_game_ids(limit=5))
+        self.assertEqual(game_ids[:5], persistance.get_game_ids_by_status(SessionStatus.WAITING, 5))
+        self.assertEqual(game_ids, persistance.get_open_game_ids())
+
+    def test_games_from_many_threads(self):
+        controller = Controller(GameStateShardedPersistence())
+        errors = []
+
+        def play():
+            try:
+                init_state = controller.start_game_session('player-1')
+                player_2 = controller.join_to_game_game_session('player-2', init_state.game_id).active_player
+                controller.start_game(init_state.game_id)
+                for index, (row, column) in enumerate([(0, 0), (1, 1), (0, 1), (2, 2), (0, 2)]):
+                    player_id = player_2.player_id if index % 2 else init_state.active_player.player_id
+                    state = controller.make_move(init_state.game_id, player_id, row, column)
+                if state.winner.sign != Sign.X:
+                    errors.append(state)
+            except Exception as error:  # pylint: disable=broad-except
+                errors.append(error)
+
+        threads = [threading.Thread(target=play) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([], errors)
+
+
+class TestGameLocks(TestCase):
+    def test_lock_per_game(self):
+        registry = GameLockRegistry(stripes=2)
+        lock = registry.get('game-1')
+        self.assertIs(lock, registry.get('game-1'))
+        self.assertIsNot(lock, registry.get('game-2'))
+        del lock
+        self.assertEqual(0, sum(len(locks) for _, locks in registry.stripes))
+
+    def test_concurrent_moves_of_one_player(self):
+        controller = Controller(GameStateShardedPersistence())
+        init_state = controller.start_game_session('player-1')
+        controller.join_to_game_game_session('player-2', init_state.game_id)
+        controller.start_game(init_state.game_id)
+        barrier = threading.Barrier(8)
+        results = []
+
+        def move(column):
+            barrier.wait()
+            try:
+                controller.make_move(init_state.game_id, init_state.active_player.player_id, column // 3, column % 3)
+                results.append(True)
+            except CurrentPlayerCantMakeAmoveException:
+                results.append(False)
+
+        threads = [threading.Thread(target=move, args=(index,)) for index in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(1, results.count(True))
+        field = controller.get_status(init_state.game_id).field
+        self.assertEqual(1, sum(sign is not None for row in field for sign in row))
@@ -0,0 +1,124 @@
+import fcntl
+import multiprocessing
+import os
+import tempfile
+import threading
+import uuid
+from unittest import TestCase
+
+from crossgame.api.codec import encode_game_info, get_max_encoded_size
+from crossgame.api.controller import Controller
+from crossgame.api.persistance import SavedGameInfo
+from crossgame.api.player import Player
+from crossgame.logic.game import TicTacToeGame
+from crossgame.api.shared_memory_persistance import GameStateSharedMemoryPersistence
+from crossgame.exceptions.game_exceptions import (GameNotFoundException, IncorrectFieldSizeException,
+                                                  StorageIsFullException)
+from crossgame.logic.game_enums import Sign
+
+
+def make_move_in_other_process(name, lock_path, game_id, player_id):
+    persistance = GameStateSharedMemoryPersistence(name, slots=8, lock_path=lock_path)
+    Controller(persistance).make_move(game_id, player_id, 0, 0)
+    persistance.close()
+
+
+def hold_game_lock(name, lock_path, game_id, locked, release):
+    persistance = GameStateSharedMemoryPersistence(name, slots=8, lock_path=lock_path)
+    with persistance.game_locks.get(game_id):
+        locked.set()
+        release.wait(5)
+    persistance.close()
+
+
+class TestGameStateSharedMemoryPersistence(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.name = f'crossgame-test-{uuid.uuid4().hex[:8]}'
+        self.lock_path = os.path.join(self.directory.name, 'games.lock')
+        self.persistance = GameStateSharedMemoryPersistence(self.name, slots=8, lock_path=self.lock_path)
+
+    def tearDown(self):
+        self.persistance.close()
+        self.persistance.unlink()
+        self.directory.cleanup()
+
+    def test_save_get_and_remove(self):
+        for index in range(8):
+            self.persistance.save_game_info(f'game-{index}', SavedGameInfo(f'game-{index}', []))
+        self.assertRaises(StorageIsFullException, self.persistance.save_game_info, 'game-8',
+                          SavedGameInfo('game-8', []))
+        self.persistance.remove_game_info('game-3')
+        self.assertRaises(GameNotFoundException, self.persistance.get_game_info, 'game-3')
+        self.persistance.save_game_info('game-8', SavedGameInfo('game-8', [], is_started=True, version=2))
+        self.assertTrue(self.persistance.get_game_info('game-8').is_started)
+        self.assertEqual(2, self.persistance.get_game_version('game-8'))
+        self.assertRaises(GameNotFoundException, self.persistance.get_game_version, 'game-3')
+        for index in (0, 1, 2, 4, 5, 6, 7):
+            self.assertEqual(f'game-{index}', self.persistance.get_game_info(f'game-{index}').game_id)
+
+    def test_new_games_from_threads_take_different_slots(self):
+        threads = [threading.Thread(target=self.persistance.save_game_info,
+                                    args=(f'game-{index}', SavedGameInfo(f'game-{index}', [])))
+                   for index in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for index in range(8):
+            self.assertEqual(f'game-{index}', self.persistance.get_game_info(f'game-{index}').game_id)
+
+    def test_max_encoded_size(self):
+        players = [Player('pl1', 'id-1', Sign.X, True), Player('pl2', 'id-2', Sign.O)]
+        game_info = SavedGameInfo('game-1', players, TicTacToeGame('game-1', players), True)
+        max_size = get_max_encoded_size(game_info)
+        # draw, all the cells are taken
+        for player_id, row, column in [('id-1', 0, 0), ('id-2', 1, 1), ('id-1', 2, 2), ('id-2', 0, 1), ('id-1', 2, 1),
+                                       ('id-2', 2, 0), ('id-1', 0, 2), ('id-2', 1, 2), ('id-1', 1, 0)]:
+            game_info.game.make_move(player_id, row, column)
+        self.assertEqual(max_size, len(encode_game_info(game_info)))
+
+    def test_too_big_game_is_rejected_at_start(self):
+        controller = Controller(self.persistance)
+        init_state = controller.start_game_session('player-1')
+        controller.join_to_game_game_session('player-2', init_state.game_id)
+        self.assertRaises(IncorrectFieldSizeException, controller.start_game, init_state.game_id, 30, 30, 5)
+        self.assertFalse(self.persistance.get_game_info(init_state.game_id).is_started)
+        controller.start_game(init_state.game_id, 15, 15, 5)
+        self.assertTrue(self.persistance.get_game_info(init_state.game_id).is_started)
+
+    def test_other_layout(self):
+        self.assertRaises(ValueError, GameStateSharedMemoryPersistence, self.name, slots=16,
+                          lock_path=self.lock_path)
+
+    def test_game_is_shared_between_processes(self):
+        controller = Controller(self.persistance)
+        init_state = controller.start_game_session('player-1')
+        controller.join_to_game_game_session('player-2', init_state.game_id)
+        controller.start_game(init_state.game_id)
+
+        process = multiprocessing.get_context('spawn').Process(
+            target=make_move_in_other_process,
+            args=(self.name, self.lock_path, init_state.game_id, init_state.active_player.player_id))
+        process.start()
+        process.join(30)
+        self.assertEqual(0, process.exitcode)
+        status = controller.get_status(init_state.game_id)
+        self.assertEqual(Sign.X, status.field[0][0])
+        self.assertEqual(Sign.O, status.active_player.sign)
+
+    def test_game_lock_is_shared_between_processes(self):
+        context = multiprocessing.get_context('spawn')
+        locked, release = context.Event(), context.Event()
+        process = context.Process(target=hold_game_lock,
+                                  args=(self.name, self.lock_path, 'game-1', locked, release))
+        process.start()
+        try:
+            self.assertTrue(locked.wait(30))
+            lock = self.persistance.game_locks.get('game-1')
+            self.assertRaises(OSError, fcntl.lockf, lock.fd, fcntl.LOCK_EX | fcntl.LOCK_NB, 1, lock.offset)
+        finally:
+            release.set()
+            process.join(30)
+        with lock:
+            self.assertEqual(1, lock.count)
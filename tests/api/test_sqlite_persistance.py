@@ -0,0 +1,116 @@
+import fcntl
+import multiprocessing
+import os
+import tempfile
+import threading
+from unittest import TestCase
+
+from crossgame.api.codec import decode_players, encode_players
+from crossgame.api.controller import Controller
+from crossgame.api.persistance import SavedGameInfo
+from crossgame.api.player import Player, PlayerType
+from crossgame.api.sqlite_persistance import GameStateSqlitePersistence
+from crossgame.exceptions.game_exceptions import GameNotFoundException
+from crossgame.logic.game import TicTacToeGameKInARow
+from crossgame.logic.game_enums import Sign
+
+
+def hold_game_lock(path, game_id, locked, release):
+    persistance = GameStateSqlitePersistence(path)
+    with persistance.game_locks.get(game_id):
+        locked.set()
+        release.wait(5)
+    persistance.close()
+
+
+class TestGameStateSqlitePersistence(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'games.db')
+        self.persistance = GameStateSqlitePersistence(self.path)
+
+    def tearDown(self):
+        self.persistance.close()
+        self.directory.cleanup()
+
+    def test_players_encoding(self):
+        players = [Player('Гравець', 'id-1', Sign.X, True),
+                   Player('ai', 'id-2', Sign.O, False, PlayerType.AI_EASY)]
+        decoded = decode_players(encode_players(players))
+        self.assertEqual([vars(player) for player in players], [vars(player) for player in decoded])
+
+    def test_save_and_get_session(self):
+        self.persistance.save_game_info('game-1', SavedGameInfo('game-1', [Player('pl1', 'id-1', Sign.X, True)]))
+        info = self.persistance.get_game_info('game-1')
+        self.assertFalse(info.is_started)
+        self.assertIsNone(info.game)
+        self.assertEqual('pl1', info.players[0].player_name)
+
+    def test_save_and_get_game(self):
+        players = [Player('pl1', 'id-1', Sign.X, True), Player('pl2', 'id-2', Sign.O)]
+        game = TicTacToeGameKInARow('game-1', players, 5, 7, 3)
+        for player_id, row, column in [('id-1', 0, 0), ('id-2', 4, 6), ('id-1', 1, 1), ('id-2', 3, 6)]:
+            game.make_move(player_id, row, column)
+        self.persistance.save_game_info('game-1', SavedGameInfo('game-1', players, game, True))
+
+        info = GameStateSqlitePersistence(self.path).get_game_info('game-1')
+        self.assertTrue(info.is_started)
+        self.assertEqual(game.get_field(), info.game.get_field())
+        self.assertIs(info.players, info.game.players)
+        self.assertTrue(info.players[0].is_active)
+        state_dto = info.game.make_move('id-1', 2, 2)
+        self.assertEqual('pl1', state_dto.winner.player.player_name)
+
+    def test_version_column(self):
+        self.persistance.save_game_info('game-1', SavedGameInfo('game-1', [], version=4))
+        self.assertEqual(4, self.persistance.get_game_version('game-1'))
+        self.assertRaises(GameNotFoundException, self.persistance.get_game_version, 'game-2')
+
+    def test_remove(self):
+        self.persistance.save_game_info('game-1', SavedGameInfo('game-1', []))
+        self.persistance.remove_game_info('game-1')
+        self.assertRaises(GameNotFoundException, self.persistance.get_game_info, 'game-1')
+        self.persistance.remove_game_info('game-1')
+
+    def test_controller_flow_from_other_thread(self):
+        controller = Controller(self.persistance)
+        init_state = controller.start_game_session('player-1')
+        game_id = init_state.game_id
+        player_2 = controller.join_to_game_game_session('player-2', game_id).active_player
+        controller.start_game(game_id)
+        controller.make_move(game_id, init_state.active_player.player_id, 1, 1)
+
+        results = []
+        thread = threading.Thread(target=lambda: results.append(controller.make_move(game_id, player_2.player_id,
+                                                                                    0, 0)))
+        thread.start()
+        thread.join()
+        field = controller.get_status(game_id).field
+        self.assertEqual(Sign.X, field[1][1])
+        self.assertEqual(Sign.O, field[0][0])
+        self.assertEqual(2, len(self.persistance.connections))
+
+    def test_in_memory_database_is_shared_between_threads(self):
+        persistance = GameStateSqlitePersistence(':memory:')
+        persistance.save_game_info('game-1', SavedGameInfo('game-1', [], version=2))
+        results = []
+        thread = threading.Thread(target=lambda: results.append(persistance.get_game_version('game-1')))
+        thread.start()
+        thread.join()
+        self.assertEqual([2], results)
+        self.assertEqual(1, len(persistance.connections))
+        persistance.close()
+
+    def test_game_lock_is_shared_between_processes(self):
+        context = multiprocessing.get_context('spawn')
+        locked, release = context.Event(), context.Event()
+        process = context.Process(target=hold_game_lock, args=(self.path, 'game-1', locked, release))
+        process.start()
+        try:
+            self.assertTrue(locked.wait(30))
+            lock = self.persistance.game_locks.get('game-1')
+            self.assertRaises(OSError, fcntl.lockf, lock.fd, fcntl.LOCK_EX | fcntl.LOCK_NB, 1, lock.offset)
+        finally:
+            release.set()
+            process.join(30)
+        self.assertIs(self.persistance.game_locks, Controller(self.persistance).game_locks)
@@ -0,0 +1,142 @@
+import os
+import tempfile
+import threading
+import time
+from unittest import TestCase
+
+from crossgame.api.codec import decode_game_info, encode_game_info
+from crossgame.api.controller import Controller
+from crossgame.api.persistance import GameStateInMemoryPersistence, SavedGameInfo
+from crossgame.api.persistance_registry import create_persistence
+from crossgame.api.sqlite_persistance import GameStateSqlitePersistence
+from crossgame.api.write_behind_persistance import WriteBehindPersistence
+from crossgame.exceptions.game_exceptions import GameNotFoundException
+from crossgame.logic.game_enums import Sign
+
+
+class FailingPersistence(GameStateInMemoryPersistence):
+    def save_game_info(self, game_id, game_info):
+        raise OSError('disk is full')
+
+
+class CopyingPersistence(GameStateInMemoryPersistence):
+    def __init__(self):
+        GameStateInMemoryPersistence.__init__(self)
+        self.is_failing = False
+
+    def save_game_info(self, game_id, game_info):
+        if self.is_failing:
+            raise OSError('disk is full')
+        GameStateInMemoryPersistence.save_game_info(self, game_id, game_info)
+
+    def get_game_info(self, game_id):
+        return decode_game_info(encode_game_info(GameStateInMemoryPersistence.get_game_info(self, game_id)))
+
+
+class CountingPersistence(GameStateInMemoryPersistence):
+    def __init__(self):
+        GameStateInMemoryPersistence.__init__(self)
+        self.saves = 0
+        self.release = threading.Event()
+
+    def save_game_info(self, game_id, game_info):
+        self.release.wait(5)
+        self.saves += 1
+        GameStateInMemoryPersistence.save_game_info(self, game_id, game_info)
+
+
+class TestWriteBehindPersistence(TestCase):
+    def test_saves_are_coalesced(self):
+        backend = CountingPersistence()
+        persistance = WriteBehindPersistence(backend, batch_size=1000, flush_interval=60)
+        controller = Controller(persistance)
+        init_state = controller.start_game_session('player-1')
+        player_2 = controller.join_to_game_game_session('player-2', init_state.game_id).active_player
+        controller.start_game(init_state.game_id)
+        controller.make_move(init_state.game_id, init_state.active_player.player_id, 1, 1)
+        controller.make_move(init_state.game_id, player_2.player_id, 0, 0)
+        self.assertRaises(GameNotFoundException, backend.get_game_info, init_state.game_id)
+
+        backend.release.set()
+        persistance.flush()
+        self.assertEqual(1, backend.saves)
+        saved = backend.get_game_info(init_state.game_id)
+        self.assertIsNot(saved, persistance.get_game_info(init_state.game_id))
+        self.assertEqual(Sign.O, saved.game.get_field()[0][0])
+        persistance.close()
+
+    def test_flush_by_interval_and_remove(self):
+        backend = GameStateInMemoryPersistence()
+        persistance = WriteBehindPersistence(backend, flush_interval=0.01, wait_for_flush=False)
+        persistance.save_game_info('game-1', SavedGameInfo('game-1', []))
+        persistance.remove_game_info('game-1')
+        persistance.save_game_info('game-2', SavedGameInfo('game-2', []))
+        self.assertRaises(GameNotFoundException, persistance.get_game_info, 'game-1')
+        persistance.close()
+        self.assertRaises(GameNotFoundException, backend.get_game_info, 'game-1')
+        self.assertEqual('game-2', backend.get_game_info('game-2').game_id)
+
+    def test_reads_missing_games_from_backend(self):
+        backend = GameStateInMemoryPersistence()
+        backend.save_game_info('game-1', SavedGameInfo('game-1', []))
+        persistance = WriteBehindPersistence(backend)
+        self.assertIs(backend.get_game_info('game-1'), persistance.get_game_info('game-1'))
+        persistance.close()
+
+    def test_ack_after_flush(self):
+        persistance = WriteBehindPersistence(FailingPersistence(), wait_for_flush=True)
+        self.assertRaises(OSError, persistance.save_game_info, 'game-1', SavedGameInfo('game-1', []))
+        self.assertRaises(GameNotFoundException, persistance.get_game_info, 'game-1')
+        persistance.close()
+
+    def test_failed_ack_drops_changed_hot_copy(self):
+        backend = CopyingPersistence()
+        backend.save_game_info('game-1', SavedGameInfo('game-1', []))
+        persistance = WriteBehindPersistence(backend, wait_for_flush=True)
+        game_info = persistance.get_game_info('game-1')
+        game_info.is_started = True
+        backend.is_failing = True
+        self.assertRaises(OSError, persistance.save_game_info, 'game-1', game_info)
+        self.assertFalse(persistance.get_game_info('game-1').is_started)
+        persistance.close()
+
+    def test_hot_copy_is_bounded(self):
+        backend = CountingPersistence()
+        persistance = WriteBehindPersistence(backend, batch_size=1000, flush_interval=60, max_games=2)
+        for index in range(5):
+            persistance.save_game_info(f'game-{index}', SavedGameInfo(f'game-{index}', [], is_started=True))
+        self.assertEqual(['game-3', 'game-4'], list(persistance.game_info_dict))
+        # evicted dirty game is read from the dirty copy, not from the stale backend
+        self.assertTrue(persistance.get_game_info('game-0').is_started)
+        backend.release.set()
+        persistance.close()
+        self.assertEqual(5, backend.saves)
+
+    def test_evicted_game_is_read_while_its_batch_is_written(self):
+        backend = CountingPersistence()
+        persistance = WriteBehindPersistence(backend, batch_size=5, flush_interval=60, max_games=2)
+        for index in range(5):
+            persistance.save_game_info(f'game-{index}', SavedGameInfo(f'game-{index}', [], is_started=True))
+        deadline = time.monotonic() + 5
+        while not persistance.in_flight and time.monotonic() < deadline:
+            time.sleep(0.001)
+        self.assertEqual({}, persistance.dirty)
+        # the writer waits in the backend, the game is neither dirty nor saved yet
+        self.assertTrue(persistance.get_game_info('game-0').is_started)
+        backend.release.set()
+        persistance.close()
+        self.assertEqual({}, persistance.in_flight)
+        self.assertEqual(5, backend.saves)
+
+    def test_batch_to_sqlite(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'games.db')
+            persistance = create_persistence(f'write-behind:sqlite:{path}')
+            for index in range(10):
+                persistance.save_game_info(f'game-{index}', SavedGameInfo(f'game-{index}', []))
+            persistance.close()
+            self.assertEqual(1, persistance.batches)
+            sqlite = GameStateSqlitePersistence(path)
+            self.assertEqual('game-9', sqlite.get_game_info('game-9').game_id)
+            sqlite.close()
+            persistance.backend.close()
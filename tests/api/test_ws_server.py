@@ -0,0 +1,132 @@
+import base64
+import json
+import os
+import socket
+import struct
+import time
+from unittest import TestCase
+
+from crossgame.api.controller import Controller
+from crossgame.api.game_updates import MoveDelta
+from crossgame.api.persistance import GameStateInMemoryPersistence
+from crossgame.api.ws_server import GameWebSocketServer, encode_moves, get_accept_key, unmask
+from crossgame.logic.game_enums import Sign
+
+
+class WebSocketClient:
+    def __init__(self, port, path):
+        self.connection = socket.create_connection(('127.0.0.1', port), 5)
+        key = base64.b64encode(os.urandom(16)).decode('ascii')
+        self.connection.sendall(f'GET {path} HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\n'
+                                f'Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\n'
+                                'Sec-WebSocket-Version: 13\r\n\r\n'.encode('ascii'))
+        response = b''
+        while not response.endswith(b'\r\n\r\n'):
+            response += self.connection.recv(1)
+        self.status = int(response.split(b' ')[1])
+        self.accept_key = get_accept_key(key)
+        self.response = response.decode('latin-1')
+
+    def send(self, message, opcode=0x1):
+        payload = json.dumps(message).encode('utf-8') if opcode == 0x1 else message
+        mask = os.urandom(4)
+        self.connection.sendall(bytes((0x80 | opcode, 0x80 | len(payload))) + mask + unmask(payload, mask))
+
+    def receive(self):
+        first, length = self.__receive(2)
+        if length == 126:
+            (length,) = struct.unpack('!H', self.__receive(2))
+        payload = self.__receive(length)
+        return json.loads(payload) if first & 0x0F == 0x1 else (first & 0x0F, payload)
+
+    def close(self):
+        self.connection.close()
+
+    def __receive(self, size):
+        data = b''
+        while len(data) < size:
+            chunk = self.connection.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError()
+            data += chunk
+        return data
+
+
+class TestGameWebSocketServer(TestCase):
+    def setUp(self):
+        self.controller = Controller(GameStateInMemoryPersistence())
+        self.server = GameWebSocketServer(self.controller, port=0)
+        self.port = self.server.run_in_thread()
+        self.first = self.controller.start_game_session('player-1')
+        self.game_id = self.first.game_id
+        self.second = self.controller.join_to_game_game_session('player-2', self.game_id)
+        self.controller.start_game(self.game_id)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def connect(self, player_id=None):
+        query = f'?player_id={player_id}' if player_id else ''
+        client = WebSocketClient(self.port, f'/games/{self.game_id}{query}')
+        self.assertEqual(101, client.status)
+        self.assertIn(client.accept_key, client.response)
+        self.assertEqual({'version': 2, 'moves': []}, client.receive())
+        return client
+
+    def test_moves_are_pushed_to_all_subscribers(self):
+        player_1 = self.connect(self.first.active_player.player_id)
+        viewer = self.connect()
+        player_1.send({'row': 1, 'column': 1})
+        expected = {'version': 3, 'moves': [[1, 1, 'X']]}
+        self.assertEqual(expected, player_1.receive())
+        self.assertEqual(expected, viewer.receive())
+        self.controller.make_move(self.game_id, self.second.active_player.player_id, 0, 0)
+        self.assertEqual({'version': 4, 'moves': [[0, 0, 'O']]}, viewer.receive())
+        player_1.close()
+        viewer.close()
+
+    def test_errors_are_sent_to_the_client(self):
+        player_2 = self.connect(self.second.active_player.player_id)
+        player_2.send({'row': 1, 'column': 1})
+        self.assertEqual('CurrentPlayerCantMakeAmoveException', player_2.receive()['error'])
+        player_1 = self.connect(self.first.active_player.player_id)
+        player_1.send({'row': -1, 'column': 1})
+        self.assertEqual('ValueError', player_1.receive()['error'])
+        player_1.send({'row': 3, 'column': 1})
+        self.assertEqual('IndexError', player_1.receive()['error'])
+        player_1.send({'row': True, 'column': 1})
+        self.assertEqual('ValueError', player_1.receive()['error'])
+        player_1.close()
+        viewer = self.connect()
+        viewer.send({'row': 1, 'column': 1})
+        self.assertEqual('ValueError', viewer.receive()['error'])
+        viewer.send(b'ping', opcode=0x9)
+        self.assertEqual((0xA, b'ping'), viewer.receive())
+        player_2.close()
+        viewer.close()
+
+    def test_unknown_game_and_path(self):
+        self.assertEqual(404, WebSocketClient(self.port, '/games/unknown').status)
+        self.assertEqual(400, WebSocketClient(self.port, '/other').status)
+
+    def test_subscribers_are_removed_after_close(self):
+        client = self.connect()
+        self.assertEqual(1, len(self.server.hub.subscribers))
+        client.send(b'', opcode=0x8)
+        self.assertEqual(0x8, client.receive()[0])
+        client.close()
+        deadline = time.monotonic() + 2
+        while self.server.hub.subscribers and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual({}, self.server.hub.subscribers)
+
+    def test_taken_port_is_reported(self):
+        other = GameWebSocketServer(self.controller, port=self.port)
+        self.assertRaises(OSError, other.run_in_thread)
+        self.assertEqual([self.server.hub.on_moves], self.controller.move_listeners)
+        other.stop()
+
+    def test_encode_moves(self):
+        frame = encode_moves([MoveDelta(0, 1, Sign.X, 5), MoveDelta(2, 2, Sign.O, 5)])
+        self.assertEqual(0x81, frame[0])
+        self.assertEqual({'version': 5, 'moves': [[0, 1, 'X'], [2, 2, 'O']]}, json.loads(frame[2:]))
@@ -0,0 +1,66 @@
+from unittest import TestCase
+
+from crossgame.api.controller import Controller
+from crossgame.api.game_updates import MoveDelta
+from crossgame.api.persistance import GameStateInMemoryPersistence
+from crossgame.logic.game_enums import Sign
+from crossgameflask.application.controllers.helpers.fragment_cache import FragmentCache
+
+
+class TestFragmentCache(TestCase):
+    def setUp(self):
+        self.cache = FragmentCache(max_size=3)
+        self.renders = []
+
+    def render(self, fragment):
+        def render():
+            self.renders.append(fragment)
+            return fragment
+        return render
+
+    def test_fragment_is_rendered_once(self):
+        self.assertEqual('a', self.cache.get_or_render('game-1', 1, 'active', self.render('a')))
+        self.assertEqual('a', self.cache.get_or_render('game-1', 1, 'active', self.render('b')))
+        self.assertEqual('c', self.cache.get_or_render('game-1', 1, 'waiting', self.render('c')))
+        self.assertEqual(['a', 'c'], self.renders)
+        self.assertEqual((1, 2), (self.cache.hits, self.cache.misses))
+
+    def test_newer_version_removes_older_ones(self):
+        self.cache.get_or_render('game-1', 1, 'active', self.render('a'))
+        self.cache.get_or_render('game-2', 1, 'active', self.render('b'))
+        self.cache.get_or_render('game-1', 2, 'active', self.render('c'))
+        self.assertEqual({('game-1', 2, 'active'), ('game-2', 1, 'active')}, set(self.cache.fragments))
+
+    def test_least_recently_used_fragment_is_removed(self):
+        for index in range(3):
+            self.cache.get_or_render(f'game-{index}', 1, 'active', self.render(str(index)))
+        self.cache.get_or_render('game-0', 1, 'active', self.render('x'))
+        self.cache.get_or_render('game-3', 1, 'active', self.render('3'))
+        self.assertEqual(3, len(self.cache))
+        self.assertNotIn(('game-1', 1, 'active'), self.cache.fragments)
+        self.assertEqual({'game-0', 'game-2', 'game-3'}, set(self.cache.game_keys))
+
+    def test_invalidate(self):
+        self.cache.get_or_render('game-1', 1, 'active', self.render('a'))
+        self.cache.get_or_render('game-1', 1, 'waiting', self.render('b'))
+        self.cache.on_moves('game-1', [MoveDelta(0, 0, Sign.X, 1)])
+        self.assertEqual(2, len(self.cache))
+        self.cache.on_moves('game-1', [MoveDelta(0, 0, Sign.X, 2)])
+        self.assertEqual(0, len(self.cache))
+        self.cache.get_or_render('game-1', 2, 'active', self.render('c'))
+        self.cache.invalidate('game-1')
+        self.assertEqual(({}, {}), (dict(self.cache.fragments), self.cache.game_keys))
+
+    def test_removed_and_expired_games_are_invalidated(self):
+        now = [0.0]
+        persistance = GameStateInMemoryPersistence(idle_ttl=10, clock=lambda: now[0])
+        persistance.add_removal_listener(self.cache.invalidate)
+        controller = Controller(persistance)
+        game_ids = [controller.start_game_session('player').game_id for _ in range(2)]
+        for game_id in game_ids:
+            self.cache.get_or_render(game_id, 0, 'waiting', self.render(game_id))
+        persistance.remove_game_info(game_ids[0])
+        self.assertEqual([game_ids[1]], list(self.cache.game_keys))
+        now[0] = 20
+        controller.start_game_session('player')
+        self.assertEqual(0, len(self.cache))
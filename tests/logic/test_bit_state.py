@@ -0,0 +1,72 @@
+import unittest
+
+from crossgame.api.player import Player
+from crossgame.exceptions.game_exceptions import (CellIsAlreadyBusyException,
+                                                  IncorrectFieldSizeException)
+from crossgame.logic.bit_state import BitboardGameState, get_line_masks
+from crossgame.logic.game import TicTacToeGame
+from crossgame.logic.game_enums import GameStatus, Sign
+
+
+class BitboardStateTestSuite(unittest.TestCase):
+    def test_initialized_game(self):
+        state = BitboardGameState()
+        self.assertEqual(9, state.empty_cells)
+        self.assertEqual([[None, None, None],
+                          [None, None, None],
+                          [None, None, None]], state.get_game_state())
+
+    def test_exception_with_incorrect_init(self):
+        self.assertRaises(IncorrectFieldSizeException, BitboardGameState, 4, 4)
+        self.assertRaises(IncorrectFieldSizeException, BitboardGameState, 3, 5)
+        self.assertRaises(IncorrectFieldSizeException, BitboardGameState, 0, 0)
+
+    def test_line_masks(self):
+        masks = get_line_masks(3)
+        self.assertEqual(8, len(masks))
+        self.assertIn(0b000000111, masks)
+        self.assertIn(0b001001001, masks)
+        self.assertIn(0b100010001, masks)
+        self.assertIn(0b001010100, masks)
+
+    def test_make_move(self):
+        state = BitboardGameState()
+        state.make_move(0, 0, Sign.X)
+        state.make_move(2, 1, Sign.O)
+        self.assertEqual(Sign.X, state.get_game_state()[0][0])
+        self.assertEqual(Sign.O, state.get_game_state()[2][1])
+        self.assertFalse(state.is_cell_empty(0, 0))
+        self.assertTrue(state.is_cell_empty(1, 1))
+        self.assertEqual(7, state.empty_cells)
+        self.assertRaises(CellIsAlreadyBusyException,
+                          state.make_move, 0, 0, Sign.O)
+
+    def test_game_is_finished_with_winner(self):
+        state = BitboardGameState(5, 5)
+        for i in range(5):
+            self.assertEqual(GameStatus.IN_PROGRESS, state.game_is_finished().status)
+            state.make_move(i, 4 - i, Sign.O)
+        stat = state.game_is_finished()
+        self.assertEqual(GameStatus.FINISHED, stat.status)
+        self.assertEqual(Sign.O, stat.sign)
+
+    def test_game_is_finished_draw(self):
+        state = BitboardGameState()
+        state.field = [[Sign.O, Sign.X, Sign.X],
+                       [Sign.X, Sign.O, Sign.O],
+                       [Sign.O, Sign.X, Sign.X]]
+        stat = state.game_is_finished()
+        self.assertEqual(GameStatus.DRAW, stat.status)
+        self.assertIsNone(stat.sign)
+
+    def test_game_uses_bitboard_state(self):
+        player1 = Player('pl1', 'play-1-id', Sign.X, True)
+        player2 = Player('pl2', 'play-2-id', Sign.O, False)
+        game = TicTacToeGame('game-id', [player1, player2], state_type=BitboardGameState)
+        game.make_move(player1.player_id, 0, 0)
+        game.make_move(player2.player_id, 1, 0)
+        game.make_move(player1.player_id, 0, 1)
+        game.make_move(player2.player_id, 1, 1)
+        game_state_dto = game.make_move(player1.player_id, 0, 2)
+        self.assertEqual(player1, game_state_dto.winner.player)
+        self.assertEqual(Sign.X, game_state_dto.winner.sign)
@@ -0,0 +1,76 @@
+import unittest
+
+from crossgame.api.player import Player
+from crossgame.exceptions.game_exceptions import (CellIsAlreadyBusyException,
+                                                  IncorrectFieldSizeException)
+from crossgame.logic.game import TicTacToeGameKInARow
+from crossgame.logic.game_enums import GameStatus, Sign
+from crossgame.logic.k_in_a_row_state import KInARowGameState
+
+
+class KInARowStateTestSuite(unittest.TestCase):
+    def test_rectangular_field(self):
+        state = KInARowGameState(10, 19, 5)
+        self.assertEqual(10, len(state.get_game_state()))
+        for row in state.get_game_state():
+            self.assertEqual(19, len(row))
+        self.assertEqual(190, state.empty_cells)
+
+    def test_exception_with_incorrect_init(self):
+        self.assertRaises(IncorrectFieldSizeException, KInARowGameState, 2, 15, 5)
+        self.assertRaises(IncorrectFieldSizeException, KInARowGameState, 4, 4, 5)
+        self.assertRaises(IncorrectFieldSizeException, KInARowGameState, 15, 15, 2)
+
+    def test_make_move(self):
+        state = KInARowGameState(15, 15, 5)
+        state.make_move(7, 7, Sign.X)
+        self.assertFalse(state.is_cell_empty(7, 7))
+        self.assertEqual((7, 7), state.last_move)
+        self.assertRaises(CellIsAlreadyBusyException, state.make_move, 7, 7, Sign.O)
+
+    def test_make_move_out_of_field(self):
+        state = KInARowGameState(15, 10, 5)
+        for x, y in [(-1, 0), (0, -1), (15, 0), (0, 10)]:
+            self.assertRaises(IndexError, state.make_move, x, y, Sign.X)
+        self.assertEqual(150, len(state.free_cells))
+        self.assertIsNone(state.last_move)
+
+    def test_win_in_every_direction(self):
+        lines = [[(3, y) for y in range(4, 9)],
+                 [(x, 2) for x in range(10, 15)],
+                 [(i, i) for i in range(5)],
+                 [(i, 14 - i) for i in range(6, 11)]]
+        for line in lines:
+            state = KInARowGameState(15, 15, 5)
+            for x, y in reversed(line[1:]):
+                state.make_move(x, y, Sign.O)
+                self.assertEqual(GameStatus.IN_PROGRESS, state.game_is_finished().status)
+            state.make_move(*line[0], Sign.O)
+            stat = state.game_is_finished()
+            self.assertEqual(GameStatus.FINISHED, stat.status)
+            self.assertEqual(Sign.O, stat.sign)
+
+    def test_broken_line_is_not_a_win(self):
+        state = KInARowGameState(15, 15, 5)
+        for y in [0, 1, 2, 4, 5]:
+            state.make_move(0, y, Sign.X)
+        state.make_move(0, 3, Sign.O)
+        self.assertEqual(GameStatus.IN_PROGRESS, state.game_is_finished().status)
+
+    def test_draw(self):
+        state = KInARowGameState(3, 4, 3)
+        state.field = [[Sign.X, Sign.X, Sign.O, Sign.O],
+                       [Sign.O, Sign.O, Sign.X, Sign.X],
+                       [Sign.X, Sign.X, Sign.O, Sign.O]]
+        self.assertEqual(GameStatus.DRAW, state.game_is_finished().status)
+
+    def test_game_with_k_in_a_row_rules(self):
+        player1 = Player('pl1', 'play-1-id', Sign.X, True)
+        player2 = Player('pl2', 'play-2-id', Sign.O, False)
+        game = TicTacToeGameKInARow('game-id', [player1, player2], 19, 19, 4)
+        for i in range(3):
+            game.make_move(player1.player_id, 9, i)
+            game.make_move(player2.player_id, 10, i)
+        game_state_dto = game.make_move(player1.player_id, 9, 3)
+        self.assertEqual(19, len(game_state_dto.field))
+        self.assertEqual(player1, game_state_dto.winner.player)
@@ -0,0 +1,66 @@
+import unittest
+
+from crossgame.api.player import Player
+from crossgame.exceptions.game_exceptions import CellIsAlreadyBusyException
+from crossgame.logic.game import TicTacToeGameInfinite
+from crossgame.logic.game_enums import GameStatus, Sign
+from crossgame.logic.sparse_state import MAX_COORDINATE, MAX_VIEW_SIZE, SparseGameState, Viewport
+
+
+class SparseStateTestSuite(unittest.TestCase):
+    def test_empty_field(self):
+        state = SparseGameState()
+        self.assertEqual([], state.get_game_state())
+        self.assertIsNone(state.bounding_box)
+        self.assertTrue(state.is_cell_empty(-10 ** 6, 10 ** 6))
+
+    def test_make_move_far_away(self):
+        state = SparseGameState()
+        state.make_move(-1000, 5, Sign.X)
+        state.make_move(1000, -5, Sign.O)
+        self.assertEqual(2, len(state.cells))
+        self.assertEqual(Viewport(-1000, -5, 2001, 11), state.bounding_box)
+        self.assertFalse(state.is_cell_empty(-1000, 5))
+        self.assertRaises(CellIsAlreadyBusyException, state.make_move, 1000, -5, Sign.X)
+
+    def test_viewport(self):
+        state = SparseGameState()
+        state.make_move(0, 0, Sign.X)
+        state.make_move(1, 2, Sign.O)
+        self.assertEqual([[Sign.X, None, None],
+                          [None, None, Sign.O]], state.get_game_state())
+        self.assertEqual([[None, None],
+                          [None, Sign.X]], state.get_game_state(Viewport(-1, -1, 2, 2)))
+
+    def test_default_view_is_limited(self):
+        state = SparseGameState()
+        state.make_move(-MAX_COORDINATE, -MAX_COORDINATE, Sign.X)
+        state.make_move(MAX_COORDINATE, MAX_COORDINATE, Sign.O)
+        field = state.get_game_state()
+        self.assertEqual((MAX_VIEW_SIZE, MAX_VIEW_SIZE), (len(field), len(field[0])))
+        self.assertEqual(Sign.O, field[-1][-1])
+        state.make_move(0, 0, Sign.X)
+        viewport = state.get_default_viewport()
+        self.assertEqual(Viewport(-MAX_VIEW_SIZE // 2, -MAX_VIEW_SIZE // 2, MAX_VIEW_SIZE, MAX_VIEW_SIZE), viewport)
+
+    def test_win_with_negative_coordinates(self):
+        state = SparseGameState(4)
+        for i in range(-2, 1):
+            state.make_move(i, -i, Sign.O)
+            self.assertEqual(GameStatus.IN_PROGRESS, state.game_is_finished().status)
+        state.make_move(-3, 3, Sign.O)
+        stat = state.game_is_finished()
+        self.assertEqual(GameStatus.FINISHED, stat.status)
+        self.assertEqual(Sign.O, stat.sign)
+
+    def test_infinite_game(self):
+        player1 = Player('pl1', 'play-1-id', Sign.X, True)
+        player2 = Player('pl2', 'play-2-id', Sign.O, False)
+        game = TicTacToeGameInfinite('game-id', [player1, player2], 3)
+        game.make_move(player1.player_id, 100, 100)
+        game.make_move(player2.player_id, -100, -100)
+        game.make_move(player1.player_id, 101, 100)
+        game.make_move(player2.player_id, -101, -100)
+        game_state_dto = game.make_move(player1.player_id, 102, 100)
+        self.assertEqual(player1, game_state_dto.winner.player)
+        self.assertEqual([[Sign.X], [Sign.X], [Sign.X]], game.get_field_view(Viewport(100, 100, 3, 1)))
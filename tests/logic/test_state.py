@@ -60,6 +60,13 @@ class StateTestSuite(unittest.TestCase):
         self.assertRaises(CellIsAlreadyBusyException,
                           state.make_move, 2, 2, Sign.O)
 
+    def test_make_move_out_of_field(self):
+        state = GameState()
+        for x, y in [(-1, 0), (0, -1), (3, 0), (0, 3)]:
+            self.assertRaises(IndexError, state.make_move, x, y, Sign.X)
+        self.assertEqual(9, len(state.free_cells))
+        self.assertTrue(all(sign is None for row in state.field for sign in row))
+
     def test_is_cell_empty(self):
         state = GameState()
         state.make_move(0, 0, Sign.X)
@@ -172,3 +179,26 @@ class StateTestSuite(unittest.TestCase):
                     [Sign.O, Sign.X, Sign.X]]
         self.assertEqual('Sign.O\tSign.X\tSign.X\t\nSign.X\tSign.O\tSign.O\t\nSign.O\tSign.X\tSign.X\t\n',
                          GameState.make_pritty_array_str(test_arr))
+
+    def test_game_is_finished_updated_by_moves(self):
+        game_state = GameState(5, 5)
+        for i in range(4):
+            game_state.make_move(i, 2, Sign.X)
+            game_state.make_move(i, 0, Sign.O)
+            self.assertEqual(GameStatus.IN_PROGRESS, game_state.game_is_finished().status)
+        game_state.make_move(4, 2, Sign.X)
+        stat = game_state.game_is_finished()
+        self.assertEqual(GameStatus.FINISHED, stat.status)
+        self.assertEqual(Sign.X, stat.sign)
+        self.assertIs(stat, game_state.game_is_finished())
+
+    def test_game_is_finished_draw_by_moves(self):
+        game_state = GameState()
+        for x, y, sign in [(0, 0, Sign.O), (0, 1, Sign.X), (0, 2, Sign.X),
+                           (1, 0, Sign.X), (1, 1, Sign.O), (1, 2, Sign.O),
+                           (2, 0, Sign.O), (2, 1, Sign.X)]:
+            game_state.make_move(x, y, sign)
+            self.assertEqual(GameStatus.IN_PROGRESS, game_state.game_is_finished().status)
+        game_state.make_move(2, 2, Sign.X)
+        self.assertEqual(GameStatus.DRAW, game_state.game_is_finished().status)
+        self.assertEqual(0, game_state.empty_cells)
@@ -0,0 +1,44 @@
+import unittest
+
+from crossgame.logic.game_enums import Sign
+from crossgame.logic.symmetry import (IDENTITY, canonicalize, get_cell_permutations, get_inverse_transform,
+                                      get_transforms, inverse_transform_move, transform_move)
+
+
+class SymmetryTestSuite(unittest.TestCase):
+    def test_transforms(self):
+        self.assertEqual(8, len(get_transforms(3, 3)))
+        self.assertEqual(4, len(get_transforms(3, 5)))
+        self.assertIn(IDENTITY, get_transforms(3, 5))
+        for permutation in get_cell_permutations(4, 6).values():
+            self.assertEqual(list(range(24)), sorted(permutation))
+
+    def test_symmetric_positions_have_same_key(self):
+        corners = [(0, 0), (0, 2), (2, 0), (2, 2)]
+        keys = set()
+        for row, column in corners:
+            field = [[None, None, None], [None, Sign.O, None], [None, None, None]]
+            field[row][column] = Sign.X
+            keys.add(canonicalize(field).key)
+        self.assertEqual(1, len(keys))
+
+    def test_different_positions_have_different_keys(self):
+        corner = [[Sign.X, None, None], [None, None, None], [None, None, None]]
+        edge = [[None, Sign.X, None], [None, None, None], [None, None, None]]
+        self.assertNotEqual(canonicalize(corner).key, canonicalize(edge).key)
+
+    def test_move_transform_round_trip(self):
+        for width, height in [(3, 3), (5, 5), (3, 7)]:
+            for transform in get_transforms(width, height):
+                for row in range(width):
+                    for column in range(height):
+                        moved = transform_move(row, column, width, height, transform)
+                        self.assertEqual((row, column),
+                                         inverse_transform_move(*moved, width, height, transform))
+
+    def test_canonical_move(self):
+        field = [[None, None, None], [None, None, None], [None, None, Sign.X]]
+        position = canonicalize(field)
+        canonical_row, canonical_column = transform_move(2, 2, 3, 3, position.transform)
+        self.assertEqual(Sign.X.value, position.key[canonical_row * 3 + canonical_column])
+        self.assertEqual(IDENTITY, get_inverse_transform(3, 3, IDENTITY))